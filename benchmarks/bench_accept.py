@@ -0,0 +1,71 @@
+"""
+Compares Accept header negotiation with pyldapi.accept against the regex, split & sort implementation it replaced,
+over a corpus of Accept headers sent by real browsers and clients.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_accept.py
+"""
+import re
+import timeit
+
+from pyldapi.accept import parse_accept
+from pyldapi.data import RDF_MEDIATYPES
+
+CORPUS = {
+    'Chrome': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,'
+              'application/signed-exchange;v=b3;q=0.7',
+    'Firefox': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Safari': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Edge': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8,'
+            'application/signed-exchange;v=b3;q=0.9',
+    'curl': '*/*',
+    'python-requests': '*/*',
+    'Googlebot': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'rdflib': 'application/rdf+xml, */*;q=0.1',
+    'Apache Jena': 'text/turtle,application/n-triples;q=0.95,application/ld+json;q=0.9,application/rdf+xml;q=0.8,'
+                   'text/plain;q=0.5,*/*;q=0.3',
+    'JS client': 'application/ld+json, application/json;q=0.9, */*;q=0.1',
+    'harvester': 'text/turtle;q=1.0, application/rdf+xml;q=0.5',
+    'text wildcard': 'text/*',
+    'spaced weights': 'text/turtle; q=0.5, application/rdf+xml',
+    'wildcard weight': 'application/n-triples;q=0.5, */*;q=0.9',
+}
+
+AVAILABLE = ['text/html'] + RDF_MEDIATYPES
+AVAILABLE_SET = frozenset(AVAILABLE)
+DEFAULT = 'text/turtle'
+
+
+def old(header):
+    # Renderer._get_mediatypes_from_http() and _get_mediatype() as they were
+    mediatypes_string = re.sub('v=(.*);', '', header)
+    mediatypes = mediatypes_string.split(',')
+    mediatypes = [x.strip() for x in mediatypes]
+    mediatypes = [
+        (float(x.split(';')[1].replace('q=', ''))
+         if ";q=" in x else 1, x.split(';')[0]) for x in mediatypes
+    ]
+    mediatypes.sort(reverse=True)
+    for mediatype in [x[1] for x in mediatypes]:
+        if mediatype in AVAILABLE:
+            return mediatype
+    return DEFAULT
+
+
+def new(header):
+    return parse_accept(header).best_match(AVAILABLE_SET, DEFAULT) or DEFAULT
+
+
+def new_uncached(header):
+    return parse_accept.__wrapped__(header).best_match(AVAILABLE_SET, DEFAULT) or DEFAULT
+
+
+if __name__ == '__main__':
+    print('{:<16} {:<22} {:<22}'.format('client', 'old', 'new'))
+    for client, header in CORPUS.items():
+        print('{:<16} {:<22} {:<22}'.format(client, old(header), new(header)))
+    print()
+
+    n = 2000
+    for label, fn in (('old', old), ('new, first parse', new_uncached), ('new, memoized', new)):
+        t = min(timeit.repeat(lambda: [fn(h) for h in CORPUS.values()], number=n, repeat=5))
+        print('{:<18} {:.2f} us/header'.format(label, t / n / len(CORPUS) * 1e6))
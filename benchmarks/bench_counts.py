@@ -0,0 +1,55 @@
+"""
+Compares the time ContainerRenderer takes to render a page of the Members profile of a large SQLite-backed register
+when the members are counted with COUNT(*) for every request against with a CachedCount.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_counts.py
+"""
+import sqlite3
+import timeit
+
+from fastapi.requests import Request
+
+from pyldapi import ContainerRenderer, CallableMemberSource, CachedCount
+
+N = 1000000
+PER_PAGE = 100
+REQUESTS = 200
+
+
+def make_db(n):
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE item (uri TEXT PRIMARY KEY, label TEXT)')
+    db.executemany(
+        'INSERT INTO item VALUES (?, ?)',
+        (('http://example.com/item/{:08d}'.format(i), 'Item {}'.format(i)) for i in range(n))
+    )
+    return db
+
+
+def make_source(db):
+    return CallableMemberSource(
+        lambda offset, limit: db.execute(
+            'SELECT uri, label FROM item ORDER BY uri LIMIT ? OFFSET ?', (limit, offset)
+        ).fetchall(),
+        lambda: db.execute('SELECT COUNT(*) FROM item').fetchone()[0]
+    )
+
+
+def render(source, members_total_count):
+    request = Request({
+        'type': 'http',
+        'query_string': '_profile=mem&per_page={}&page=2'.format(PER_PAGE).encode(),
+        'headers': [(b'accept', b'text/turtle')],
+    })
+    ContainerRenderer(request, 'http://example.com/items', 'Items', 'Benchmark items', None, None,
+                      source, members_total_count).render()
+
+
+if __name__ == '__main__':
+    db = make_db(N)
+    source = make_source(db)
+    cached = CachedCount(source.count, ttl=60)
+    print('{} members, {} per page, ms per request'.format(N, PER_PAGE))
+    for label, count in (('COUNT(*) per request', None), ('CachedCount', cached)):
+        t = min(timeit.repeat(lambda: render(source, count), number=REQUESTS, repeat=3)) / REQUESTS
+        print('{:<24} {:>8.3f}'.format(label, t * 1e3))
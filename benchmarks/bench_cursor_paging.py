@@ -0,0 +1,96 @@
+"""
+Compares the time ContainerRenderer takes to render a page of the Members profile at increasing depths of a large
+SQLite-backed register, with LIMIT/OFFSET page-number paging against keyset, i.e. cursor, paging.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_cursor_paging.py
+"""
+import sqlite3
+import time
+
+from fastapi.requests import Request
+
+from pyldapi import ContainerRenderer, CallableMemberSource, KeysetMemberSource
+from pyldapi.members import encode_cursor
+
+N = 1000000
+PER_PAGE = 100
+PAGES = (1, 100, 1000, 5000, 9000)
+
+
+class SQLiteKeysetSource(KeysetMemberSource):
+    def __init__(self, db):
+        self.db = db
+
+    def key(self, member):
+        return member[0]
+
+    def seek(self, key, limit, forward=True):
+        if forward:
+            return self.db.execute(
+                'SELECT uri, label FROM item WHERE uri > ? ORDER BY uri LIMIT ?', (key or '', limit)
+            ).fetchall()
+        if key is None:
+            return self.db.execute('SELECT uri, label FROM item ORDER BY uri DESC LIMIT ?', (limit,)).fetchall()
+        return self.db.execute(
+            'SELECT uri, label FROM item WHERE uri < ? ORDER BY uri DESC LIMIT ?', (key, limit)
+        ).fetchall()
+
+
+def make_db(n):
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE item (uri TEXT PRIMARY KEY, label TEXT)')
+    db.executemany(
+        'INSERT INTO item VALUES (?, ?)',
+        (('http://example.com/item/{:08d}'.format(i), 'Item {}'.format(i)) for i in range(n))
+    )
+    return db
+
+
+def make_request(query_string):
+    return Request({'type': 'http', 'query_string': query_string.encode(), 'headers': [(b'accept', b'text/turtle')]})
+
+
+def render_offset(db, page):
+    source = CallableMemberSource(
+        lambda offset, limit: db.execute(
+            'SELECT uri, label FROM item ORDER BY uri LIMIT ? OFFSET ?', (limit, offset)
+        ).fetchall(),
+        lambda: db.execute('SELECT COUNT(*) FROM item').fetchone()[0]
+    )
+    request = make_request('_profile=mem&per_page={}&page={}'.format(PER_PAGE, page))
+    start = time.perf_counter()
+    ContainerRenderer(request, 'http://example.com/items', 'Items', 'Benchmark items', None, None,
+                      source, None).render()
+    return time.perf_counter() - start
+
+
+def render_cursor(db, page):
+    query_string = '_profile=mem&per_page={}'.format(PER_PAGE)
+    if page > 1:
+        # the cursor the previous page's next link holds: the key of its last member
+        key = db.execute(
+            'SELECT uri FROM item ORDER BY uri LIMIT 1 OFFSET ?', ((page - 1) * PER_PAGE - 1,)
+        ).fetchone()[0]
+        query_string += '&cursor=' + encode_cursor(key)
+    request = make_request(query_string)
+    start = time.perf_counter()
+    ContainerRenderer(request, 'http://example.com/items', 'Items', 'Benchmark items', None, None,
+                      SQLiteKeysetSource(db), None, cursor_paging=True).render()
+    return time.perf_counter() - start
+
+
+def measure(fn, db, page):
+    # each render is timed without setting up its request
+    return min(fn(db, page) for _ in range(3))
+
+
+if __name__ == '__main__':
+    db = make_db(N)
+    print('{} members, {} per page'.format(N, PER_PAGE))
+    print('{:>6} {:>12} {:>12}'.format('page', 'offset ms', 'cursor ms'))
+    for page in PAGES:
+        print('{:>6} {:>12.2f} {:>12.2f}'.format(
+            page,
+            measure(render_offset, db, page) * 1e3,
+            measure(render_cursor, db, page) * 1e3
+        ))
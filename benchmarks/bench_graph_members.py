@@ -0,0 +1,65 @@
+"""
+Compares the time ContainerRenderer takes to render a page of the Members profile of a register held in an in-memory
+rdflib Graph when every member is first pulled out with a SPARQL query against with a GraphMemberSource, which keeps
+a sorted index of the members, and the labels looked up for them, so that a page is a slice of it.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_graph_members.py
+"""
+import timeit
+
+from fastapi.requests import Request
+from rdflib import Graph, URIRef, Literal, RDFS
+
+from pyldapi import ContainerRenderer, GraphMemberSource
+
+N = 20000
+PER_PAGE = 100
+CONTAINER = 'http://example.com/items'
+QUERY = '''
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    SELECT ?m ?label
+    WHERE {{
+        <{}> rdfs:member ?m .
+        OPTIONAL {{ ?m rdfs:label ?label }}
+    }}
+    ORDER BY ?m
+'''.format(CONTAINER)
+
+
+def make_graph(n):
+    g = Graph()
+    container = URIRef(CONTAINER)
+    for i in range(n):
+        uri = URIRef('http://example.com/item/{:08d}'.format(i))
+        g.add((container, RDFS.member, uri))
+        g.add((uri, RDFS.label, Literal('Item {}'.format(i))))
+    return g
+
+
+def render(members, members_total_count):
+    request = Request({
+        'type': 'http',
+        'query_string': '_profile=mem&per_page={}&page=150'.format(PER_PAGE).encode(),
+        'headers': [(b'accept', b'text/turtle')],
+    })
+    ContainerRenderer(request, CONTAINER, 'Items', 'Benchmark items', None, None,
+                      members, members_total_count).render()
+
+
+def render_sparql(g):
+    members = [(str(m), str(label) if label is not None else None) for m, label in g.query(QUERY)]
+    render(members, len(members))
+
+
+if __name__ == '__main__':
+    g = make_graph(N)
+    source = GraphMemberSource(g, CONTAINER)
+    source.index()
+    print('{} members, {} per page, ms per request'.format(N, PER_PAGE))
+    # the SPARQL query takes seconds, so is run fewer times
+    for label, fn, requests in (('SPARQL per request', lambda: render_sparql(g), 1),
+                                ('GraphMemberSource', lambda: render(source, None), 200)):
+        t = min(timeit.repeat(fn, number=requests, repeat=3)) / requests
+        print('{:<24} {:>10.3f}'.format(label, t * 1e3))
+    t = timeit.timeit(lambda: (source.invalidate(), source.index()), number=5) / 5
+    print('{:<24} {:>10.3f}'.format('index rebuild', t * 1e3))
@@ -0,0 +1,55 @@
+"""
+Compares encoding a page of container members as JSON with Starlette's JSONResponse, which _render_mem_profile_json
+used, with pyldapi.json_encoding's stdlib & orjson encoders and its streaming array mode.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_json.py
+"""
+import timeit
+import tracemalloc
+
+from fastapi.responses import JSONResponse
+
+from pyldapi.json_encoding import _dumps_stdlib, _dumps_orjson, iter_json_object, orjson
+
+SIZES = (1000, 100000)
+
+
+def make_page(n):
+    return {
+        'uri': 'http://example.com/items',
+        'label': 'Items',
+        'comment': 'Benchmark items',
+        'profiles': ['mem', 'alt'],
+        'default_profile': 'mem',
+        'register_items': [('http://example.com/item/{}'.format(i), 'Item {}'.format(i)) for i in range(n)],
+    }
+
+
+def streamed(page):
+    head = {k: v for k, v in page.items() if k != 'register_items'}
+    return sum(len(chunk) for chunk in iter_json_object(head, 'register_items', page['register_items']))
+
+
+def peak(fn, page):
+    tracemalloc.start()
+    fn(page)
+    _, size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+if __name__ == '__main__':
+    candidates = [
+        ('JSONResponse', lambda page: JSONResponse(page).body),
+        ('stdlib bytes', _dumps_stdlib),
+        ('streamed', streamed),
+    ]
+    if orjson is not None:
+        candidates.insert(2, ('orjson bytes', _dumps_orjson))
+    print('{:<16} {:>8} {:>12} {:>14}'.format('encoder', 'members', 'ms', 'peak KiB'))
+    for n in SIZES:
+        page = make_page(n)
+        for label, fn in candidates:
+            number = max(1, 100000 // n)
+            t = min(timeit.repeat(lambda: fn(page), number=number, repeat=3)) / number
+            print('{:<16} {:>8} {:>12.2f} {:>14.0f}'.format(label, n, t * 1e3, peak(fn, page) / 1024))
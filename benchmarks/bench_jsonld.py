@@ -0,0 +1,60 @@
+"""
+Compares rendering the Members profile as JSON-LD by building an rdflib Graph and running rdflib's JSON-LD serializer
+with writing the JSON-LD directly from the members, at 1k & 10k members per page.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_jsonld.py
+"""
+import asyncio
+import time
+
+from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
+
+from pyldapi import ContainerRenderer
+from pyldapi.serializers import serialize_jsonld
+
+SIZES = (1000, 10000)
+
+
+def make_renderer(n):
+    request = Request({
+        'type': 'http',
+        'query_string': '_profile=mem&per_page={}'.format(n).encode(),
+        'headers': [(b'accept', b'application/ld+json')],
+    })
+    members = [('http://example.com/item/{}'.format(i), 'Item {}'.format(i)) for i in range(n)]
+    return ContainerRenderer(request, 'http://example.com/items', 'Items', 'Benchmark items', None, None,
+                             members, n, page_size_max=n)
+
+
+def graph(r):
+    return len(serialize_jsonld(r._generate_mem_profile_rdf()))
+
+
+async def _read(response):
+    return sum([len(chunk) async for chunk in response.body_iterator])
+
+
+def direct(r):
+    response = r._make_mem_profile_jsonld_response()
+    if isinstance(response, StreamingResponse):
+        return asyncio.run(_read(response))
+    return len(response.body)
+
+
+def measure(fn, r):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        fn(r)
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best
+
+
+if __name__ == '__main__':
+    print('{:>8} {:<8} {:>10}'.format('members', 'path', 'ms'))
+    for n in SIZES:
+        r = make_renderer(n)
+        for label, fn in (('graph', graph), ('direct', direct)):
+            print('{:>8} {:<8} {:>10.1f}'.format(n, label, measure(fn, r) * 1e3))
@@ -0,0 +1,57 @@
+"""
+Compares rendering the Members profile as Turtle & N-Triples by building an rdflib Graph and serializing it with
+streaming the triples straight from the members, at 1k, 10k & 100k members per page.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_mem_streaming.py
+"""
+import time
+import tracemalloc
+
+from fastapi.requests import Request
+
+from pyldapi import ContainerRenderer
+from pyldapi.streaming import iter_chunks
+
+SIZES = (1000, 10000, 100000)
+FORMATS = {'text/turtle': 'turtle', 'application/n-triples': 'nt'}
+
+
+def make_renderer(n, mediatype):
+    request = Request({
+        'type': 'http',
+        'query_string': '_profile=mem&per_page={}'.format(n).encode(),
+        'headers': [(b'accept', mediatype.encode())],
+    })
+    members = [('http://example.com/item/{}'.format(i), 'Item {}'.format(i)) for i in range(n)]
+    return ContainerRenderer(request, 'http://example.com/items', 'Items', 'Benchmark items', None, None,
+                             members, n, page_size_max=n)
+
+
+def graph(r):
+    return len(r._generate_mem_profile_rdf().serialize(format=FORMATS[r.mediatype], encoding='utf-8'))
+
+
+def streamed(r):
+    # consume the chunks as a server would, without holding the whole representation
+    return sum(len(chunk) for chunk in iter_chunks(r._iter_mem_profile_triples()))
+
+
+def measure(fn, r):
+    start = time.perf_counter()
+    fn(r)
+    t = time.perf_counter() - start
+    tracemalloc.start()
+    fn(r)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, peak
+
+
+if __name__ == '__main__':
+    print('{:<24} {:>8} {:<10} {:>10} {:>14}'.format('mediatype', 'members', 'path', 'ms', 'peak KiB'))
+    for mediatype in FORMATS:
+        for n in SIZES:
+            r = make_renderer(n, mediatype)
+            for label, fn in (('graph', graph), ('streamed', streamed)):
+                t, peak = measure(fn, r)
+                print('{:<24} {:>8} {:<10} {:>10.1f} {:>14.0f}'.format(mediatype, n, label, t * 1e3, peak / 1024))
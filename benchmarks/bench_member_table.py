@@ -0,0 +1,97 @@
+"""
+Measures the memory that 100k container members take as a list of dicts and as a MemberTable, and the time
+ContainerRenderer takes to render them in the Members profile's HTML, RDF & JSON representations from each.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_member_table.py
+"""
+import asyncio
+import os
+import time
+import tracemalloc
+
+from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
+from jinja2 import FileSystemLoader
+
+import pyldapi
+from pyldapi import ContainerRenderer
+from pyldapi.renderer_container import templates
+
+try:
+    from pyldapi import MemberTable
+except ImportError:  # before MemberTable
+    MemberTable = None
+
+N = 100000
+MEDIATYPES = ('text/html', 'text/turtle', 'application/n-triples', 'application/ld+json', 'application/json')
+
+templates.env.loader = FileSystemLoader(os.path.join(os.path.dirname(pyldapi.__file__), 'templates'))
+
+
+def make_dicts(uris, labels):
+    return [{'uri': u, 'title': t} for u, t in zip(uris, labels)]
+
+
+def make_table(uris, labels):
+    return MemberTable.from_members(make_dicts(uris, labels))
+
+
+def allocated(fn, *args):
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    kept = fn(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, size - start
+
+
+async def _read(response):
+    return sum([len(chunk) async for chunk in response.body_iterator])
+
+
+def render(members, mediatype):
+    query_string = '_profile=mem&per_page={}'.format(N)
+    if mediatype == 'application/json':
+        query_string += '&_mediatype=application/json'
+    request = Request({'type': 'http', 'query_string': query_string.encode(),
+                       'headers': [(b'accept', mediatype.encode())]})
+    r = ContainerRenderer(request, 'http://example.com/items', 'Items', 'Benchmark items', None, None,
+                          members, len(members), page_size_max=N)
+    if mediatype == 'application/json':
+        r.mediatype = 'application/json'
+    if mediatype == 'text/html':
+        return len(templates.get_template('mem.html').render(r._get_mem_template_context()))
+    response = r.render()
+    if isinstance(response, StreamingResponse):
+        return asyncio.run(_read(response))
+    return len(response.body)
+
+
+def measure(members, mediatype):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        render(members, mediatype)
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best
+
+
+if __name__ == '__main__':
+    # the strings are shared by both representations, so only the containers' memory is compared
+    uris = ['http://example.com/item/{}'.format(i) for i in range(N)]
+    labels = ['Item {}'.format(i) for i in range(N)]
+    forms = [('list of dicts', make_dicts)]
+    if MemberTable is not None:
+        forms.append(('MemberTable', make_table))
+
+    print('{} members'.format(N))
+    built = {}
+    for label, make in forms:
+        built[label], size = allocated(make, uris, labels)
+        print('{:<16} {:>10.0f} KiB'.format(label, size / 1024))
+    print()
+    print('{:<24} {:<16} {:>10}'.format('mediatype', 'members', 'ms'))
+    for mediatype in MEDIATYPES:
+        for label, members in built.items():
+            print('{:<24} {:<16} {:>10.1f}'.format(mediatype, label, measure(members, mediatype) * 1e3))
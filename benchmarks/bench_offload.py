@@ -0,0 +1,61 @@
+"""
+Measures how long serializing a large graph holds up an event loop: the longest gap between ticks of a task that
+should run every millisecond, while a 20k-triple graph is serialized as RDF/XML inline, in a thread pool and in a
+process pool.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_offload.py
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from rdflib import Graph, Literal, URIRef, RDF, RDFS
+
+from pyldapi.serializers import aserialize
+
+N = 10000
+MEDIATYPE = 'application/rdf+xml'
+
+
+def make_graph(n):
+    g = Graph()
+    container = URIRef('http://example.com/items')
+    g.add((container, RDF.type, RDF.Bag))
+    for i in range(n):
+        item = URIRef('http://example.com/item/{}'.format(i))
+        g.add((container, RDFS.member, item))
+        g.add((item, RDFS.label, Literal('Item {}'.format(i))))
+    return g
+
+
+async def ticker(gaps, done):
+    last = time.perf_counter()
+    while not done.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def run(g, executor):
+    gaps = []
+    done = asyncio.Event()
+    task = asyncio.create_task(ticker(gaps, done))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await aserialize(g, MEDIATYPE, executor=executor, threshold=0)
+    t = time.perf_counter() - start
+    done.set()
+    await task
+    return t, max(gaps)
+
+
+if __name__ == '__main__':
+    g = make_graph(N)
+    print('{} triples as {}'.format(len(g), MEDIATYPE))
+    print('{:<10} {:>10} {:>18}'.format('', 'ms', 'longest stall ms'))
+    with ThreadPoolExecutor(1) as threads, ProcessPoolExecutor(1) as processes:
+        processes.submit(int).result()  # start the worker
+        for label, executor in (('inline', None), ('thread', threads), ('process', processes)):
+            t, stall = asyncio.run(run(g, executor))
+            print('{:<10} {:>10.1f} {:>18.1f}'.format(label, t * 1e3, stall * 1e3))
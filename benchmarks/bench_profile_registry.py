@@ -0,0 +1,64 @@
+"""
+Compares profile negotiation lookups through a ProfileRegistry with the nested scans of self.profiles they replaced.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_profile_registry.py
+"""
+import timeit
+
+from pyldapi import Profile, ProfileRegistry
+from pyldapi.data import RDF_MEDIATYPES
+
+N_PROFILES = 40
+
+profiles = {
+    'p{}'.format(i): Profile(
+        'http://example.com/profile/{}'.format(i),
+        'Profile {}'.format(i),
+        'A profile for benchmarking',
+        ['text/html'] + RDF_MEDIATYPES,
+        'text/turtle',
+    )
+    for i in range(N_PROFILES)
+}
+registry = ProfileRegistry(profiles)
+
+# a long Accept-Profile header: mostly unknown profiles, the last one available
+requested_uris = ['http://example.com/unknown/{}'.format(i) for i in range(20)] + \
+                 ['http://example.com/profile/{}'.format(N_PROFILES - 1)]
+
+
+def scan():
+    # _get_profiles_from_http() then _get_profile() as they were
+    tokens = []
+    for uri in requested_uris:
+        for token, profile in profiles.items():
+            if profile.uri == uri:
+                tokens.append(token)
+    uris = {}
+    for token, profile in profiles.items():
+        uris[profile.uri] = token
+    for requested in tokens:
+        for k, v in uris.items():
+            if requested == v:
+                return v
+
+
+def indexed():
+    tokens = []
+    for uri in requested_uris:
+        token = registry.token_for_uri(uri)
+        if token is not None:
+            tokens.append(token)
+    for requested in tokens:
+        if requested in registry:
+            return requested
+
+
+if __name__ == '__main__':
+    assert scan() == indexed()
+    n = 20000
+    t_scan = min(timeit.repeat(scan, number=n, repeat=5))
+    t_indexed = min(timeit.repeat(indexed, number=n, repeat=5))
+    print('{} profiles, {} requested profile URIs'.format(N_PROFILES, len(requested_uris)))
+    print('nested scans:     {:.2f} us/request'.format(t_scan / n * 1e6))
+    print('ProfileRegistry:  {:.2f} us/request ({:.1f}x)'.format(t_indexed / n * 1e6, t_scan / t_indexed))
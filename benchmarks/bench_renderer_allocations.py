@@ -0,0 +1,84 @@
+"""
+Measures the time and memory ContainerRenderer construction spends setting up profiles with the built-in 'alt' &
+'mem' profiles as module-level singletons laid over the caller's profiles, against creating them and writing them into
+the caller's dict per request as Renderer & ContainerRenderer used to.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_renderer_allocations.py
+"""
+import timeit
+import tracemalloc
+
+from pyldapi import Profile, ProfileRegistry
+from pyldapi.data import RDF_MEDIATYPES
+from pyldapi.renderer import ALT_PROFILES
+from pyldapi.renderer_container import MEM_PROFILES
+
+N = 2000
+
+profiles = {
+    'p{}'.format(i): Profile(
+        'http://example.com/profile/{}'.format(i),
+        'Profile {}'.format(i),
+        'A profile for benchmarking',
+        ['text/html'] + RDF_MEDIATYPES,
+        'text/turtle',
+    )
+    for i in range(10)
+}
+registry = ProfileRegistry(profiles)
+
+
+def per_request_profiles():
+    # what Renderer & ContainerRenderer did per request: new 'mem' & 'alt' Profiles written into the caller's dict
+    given = dict(profiles)
+    given['mem'] = Profile(
+        'https://w3id.org/profile/mem',
+        'Members Profile',
+        'A very basic RDF data model-only profile that lists the sub-items (members) of collections (rdf:Bag)',
+        ['text/html'] + RDF_MEDIATYPES,
+        'text/html'
+    )
+    given['alt'] = Profile(
+        'http://www.w3.org/ns/dx/conneg/altr',
+        'Alternate Representations',
+        'The representation of the resource that lists all other representations (profiles and Media Types)',
+        ['text/html', 'application/json'] + RDF_MEDIATYPES,
+        'text/html',
+        languages=['en'],
+    )
+    return ProfileRegistry.compile(given)
+
+
+def overlaid_dict():
+    # what Renderer & ContainerRenderer now do with a dict of profiles
+    return ProfileRegistry.compile(profiles).overlay(MEM_PROFILES).overlay(ALT_PROFILES)
+
+
+def overlaid_registry():
+    # ... and with a ProfileRegistry
+    return registry.overlay(MEM_PROFILES).overlay(ALT_PROFILES)
+
+
+def measure(fn):
+    t = min(timeit.repeat(fn, number=N, repeat=5)) / N
+    fn()  # warm the caches
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, peak - start
+
+
+if __name__ == '__main__':
+    assert per_request_profiles() == overlaid_dict() == overlaid_registry()
+    print('profile set-up per ContainerRenderer construction, {} caller profiles'.format(len(profiles)))
+    print('{:<32} {:>10} {:>12}'.format('', 'us/call', 'peak bytes'))
+    for label, fn in (
+        ('new Profiles & dict per request', per_request_profiles),
+        ('singletons, dict of profiles', overlaid_dict),
+        ('singletons, ProfileRegistry', overlaid_registry),
+    ):
+        t, size = measure(fn)
+        print('{:<32} {:>10.2f} {:>12}'.format(label, t * 1e6, size))
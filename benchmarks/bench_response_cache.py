@@ -0,0 +1,55 @@
+"""
+Compares rendering a 1000-member page of a container as RDF/XML, and gzipping it as compression middleware would,
+with answering the same request from a ResponseCache.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_response_cache.py
+"""
+import gzip
+import timeit
+
+from fastapi.requests import Request
+
+from pyldapi import ContainerRenderer, ResponseCache
+
+N = 1000
+MEMBERS = [('http://example.com/item/{}'.format(i), 'Item {}'.format(i)) for i in range(N)]
+REQUEST = Request({
+    'type': 'http',
+    'method': 'GET',
+    'query_string': '_profile=mem&per_page={}'.format(N).encode(),
+    'headers': [(b'accept', b'application/rdf+xml'), (b'accept-encoding', b'gzip, deflate, br')],
+})
+
+
+class CachedRenderer(ContainerRenderer):
+    response_cache = ResponseCache()
+
+    def _get_members_fingerprint(self):
+        return 1
+
+
+def make_renderer():
+    return CachedRenderer(REQUEST, 'http://example.com/items', 'Items', 'Benchmark items', None, None, MEMBERS, N,
+                          page_size_max=N)
+
+
+def uncached():
+    return gzip.compress(make_renderer().render().body)
+
+
+def cached():
+    return make_renderer().render_cached().body
+
+
+def lookup_only():
+    return CachedRenderer.response_cache.get(key)
+
+
+if __name__ == '__main__':
+    cached()
+    r = make_renderer()
+    key = r._get_response_cache_key(r._get_fingerprint())
+    for label, fn, n in (('render & gzip', uncached, 5), ('render_cached hit', cached, 2000),
+                         ('cache lookup alone', lookup_only, 20000)):
+        t = min(timeit.repeat(fn, number=n, repeat=3)) / n
+        print('{:<20} {:>12.1f} us'.format(label, t * 1e6))
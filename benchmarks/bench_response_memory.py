@@ -0,0 +1,71 @@
+"""
+Measures the peak memory and time of making an RDF response for a large graph: serializing it to a str and having the
+Response encode that, as Renderers used to, against the bytes-native pipeline Renderer._make_rdf_response uses.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_response_memory.py
+"""
+import time
+import tracemalloc
+
+from fastapi import Response
+from fastapi.requests import Request
+from rdflib import Graph, Literal, URIRef, RDF, RDFS
+
+from pyldapi import Renderer, Profile
+
+N = 100000
+FORMATS = {'text/turtle': 'turtle', 'application/n-triples': 'nt', 'application/rdf+xml': 'xml'}
+
+PROFILES = {'p': Profile('http://example.com/profile', 'P', 'A profile', list(FORMATS), 'text/turtle')}
+
+
+def make_graph(n):
+    g = Graph()
+    container = URIRef('http://example.com/items')
+    g.add((container, RDF.type, RDF.Bag))
+    for i in range(n):
+        item = URIRef('http://example.com/item/{}'.format(i))
+        g.add((container, RDFS.member, item))
+        g.add((item, RDFS.label, Literal('Item {}'.format(i))))
+    return g
+
+
+def make_renderer(mediatype):
+    request = Request({
+        'type': 'http',
+        'query_string': '_mediatype={}'.format(mediatype).encode(),
+        'headers': [],
+    })
+    return Renderer(request, 'http://example.com/items', PROFILES, 'p')
+
+
+def via_str(r, g):
+    return Response(g.serialize(format=FORMATS[r.mediatype]), media_type=r.mediatype, headers=r.headers)
+
+
+def via_bytes(r, g):
+    return r._make_rdf_response(g, delete_graph=False)
+
+
+def measure(fn, r, g):
+    start = time.perf_counter()
+    fn(r, g)
+    t = time.perf_counter() - start
+    tracemalloc.start()
+    response = fn(r, g)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, peak, len(response.body)
+
+
+if __name__ == '__main__':
+    g = make_graph(N)
+    print('{} triples'.format(len(g)))
+    print('{:<24} {:<8} {:>10} {:>12} {:>12}'.format('mediatype', 'path', 'ms', 'peak KiB', 'body KiB'))
+    for mediatype in FORMATS:
+        r = make_renderer(mediatype)
+        for label, fn in (('str', via_str), ('bytes', via_bytes)):
+            t, peak, size = measure(fn, r, g)
+            print(
+                '{:<24} {:<8} {:>10.1f} {:>12.0f} {:>12.0f}'.format(mediatype, label, t * 1e3, peak / 1024, size / 1024)
+            )
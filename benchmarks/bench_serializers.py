@@ -0,0 +1,52 @@
+"""
+Measures the throughput of each serializer in pyldapi.serializers, and of the rdflib plugins that could stand in for
+them, over a graph shaped like a page of container members, so that the cheapest correct backend can be chosen for
+each Media Type.
+
+Run from the repository root: PYTHONPATH=. python benchmarks/bench_serializers.py
+"""
+import time
+
+from rdflib import Graph, Literal, URIRef, RDF, RDFS
+
+from pyldapi.serializers import SERIALIZERS, rdflib_serializer
+
+N = 10000
+
+CANDIDATES = {
+    'text/turtle': {'rdflib turtle': rdflib_serializer('turtle'), 'rdflib longturtle': rdflib_serializer('longturtle')},
+    'application/rdf+xml': {'rdflib xml': rdflib_serializer('xml'), 'rdflib pretty-xml': rdflib_serializer('pretty-xml')},
+    'application/ld+json': {'rdflib json-ld': rdflib_serializer('json-ld')},
+    'application/n-triples': {'rdflib nt': rdflib_serializer('nt')},
+}
+
+
+def make_graph(n):
+    g = Graph()
+    container = URIRef('http://example.com/items')
+    g.add((container, RDF.type, RDF.Bag))
+    for i in range(n):
+        item = URIRef('http://example.com/item/{}'.format(i))
+        g.add((container, RDFS.member, item))
+        g.add((item, RDFS.label, Literal('Item {}'.format(i))))
+    return g
+
+
+def measure(serializer, g):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        size = len(serializer(g))
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best, size
+
+
+if __name__ == '__main__':
+    g = make_graph(N)
+    print('{} triples'.format(len(g)))
+    print('{:<24} {:<22} {:>10} {:>14}'.format('mediatype', 'serializer', 'ms', 'triples/s'))
+    for mediatype, candidates in CANDIDATES.items():
+        for label, serializer in dict(candidates, **{'pyldapi (default)': SERIALIZERS[mediatype]}).items():
+            t, size = measure(serializer, g)
+            print('{:<24} {:<22} {:>10.1f} {:>14.0f}'.format(mediatype, label, t * 1e3, len(g) / t))
@@ -4,6 +4,15 @@ from pyldapi.exceptions import ProfilesMediatypesException, PagingError
 from pyldapi.renderer import Renderer
 from pyldapi.renderer_container import ContainerRenderer, ContainerOfContainersRenderer
 from pyldapi.profile import Profile
+from pyldapi.registry import ProfileRegistry
+from pyldapi.caching import LRUCache
+from pyldapi.response_cache import ResponseCache
+from pyldapi.member_table import MemberTable
+from pyldapi.counts import ApproximateCount, CachedCount
+from pyldapi.members import MemberSource, AsyncMemberSource, ListMemberSource, IteratorMemberSource, \
+    CallableMemberSource, KeysetMemberSource, SortedMemberSource
+from pyldapi.graph_members import GraphMemberSource
+from pyldapi.serializers import register_serializer
 from pyldapi.helpers import setup
 from pyldapi.data import RDF_MEDIATYPES, RDF_FILE_EXTS, MEDIATYPE_NAMES
 
@@ -14,6 +23,21 @@ __all__ = [
     'ContainerRenderer',
     'ContainerOfContainersRenderer',
     'Profile',
+    'ProfileRegistry',
+    'LRUCache',
+    'ResponseCache',
+    'MemberSource',
+    'AsyncMemberSource',
+    'ListMemberSource',
+    'IteratorMemberSource',
+    'CallableMemberSource',
+    'KeysetMemberSource',
+    'SortedMemberSource',
+    'GraphMemberSource',
+    'MemberTable',
+    'ApproximateCount',
+    'CachedCount',
+    'register_serializer',
     'ProfilesMediatypesException',
     'PagingError',
     'setup',
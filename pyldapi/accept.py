@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Parsers for the HTTP Accept, Accept-Language and Accept-Encoding request headers, following the content negotiation
+rules of RFC 9110, Section 12 (https://www.rfc-editor.org/rfc/rfc9110#section-12).
+
+Parsing a header string is memoized so that the handful of distinct headers sent by browsers and other clients are
+each only parsed once.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+# the number of distinct header strings each of parse_accept() & parse_accept_language() remember
+PARSE_CACHE_SIZE = 512
+
+
+class MediaRange(namedtuple('MediaRange', ['mediatype', 'params', 'q', 'position'])):
+    """
+    One media-range of an Accept header, e.g. ``text/html``, ``text/*;q=0.8`` or ``*/*;q=0.1``.
+
+    :ivar mediatype: The lower-cased type/subtype, which may contain wildcards.
+    :ivar params: The media type parameters, other than the weight, as a sorted tuple of (name, value) pairs.
+    :ivar q: The weight (qvalue).
+    :ivar position: The index of this media-range within the header.
+    """
+    __slots__ = ()
+
+    @property
+    def specificity(self):
+        """
+        3 for a media type with parameters, 2 for a media type, 1 for type/* and 0 for \\*/\\*.
+        """
+        if self.mediatype == '*/*':
+            return 0
+        elif self.mediatype.endswith('/*'):
+            return 1
+        elif self.params:
+            return 3
+        return 2
+
+
+class AcceptHeader:
+    """
+    A parsed Accept header.
+
+    :attr:`ranges` holds the header's media-ranges in order of preference: heaviest weight first then, for equal
+    weights, most specific first then header order. :meth:`best_match` picks from the Media Types a server has
+    available, applying each the weight of the most specific media-range that matches it.
+    """
+    __slots__ = ('ranges', '_exact', '_types', '_any', '_best')
+
+    def __init__(self, ranges):
+        """
+        Constructor
+
+        :param ranges: The media-ranges of the header, in header order.
+        :type ranges: list (of :class:`.MediaRange`)
+        """
+        self.ranges = tuple(sorted(ranges, key=lambda r: (-r.q, -r.specificity, r.position)))
+
+        # index the ranges by what they match; where a range is repeated the first one counts
+        self._exact = {}
+        self._types = {}
+        self._any = None
+        self._best = {}
+        for r in ranges:
+            if r.mediatype == '*/*':
+                if self._any is None:
+                    self._any = r
+            elif r.mediatype.endswith('/*'):
+                self._types.setdefault(r.mediatype[:-2], r)
+            else:
+                self._exact.setdefault((r.mediatype, r.params), r)
+
+    @property
+    def mediatypes(self):
+        """
+        The header's media-ranges, without parameters or weights, in order of preference.
+
+        :rtype: list (of str)
+        """
+        return [r.mediatype for r in self.ranges]
+
+    def match(self, mediatype):
+        """
+        Returns the most specific media-range that matches the given Media Type.
+
+        :param mediatype: A Media Type, optionally with parameters.
+        :type mediatype: str
+        :return: The matching media-range or None if the header doesn't match the Media Type at all
+        :rtype: :class:`.MediaRange`
+        """
+        full, params = _split_mediatype(mediatype)
+        r = None
+        if params:
+            r = self._exact.get((full, params))
+        if r is None:
+            r = self._exact.get((full, ()))
+        if r is None:
+            r = self._types.get(full.split('/', 1)[0])
+        if r is None:
+            r = self._any
+        return r
+
+    def quality(self, mediatype):
+        """
+        Returns the weight the header gives the given Media Type, 0 if it isn't acceptable.
+
+        :param mediatype: A Media Type, optionally with parameters.
+        :type mediatype: str
+        :rtype: float
+        """
+        r = self.match(mediatype)
+        return r.q if r is not None else 0.0
+
+    def best_match(self, available, default=None):
+        """
+        Returns the available Media Type the client most prefers.
+
+        Media Types are ranked by the weight of their most specific matching media-range. Ties go to the Media Type
+        matched by the more specific media-range, then to the one listed earlier in the header, then to the default
+        so that wildcards such as \\*/\\* select the default rather than whichever Media Type happens to be seen
+        first.
+
+        :param available: The Media Types that may be returned, e.g. a :class:`.Profile`'s mediatypes.
+        :type available: set or list (of str)
+        :param default: The Media Type to prefer when several are equally acceptable.
+        :type default: str
+        :return: A Media Type from available or None if none of them are acceptable
+        :rtype: str
+        """
+        # remember matches against the frozen Media Type sets of a Profile or ProfileRegistry
+        if isinstance(available, frozenset):
+            try:
+                return self._best[(available, default)]
+            except KeyError:
+                best = self._best[(available, default)] = self._best_match(available, default)
+                return best
+        return self._best_match(available, default)
+
+    def _best_match(self, available, default):
+        best = None
+        best_rank = None
+        for mediatype in available:
+            if mediatype.startswith('_'):
+                continue  # Media Types like `_internal` can only be requested by QSA
+            r = self.match(mediatype)
+            if r is None or r.q <= 0:
+                continue
+            rank = (r.q, r.specificity, -r.position, mediatype == default, mediatype)
+            if best_rank is None or rank > best_rank:
+                best = mediatype
+                best_rank = rank
+        return best
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_accept(header):
+    """
+    Parses an Accept header.
+
+    Elements that are not media-ranges are ignored, as is the Chrome ``v=b3`` style of extra parameter on otherwise
+    valid media-ranges (https://github.com/RDFLib/pyLDAPI/issues/21).
+
+    :param header: An Accept header value.
+    :type header: str
+    :return: The parsed header
+    :rtype: :class:`.AcceptHeader`
+    :raises ValueError: If a weight is not a valid qvalue
+    """
+    ranges = []
+    for element in _split(header, ','):
+        parts = _split(element, ';')
+        if not parts:
+            continue
+        mediatype = parts[0].lower()
+        if mediatype == '*':
+            mediatype = '*/*'  # sent by some old clients
+        if mediatype.count('/') != 1 or mediatype.startswith('/') or mediatype.endswith('/'):
+            continue
+        params, q = _parse_params(parts[1:])
+        ranges.append(MediaRange(mediatype, params, q, len(ranges)))
+    return AcceptHeader(ranges)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_accept_language(header):
+    """
+    Parses an Accept-Language header.
+
+    :param header: An Accept-Language header value.
+    :type header: str
+    :return: (language tag, weight) pairs, heaviest weight first and, for equal weights, in header order
+    :rtype: tuple
+    :raises ValueError: If a weight is not a valid qvalue
+    """
+    languages = []
+    for element in _split(header, ','):
+        parts = _split(element, ';')
+        if not parts:
+            continue
+        _, q = _parse_params(parts[1:])
+        languages.append((parts[0], q))
+    languages.sort(key=lambda x: -x[1])
+    return tuple(languages)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def select_encoding(header, available):
+    """
+    Picks the content-coding to send a response in for an Accept-Encoding header.
+
+    :param header: An Accept-Encoding header value.
+    :type header: str
+    :param available: The content-codings the response is available in, e.g. ('br', 'gzip'), most preferred first.
+    :type available: tuple (of str)
+    :return: The acceptable coding with the heaviest weight, the most preferred of those equally weighted, or None to
+    send the response unencoded
+    :rtype: str
+    :raises ValueError: If a weight is not a valid qvalue
+    """
+    weights = {}
+    for element in _split(header, ','):
+        parts = _split(element, ';')
+        if not parts:
+            continue
+        _, q = _parse_params(parts[1:])
+        weights.setdefault(parts[0].lower(), q)
+
+    best, best_q = None, 0
+    for coding in available:
+        q = weights.get(coding, weights.get('*', 0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def match_language(requested, available, default=None):
+    """
+    Chooses a language from those available using the BCP 47 "Lookup" scheme of RFC 4647, Section 3.4.
+
+    Each requested language tag is tried in turn, first as given and then with subtags removed from the end, so that
+    ``en-AU`` falls back to ``en``. If that finds nothing, an available language that is more specific than the
+    requested one (``en-AU`` for ``en``) is taken. A requested ``*`` selects the default. Tags are compared
+    case-insensitively and the available language's own spelling is returned.
+
+    Results are memoized per (requested languages, available languages) pair.
+
+    :param requested: Language tags in order of preference.
+    :type requested: tuple (of str)
+    :param available: The languages that may be returned, e.g. a :class:`.Profile`'s languages.
+    :type available: tuple (of str)
+    :param default: The language to return if no requested language is available.
+    :type default: str
+    :return: A language from available, or the default
+    :rtype: str
+    """
+    available_by_lower = {}
+    for language in available:
+        available_by_lower.setdefault(language.lower(), language)
+
+    for language in requested:
+        tag = language.lower()
+        if tag == '*':
+            return default
+        # progressively truncate the tag, dropping any single-letter subtag left at the end
+        while tag:
+            if tag in available_by_lower:
+                return available_by_lower[tag]
+            tag = tag.rpartition('-')[0]
+            if len(tag) > 1 and tag[-2] == '-':
+                tag = tag[:-2]
+
+    for language in requested:
+        prefix = language.lower() + '-'
+        for lower, language_available in available_by_lower.items():
+            if lower.startswith(prefix):
+                return language_available
+
+    return default
+
+
+def _split(s, sep):
+    # splits s on sep, except within quoted strings, stripping whitespace and dropping empty elements
+    if '"' not in s:
+        return [x.strip() for x in s.split(sep) if x.strip()]
+
+    elements = []
+    current = []
+    quoted = False
+    escaped = False
+    for c in s:
+        if escaped:
+            escaped = False
+        elif c == '\\' and quoted:
+            escaped = True
+        elif c == '"':
+            quoted = not quoted
+        elif c == sep and not quoted:
+            elements.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(c)
+    elements.append(''.join(current).strip())
+    return [x for x in elements if x]
+
+
+def _parse_params(parts):
+    # returns the media type parameters before any weight, and the weight
+    params = []
+    for part in parts:
+        name, _, value = part.partition('=')
+        name = name.strip().lower()
+        value = value.strip()
+        if name == 'q':
+            return tuple(sorted(params)), _parse_qvalue(value)
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        params.append((name, value))
+    return tuple(sorted(params)), 1.0
+
+
+def _parse_qvalue(value):
+    q = float(value)
+    if not 0 <= q <= 1:
+        raise ValueError('The weight {} is not between 0 and 1'.format(value))
+    return q
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _split_mediatype(mediatype):
+    parts = _split(mediatype, ';')
+    params, _ = _parse_params(parts[1:])
+    return parts[0].lower(), params
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Precompiled representations of the Alternates profile.
+
+The Alternates profile of a resource depends only on the set of profiles, the default profile token and the
+resource's URI (and, for HTML, the request's base URL). Representations are therefore rendered once per profile set
+and Media Type with placeholders standing in for these, and split at the placeholders so that a request only needs to
+join the fragments with its values, escaped as the Media Type requires.
+"""
+import json
+import re
+from xml.sax.saxutils import escape
+
+from markupsafe import escape as escape_html
+
+# URIs that no real resource has, used in place of the instance URI, and the request's base URL, while rendering a
+# representation
+INSTANCE_URI_PLACEHOLDER = 'urn:x-pyldapi:instance-uri'
+BASE_URL_PLACEHOLDER = 'urn:x-pyldapi:base-url'
+
+# what is left of a placeholder that a template has changed, e.g. URL-encoded or upper-cased, so that it can't be split
+_PLACEHOLDER_REMNANT = re.compile(b'x-pyldapi', re.IGNORECASE)
+
+
+class NotPrerenderable(Exception):
+    """
+    Raised when rendering a representation needs more of the request than can be substituted in afterwards.
+    """
+    pass
+
+
+class PlaceholderURL:
+    """
+    Stands in for the request's base URL when pre-rendering an HTML template. It can only be written out, as
+    :data:`BASE_URL_PLACEHOLDER`; using any of its parts, e.g. its path, raises :class:`NotPrerenderable`.
+    """
+
+    def __getattr__(self, name):
+        # Jinja2 & MarkupSafe look for special methods, like __html__, with hasattr()
+        if name.startswith('__'):
+            raise AttributeError(name)
+        raise NotPrerenderable('request.base_url.{}'.format(name))
+
+    def __getitem__(self, key):
+        raise NotPrerenderable('request.base_url[{!r}]'.format(key))
+
+    def __str__(self):
+        return BASE_URL_PLACEHOLDER
+
+
+class PlaceholderRequest:
+    """
+    Stands in for the request when pre-rendering an HTML template. Only the request's base URL is available, as a
+    :class:`PlaceholderURL`; using anything else raises :class:`NotPrerenderable`.
+    """
+    base_url = PlaceholderURL()
+
+    def __getattr__(self, name):
+        raise NotPrerenderable('request.{}'.format(name))
+
+    def __getitem__(self, key):
+        raise NotPrerenderable('request[{!r}]'.format(key))
+
+    def __str__(self):
+        raise NotPrerenderable('request')
+
+
+def _escape_xml(uri):
+    return escape(uri, {'"': '&quot;'})
+
+
+def _escape_json(uri):
+    return json.dumps(uri, ensure_ascii=False)[1:-1]
+
+
+def _escape_html(uri):
+    return str(escape_html(uri))
+
+
+# how to write a URI inside each Media Type's syntax; Turtle & N-Triples write IRIs as-is within <>
+URI_ESCAPES = {
+    'application/rdf+xml': _escape_xml,
+    'application/ld+json': _escape_json,
+    'application/json': _escape_json,
+    'text/html': _escape_html,
+}
+
+
+def split_representation(representation, placeholders=(INSTANCE_URI_PLACEHOLDER,)):
+    """
+    Splits a representation rendered with the given placeholders in place of per-request values.
+
+    :param representation: The rendered representation.
+    :type representation: bytes
+    :param placeholders: The placeholders used.
+    :type placeholders: tuple (of str)
+    :return: The representation's fragments: bytes, and the index of the placeholder between each of them
+    :rtype: tuple
+    """
+    encoded = [p.encode('utf-8') for p in placeholders]
+    parts = re.split(b'(' + b'|'.join(re.escape(p) for p in encoded) + b')', representation)
+    return tuple(encoded.index(part) if i % 2 else part for i, part in enumerate(parts))
+
+
+def is_split(fragments):
+    """
+    Tells whether a representation's placeholders were all split out of it by :func:`split_representation`, rather
+    than some being left in it changed, e.g. URL-encoded by a template's filter.
+
+    :param fragments: The representation's fragments.
+    :type fragments: tuple
+    :rtype: bool
+    """
+    return not any(isinstance(f, bytes) and _PLACEHOLDER_REMNANT.search(f) for f in fragments)
+
+
+def join_representation(fragments, mediatype, *values):
+    """
+    Joins the fragments of a representation made by :func:`split_representation` with the values of its
+    placeholders, e.g. the instance URI.
+
+    :param fragments: The representation's fragments.
+    :type fragments: tuple
+    :param mediatype: The Media Type of the representation.
+    :type mediatype: str
+    :param values: The value of each placeholder, in the order the placeholders were given.
+    :type values: str
+    :rtype: bytes
+    """
+    escape_uri = URI_ESCAPES.get(mediatype)
+    if escape_uri is not None:
+        values = [escape_uri(v) for v in values]
+    values = [v.encode('utf-8') for v in values]
+    return b''.join(values[f] if isinstance(f, int) else f for f in fragments)
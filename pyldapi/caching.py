@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    A small, thread-safe, size-bounded Least Recently Used cache.
+
+    pyLDAPI uses these to remember work that depends only on the inputs to a request, such as content negotiation
+    decisions, rather than redoing it on each request. Each cache counts its hits and misses and may be turned off,
+    in which case every lookup misses and nothing is stored:
+
+    .. code-block:: python
+
+        Renderer.negotiation_cache.enabled = False  # or
+        Renderer.negotiation_cache.maxsize = 0
+    """
+
+    def __init__(self, maxsize=1024, enabled=True):
+        """
+        Constructor
+
+        :param maxsize: The maximum number of entries to hold. The least recently used entry is dropped beyond this.
+        :type maxsize: int
+        :param enabled: Whether or not the cache stores and returns entries.
+        :type enabled: bool
+        """
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        """
+        Returns the entry for key, marking it as most recently used, or default if there is none.
+        """
+        if not self.enabled:
+            return default
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores value against key, evicting the least recently used entry if the cache is full.
+        """
+        if not self.enabled or self._maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns the cache's statistics.
+
+        :return: hits, misses, maxsize & currsize
+        :rtype: dict
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self._maxsize,
+            'currsize': len(self._data),
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
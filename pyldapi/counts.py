@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Count providers: how a :class:`.ContainerRenderer` gets the total number of its members when counting them exactly,
+e.g. with a ``COUNT(*)`` per request, costs too much.
+
+A ContainerRenderer's ``members_total_count`` can be a callable, or coroutine function, that returns the count. It is
+only called for the Members profile, and a member source's ``count()`` can be used in the same way. Two kinds of
+provider help:
+
+* :class:`CachedCount` keeps the count it gets from another callable for a time to live, so that one count serves
+  every request in that time
+* :class:`ApproximateCount` marks a count as an estimate, e.g. from a database's table statistics, for which the
+  container doesn't say which page is last, as it doesn't know
+
+.. code-block:: python
+
+    # module level, so that the cached count is shared by requests
+    items_count = CachedCount(
+        lambda: int(db.execute("SELECT reltuples FROM pg_class WHERE relname = 'item'").fetchone()[0]),
+        ttl=300,
+        exact=False
+    )
+
+    ContainerRenderer(request, uri, label, comment, None, None, members, items_count)
+"""
+import inspect
+import time
+from threading import Lock
+
+
+class ApproximateCount(int):
+    """
+    A count that is an estimate. It is used as the int it is, but paging with it doesn't give a last page, or reject
+    pages after its estimate of the last.
+    """
+
+    exact = False
+
+    def __repr__(self):
+        return 'ApproximateCount({})'.format(int(self))
+
+
+def is_exact_count(count):
+    """
+    Tells whether a count is exact, i.e. isn't an :class:`ApproximateCount`.
+
+    :rtype: bool
+    """
+    return getattr(count, 'exact', True)
+
+
+class CachedCount:
+    """
+    A count provider that keeps the count another returns for a time to live. It is thread-safe and the count it
+    wraps can be a coroutine function, in which case calling this returns an awaitable.
+    """
+
+    def __init__(self, count, ttl=60, exact=True):
+        """
+        Constructor
+
+        :param count: Returns the count.
+        :type count: callable
+        :param ttl: The number of seconds to keep the count for.
+        :type ttl: float
+        :param exact: Whether the count is exact. If False, the counts are kept as :class:`ApproximateCount`.
+        :type exact: bool
+        """
+        self._count = count
+        self.ttl = ttl
+        self.exact = exact
+        self._value = None
+        self._expires = None
+        self._lock = Lock()
+
+    def __call__(self):
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires:
+                return self._value
+        value = self._count()
+        if inspect.isawaitable(value):
+            return self._store_awaited(value)
+        return self._store(value)
+
+    async def _store_awaited(self, value):
+        return self._store(await value)
+
+    def _store(self, value):
+        if not self.exact and is_exact_count(value):
+            value = ApproximateCount(value)
+        with self._lock:
+            self._value = value
+            self._expires = time.monotonic() + self.ttl
+        return value
+
+    def invalidate(self):
+        """
+        Forgets the count, so that the next call gets it afresh.
+        """
+        with self._lock:
+            self._value = None
+            self._expires = None
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+A member source for containers whose members are in an rdflib Graph that is already loaded, so that a
+:class:`.ContainerRenderer` gets a page of them without a SPARQL query pulling every member first.
+
+:class:`GraphMemberSource` finds a container's members with one triple pattern, ``(container, predicate, ?member)``,
+or ``(?member, predicate, container)`` for inverse predicates like dcterms:isPartOf, sorts their URIs and keeps them
+as an index for as long as the graph's version doesn't change. A page is then a slice of the index, or, for cursor
+paging, a bisection of it, with its members' labels looked up in the graph and kept along with the index.
+
+.. code-block:: python
+
+    # module level, so that the index is shared by requests
+    items = GraphMemberSource(g, 'http://example.com/items')
+
+    ContainerRenderer(request, uri, label, comment, None, None, items, None)
+"""
+from bisect import bisect_left, bisect_right
+from threading import Lock
+
+from rdflib import URIRef, RDFS
+
+from pyldapi.member_table import MemberTable
+from pyldapi.members import KeysetMemberSource
+
+
+class GraphMemberSource(KeysetMemberSource):
+    """
+    The members of a container in an rdflib Graph, ordered by URI, which can be paged by offset or by cursor.
+
+    The index of the members, and the labels looked up for them, are made again when the graph's version changes. A
+    member with several labels is given the one in ``language``, if it is set, else an untagged one. By default, the
+    version is the number of triples in the graph, which an in-memory graph knows without counting, but which doesn't
+    change if a triple is replaced by another, so a ``version`` callable, e.g. returning a counter kept by whatever
+    updates the graph, or :meth:`invalidate` can be used instead.
+    """
+
+    def __init__(self, graph, container_uri, predicate=RDFS.member, inverse=False, label_predicate=RDFS.label,
+                 version=None, language=None):
+        """
+        Constructor
+
+        :param graph: The graph holding the container's members.
+        :type graph: :class:`rdflib.Graph`
+        :param container_uri: The container's URI.
+        :type container_uri: str
+        :param predicate: The predicate linking the container to its members.
+        :type predicate: :class:`rdflib.URIRef`
+        :param inverse: Whether the predicate links the members to the container instead, like dcterms:isPartOf.
+        :type inverse: bool
+        :param label_predicate: The predicate of the members' labels, or None for members without labels.
+        :type label_predicate: :class:`rdflib.URIRef`
+        :param version: Returns the graph's version, by default the number of triples in it.
+        :type version: callable
+        :param language: The language of the labels to prefer, e.g. 'en', over untagged ones.
+        :type language: str
+        """
+        self.graph = graph
+        self.container_uri = URIRef(container_uri)
+        self.predicate = predicate
+        self.inverse = inverse
+        self.label_predicate = label_predicate
+        self.language = language.lower() if language is not None else None
+        self._version = version if version is not None else graph.__len__
+        # the graph's version, the members' URIs, sorted, and the labels looked up for them so far, by URI
+        self._indexed = None
+        self._lock = Lock()
+
+    def _get_indexed(self):
+        version = self._version()
+        with self._lock:
+            if self._indexed is None or version != self._indexed[0]:
+                if self.inverse:
+                    members = self.graph.subjects(self.predicate, self.container_uri)
+                else:
+                    members = self.graph.objects(self.container_uri, self.predicate)
+                # Blank Nodes & Literals can't be linked to, so aren't members that can be listed
+                members = {str(m) for m in members if isinstance(m, URIRef)}
+                self._indexed = (version, sorted(members), {})
+            return self._indexed
+
+    def index(self):
+        """
+        Returns the members' URIs, sorted, making them again if the graph's version has changed since they were last
+        made.
+
+        :rtype: list (of str)
+        """
+        return self._get_indexed()[1]
+
+    def invalidate(self):
+        """
+        Forgets the index, so that it is made afresh for the next page.
+        """
+        with self._lock:
+            self._indexed = None
+
+    def labels(self, uris):
+        """
+        Returns the labels of a page's members, or None for members without one, looking up those not already looked
+        up since the index was made. It can be overridden to look them up in one go for each page instead, e.g. with a
+        SPARQL ``VALUES`` query for a graph in a remote store.
+
+        :param uris: The members' URIs.
+        :type uris: list (of str)
+        :rtype: list
+        """
+        if self.label_predicate is None:
+            return [None] * len(uris)
+        labels = self._get_indexed()[2]
+        page = []
+        for uri in uris:
+            try:
+                label = labels[uri]
+            except KeyError:
+                label = labels[uri] = self._get_label(URIRef(uri))
+            page.append(label)
+        return page
+
+    def _get_label(self, member):
+        # the first label in the preferred language, else the first untagged one, else the first of any other
+        best = None
+        best_rank = -1
+        for label in self.graph.objects(member, self.label_predicate):
+            language = getattr(label, 'language', None)
+            if language is None:
+                rank = 1
+            else:
+                rank = 2 if language.lower() == self.language else 0
+            if rank > best_rank:
+                best = label
+                best_rank = rank
+                if rank == 2:
+                    break
+        return best
+
+    def _table(self, uris):
+        return MemberTable(uris, self.labels(uris))
+
+    def fetch(self, offset, limit):
+        return self._table(self.index()[offset:offset + limit])
+
+    def count(self):
+        return len(self.index())
+
+    def seek(self, key, limit, forward=True):
+        index = self.index()
+        if forward:
+            start = 0 if key is None else bisect_right(index, key)
+            return self._table(index[start:start + limit])
+        end = len(index) if key is None else bisect_left(index, key)
+        return self._table(index[max(end - limit, 0):end][::-1])
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+JSON encoding straight to UTF-8 bytes, with orjson if it is installed and the standard library's json otherwise.
+
+The encoder can be replaced, e.g. to use another library or to encode more types, with :func:`set_json_encoder`.
+Both built-in encoders write compact JSON without escaping non-ASCII characters, as Starlette's JSONResponse does.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# the number of array items encoded into each chunk by iter_json_object()
+JSON_CHUNK_ITEMS = 1000
+
+
+def _dumps_stdlib(obj):
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+def _dumps_orjson(obj):
+    return orjson.dumps(obj)
+
+
+_encoder = _dumps_orjson if orjson is not None else _dumps_stdlib
+
+
+def set_json_encoder(encoder=None):
+    """
+    Sets the encoder :func:`dumps` uses.
+
+    :param encoder: A callable taking a JSON-serializable object and returning it as UTF-8 encoded JSON bytes, or
+    None for the built-in one.
+    :type encoder: callable
+    """
+    global _encoder
+    if encoder is None:
+        encoder = _dumps_orjson if orjson is not None else _dumps_stdlib
+    _encoder = encoder
+
+
+def dumps(obj):
+    """
+    Encodes an object as JSON.
+
+    :param obj: The object.
+    :return: UTF-8 encoded JSON
+    :rtype: bytes
+    """
+    return _encoder(obj)
+
+
+def iter_json_object(obj, array_key, items, chunk_items=JSON_CHUNK_ITEMS):
+    """
+    Encodes an object with one, possibly very large, array member in chunks, so that the array is never held
+    encoded as a whole. The array is written after the object's other members.
+
+    :param obj: The object's other members.
+    :type obj: dict
+    :param array_key: The array's key.
+    :type array_key: str
+    :param items: The array's items.
+    :type items: iterable
+    :param chunk_items: The number of items to encode into each chunk.
+    :type chunk_items: int
+    :return: Chunks of UTF-8 encoded JSON
+    :rtype: generator (of bytes)
+    """
+    head = dumps(obj)[:-1]
+    yield head + (b',' if len(head) > 1 else b'') + dumps(array_key) + b':['
+
+    # each chunk of items is encoded as an array, without its brackets
+    chunk = []
+    separator = b''
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_items:
+            yield separator + dumps(chunk)[1:-1]
+            chunk = []
+            separator = b','
+    if chunk:
+        yield separator + dumps(chunk)[1:-1]
+    yield b']}'
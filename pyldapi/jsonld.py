@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+JSON-LD for the built-in Members and Alternates profiles, written directly rather than by building an rdflib Graph
+and running rdflib's JSON-LD serializer.
+
+Each profile's JSON-LD has a static, inline ``@context`` and a ``@graph`` of plain dicts holding the same triples as
+:meth:`.ContainerRenderer._generate_mem_profile_rdf` and :meth:`.Renderer._generate_alt_profiles_rdf` make.
+"""
+from rdflib import Literal
+
+_XSD = 'http://www.w3.org/2001/XMLSchema#'
+
+MEM_CONTEXT = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+    'ldp': 'http://www.w3.org/ns/ldp#',
+    'xhv': 'https://www.w3.org/1999/xhtml/vocab#',
+    'label': 'rdfs:label',
+    'comment': 'rdfs:comment',
+    'member': {'@id': 'rdfs:member', '@type': '@id'},
+    'memberOf': {'@reverse': 'rdfs:member', '@type': '@id'},
+    'pageOf': {'@id': 'ldp:pageOf', '@type': '@id'},
+    'first': {'@id': 'xhv:first', '@type': '@id'},
+    'last': {'@id': 'xhv:last', '@type': '@id'},
+    'prev': {'@id': 'xhv:prev', '@type': '@id'},
+    'next': {'@id': 'xhv:next', '@type': '@id'},
+}
+
+ALT_CONTEXT = {
+    'altr': 'http://www.w3.org/ns/dx/conneg/altr#',
+    'dct': 'http://purl.org/dc/terms/',
+    'prof': 'http://www.w3.org/ns/dx/prof/',
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+    'xsd': _XSD,
+    'label': {'@id': 'rdfs:label', '@type': 'xsd:string'},
+    'comment': {'@id': 'rdfs:comment', '@type': 'xsd:string'},
+    'conformsTo': {'@id': 'dct:conformsTo', '@type': '@id'},
+    'format': 'dct:format',
+    'hasToken': {'@id': 'prof:hasToken', '@type': 'xsd:token'},
+    'isProfilesDefault': 'altr:isProfilesDefault',
+    'hasRepresentation': 'altr:hasRepresentation',
+    'hasDefaultRepresentation': {'@id': 'altr:hasDefaultRepresentation', '@type': '@id'},
+}
+
+
+def jsonld_literal(value, lang=None):
+    """
+    Writes a value as a JSON-LD value with the same RDF literal as :class:`rdflib.Literal` makes of it.
+
+    :param value: The value.
+    :param lang: The language of a string value.
+    :type lang: str
+    """
+    if isinstance(value, str) and not isinstance(value, Literal):
+        return {'@value': value, '@language': lang} if lang is not None else value
+    if isinstance(value, (bool, int)) and not isinstance(value, Literal):
+        # JSON-LD reads JSON numbers without fractions, and true & false, as xsd:integer & xsd:boolean
+        return value
+    literal = value if isinstance(value, Literal) else Literal(value, lang=lang)
+    if literal.language is not None:
+        return {'@value': str(literal), '@language': literal.language}
+    if literal.datatype is not None:
+        return {'@value': str(literal), '@type': str(literal.datatype)}
+    return str(literal)
+
+
+def iter_mem_profile_nodes(instance_uri, label, comment, members, page_uri, page_links,
+                           parent_container_uri=None, parent_container_label=None):
+    """
+    Writes the Members profile of a page of a container as JSON-LD node objects for its ``@graph``. The members'
+    nodes come last, each giving its container with the ``memberOf`` reverse property, so that they can be streamed.
+
+    :param members: The members.
+    :type members: :class:`.MemberTable`
+    :param page_links: The URIs of the first, previous, next & last pages, by their xhv: link relation.
+    :type page_links: dict
+    :rtype: generator (of dict)
+    """
+    container = {
+        '@id': instance_uri,
+        '@type': 'rdf:Bag',
+        'label': jsonld_literal(label),
+        'comment': jsonld_literal(comment, lang='en'),
+    }
+    yield container
+
+    page_node = {
+        '@id': page_uri,
+        '@type': 'ldp:Page',
+        'pageOf': instance_uri,
+    }
+    page_node.update(page_links)
+    yield page_node
+
+    if parent_container_uri is not None:
+        parent = {
+            '@id': parent_container_uri,
+            'rdf:Bag': {'@id': instance_uri},
+            'member': instance_uri,
+        }
+        if parent_container_label is not None:
+            parent['label'] = jsonld_literal(parent_container_label)
+        yield parent
+
+    for uri, member_label, member_class in members.rows():
+        node = {'@id': uri, 'memberOf': instance_uri}
+        if member_label is not None:
+            node['label'] = jsonld_literal(member_label)
+        if member_class is not None:
+            node['@type'] = member_class
+        yield node
+
+
+def alt_profiles_jsonld(profiles, default_profile_token, instance_uri):
+    """
+    Writes the Alternates profile of a resource as JSON-LD.
+
+    :param profiles: The resource's profiles.
+    :type profiles: :class:`.ProfileRegistry`
+    :param default_profile_token: The token of the default profile.
+    :type default_profile_token: str
+    :param instance_uri: The resource's URI.
+    :type instance_uri: str
+    :rtype: dict
+    """
+    graph = []
+    for token, p in profiles.items():
+        graph.append({
+            '@id': p.uri,
+            '@type': 'prof:Profile',
+            'label': str(p.label),
+            'comment': str(p.comment),
+        })
+
+    instance = {'@id': instance_uri, 'hasRepresentation': []}
+    for token, p in profiles.items():
+        for mt in p.public_mediatypes:  # ignore Media Types like `_internal`
+            rep = {
+                '@id': '_:r{}'.format(len(instance['hasRepresentation'])),
+                '@type': 'altr:Representation',
+                'conformsTo': p.uri,
+                'format': mt,
+                'hasToken': token,
+            }
+            # if this is the default format for the Profile, say so
+            if mt == p.default_mediatype:
+                rep['isProfilesDefault'] = True
+                # if this is the default Profile and the default Media Type, set it as the instance's default Rep
+                if token == default_profile_token:
+                    instance['hasDefaultRepresentation'] = rep['@id']
+            instance['hasRepresentation'].append(rep)
+    graph.append(instance)
+
+    return {'@context': ALT_CONTEXT, '@graph': graph}
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+from urllib.parse import quote
+
+
+class LinkHeaderTemplate:
+    """
+    A precompiled HTTP Link header that varies only by the URI of the resource it is for.
+
+    The header is held as a tuple of fragments that are joined with the instance URI, so rendering it costs a single
+    :meth:`str.join`:
+
+    .. code-block:: python
+
+        t = LinkHeaderTemplate.from_links(('<', '?_profile=alt>; rel="alternate"'))
+        t.render('http://example.com/thing/1')  # '<http://example.com/thing/1?_profile=alt>; rel="alternate"'
+
+    Templates are immutable. :meth:`extend` returns a new template with more links appended, which is how
+    :class:`.ContainerRenderer` adds its paging links to a Renderer's profile links.
+    """
+    __slots__ = ('fragments',)
+
+    def __init__(self, fragments):
+        """
+        Constructor
+
+        :param fragments: The header split at each place the instance URI is to be inserted.
+        :type fragments: tuple (of str)
+        """
+        self.fragments = tuple(fragments)
+
+    @classmethod
+    def from_links(cls, *links):
+        """
+        Makes a template from individual links, each given as either a string, which doesn't contain the instance URI,
+        or a tuple of fragments, as per the constructor.
+
+        :rtype: :class:`.LinkHeaderTemplate`
+        """
+        return cls(('',)).extend(*links)
+
+    def extend(self, *links):
+        """
+        Returns a new template with the given links, as per :meth:`from_links`, appended.
+
+        :rtype: :class:`.LinkHeaderTemplate`
+        """
+        fragments = list(self.fragments)
+        for link in links:
+            if isinstance(link, str):
+                link = (link,)
+            if fragments == ['']:
+                fragments[-1] = link[0]
+            else:
+                fragments[-1] += ', ' + link[0]
+            fragments.extend(link[1:])
+        return LinkHeaderTemplate(fragments)
+
+    def render(self, instance_uri):
+        """
+        Returns the Link header for the given instance URI.
+
+        :param instance_uri: The URI of the resource the header is for.
+        :type instance_uri: str
+        :rtype: str
+        """
+        return instance_uri.join(self.fragments)
+
+
+def make_link_tokens(profiles):
+    """
+    Returns the Link header values that list each profile's token. These don't depend on the instance URI.
+
+    :param profiles: token -> :class:`.Profile`
+    :type profiles: dict or :class:`.ProfileRegistry`
+    :rtype: list (of str)
+    """
+    return [
+        '<http://www.w3.org/ns/dx/prof/Profile>; rel="type"; token="{}"; anchor=<{}>'.format(token, profile.uri)
+        for token, profile in profiles.items()
+    ]
+
+
+def make_link_list_profiles(profiles, profile_token):
+    """
+    Returns a link, as a tuple of fragments, for each profile & Media Type. The default Media Type of the profile with
+    the given token is marked as rel="self".
+
+    :param profiles: token -> :class:`.Profile`
+    :type profiles: dict or :class:`.ProfileRegistry`
+    :param profile_token: The token of the profile being returned.
+    :type profile_token: str
+    :rtype: list (of tuple)
+    """
+    links = []
+    for token, profile in profiles.items():
+        # create an individual Link statement per Media Type
+        for mediatype in profile.public_mediatypes:
+            # set the rel="self" just for this profile & mediatype
+            if token == profile_token and mediatype == profile.default_mediatype:
+                rel = 'self'
+            else:
+                rel = 'alternate'
+
+            links.append((
+                '<',
+                '?_profile={}&_mediatype={}>; rel="{}"; type="{}"; profile="{}"'.format(
+                    token,
+                    mediatype,
+                    rel,
+                    mediatype,
+                    profile.uri
+                )
+            ))
+    return links
+
+
+def compile_link_header(profiles, profile_token):
+    """
+    Compiles the complete Link header a :class:`.Renderer` returns for the profile with the given token.
+
+    :param profiles: token -> :class:`.Profile`
+    :type profiles: dict or :class:`.ProfileRegistry`
+    :param profile_token: The token of the profile being returned.
+    :type profile_token: str
+    :rtype: :class:`.LinkHeaderTemplate`
+    """
+    return LinkHeaderTemplate.from_links(
+        '<' + profiles[profile_token].uri + '>; rel="profile"',
+        *make_link_tokens(profiles),
+        *make_link_list_profiles(profiles, profile_token)
+    )
+
+
+# the Query String Arguments that select a page, which the links to other pages give values of their own
+PAGING_QSAS = ('page', 'per_page', 'cursor')
+
+# the characters left as they are in Query String Argument names & values, as well as letters, digits and '_.-~'. '&',
+# '=', '+', '#' & spaces, and anything not allowed in a URI, are percent-encoded.
+_QSA_SAFE = "/:@!$'()*,;"
+
+
+def _encode_qsas(qsas):
+    return '&'.join(quote(str(k), safe=_QSA_SAFE) + '=' + quote(str(v), safe=_QSA_SAFE) for k, v in qsas)
+
+
+class PageLinks:
+    """
+    The Query Strings of a page of a container and of the first, previous, next & last pages that there are, keeping
+    the request's other Query String Arguments, made once per request for a :class:`.ContainerRenderer`'s Link header,
+    HTML template context and RDF.
+
+    Pages are selected by their ``per_page`` & ``page`` QSAs or, for cursor paging, ``per_page`` & ``cursor``. QSA
+    names & values are percent-encoded, so values with '&', '=' or spaces in them link to the pages they came from.
+    """
+    __slots__ = ('query', 'queries')
+
+    # the link relations, in the order the links are given
+    RELS = ('first', 'prev', 'next', 'last')
+
+    def __init__(self, query, queries):
+        """
+        Constructor
+
+        :param query: The Query String of this page.
+        :type query: str
+        :param queries: The Query Strings of the other pages by their link relation: 'first', 'prev', 'next' or 'last'.
+        :type queries: dict
+        """
+        self.query = query
+        self.queries = {rel: queries[rel] for rel in self.RELS if queries.get(rel) is not None}
+
+    @staticmethod
+    def _base_qsas(query_params, per_page):
+        # the request's other QSAs, in order and with any repeats, then the page size
+        if hasattr(query_params, 'multi_items'):
+            query_params = query_params.multi_items()
+        elif hasattr(query_params, 'items'):
+            query_params = query_params.items()
+        return [(k, v) for k, v in query_params if k not in PAGING_QSAS] + [('per_page', per_page)]
+
+    @classmethod
+    def for_pages(cls, query_params, per_page, page, prev_page=None, next_page=None, last_page=None, first_page=1):
+        """
+        Makes the links of a page selected by number.
+
+        :param query_params: The request's Query String Arguments.
+        :type query_params: :class:`starlette.datastructures.QueryParams` or dict
+        :param per_page: The page size.
+        :type per_page: int
+        :param page: This page's number.
+        :type page: int
+        :param prev_page: The previous page's number, if there is one.
+        :type prev_page: int
+        :param next_page: The next page's number, if there is one.
+        :type next_page: int
+        :param last_page: The last page's number, if it is known.
+        :type last_page: int
+        :param first_page: The first page's number.
+        :type first_page: int
+        :rtype: :class:`.PageLinks`
+        """
+        base = _encode_qsas(cls._base_qsas(query_params, per_page)) + '&page='
+        return cls(base + str(page), {
+            rel: base + str(number) if number is not None else None
+            for rel, number in zip(cls.RELS, (first_page, prev_page, next_page, last_page))
+        })
+
+    @classmethod
+    def for_cursors(cls, query_params, per_page, cursor=None, prev_cursor=None, next_cursor=None, last_cursor=None):
+        """
+        Makes the links of a page selected by cursor. The first page has no cursor.
+
+        :param query_params: The request's Query String Arguments.
+        :type query_params: :class:`starlette.datastructures.QueryParams` or dict
+        :param per_page: The page size.
+        :type per_page: int
+        :param cursor: This page's cursor, or None for the first page.
+        :type cursor: str
+        :param prev_cursor: The previous page's cursor, if there is one.
+        :type prev_cursor: str
+        :param next_cursor: The next page's cursor, if there is one.
+        :type next_cursor: str
+        :param last_cursor: The last page's cursor, if there is one.
+        :type last_cursor: str
+        :rtype: :class:`.PageLinks`
+        """
+        base = _encode_qsas(cls._base_qsas(query_params, per_page))
+        with_cursor = base + '&cursor='
+        return cls(with_cursor + quote(cursor, safe='') if cursor is not None else base, {
+            'first': base,
+            'prev': with_cursor + quote(prev_cursor, safe='') if prev_cursor is not None else None,
+            'next': with_cursor + quote(next_cursor, safe='') if next_cursor is not None else None,
+            'last': with_cursor + quote(last_cursor, safe='') if last_cursor is not None else None,
+        })
+
+    def header_links(self):
+        """
+        Returns the links to the other pages for a :class:`.LinkHeaderTemplate`, split at the instance URI.
+
+        :rtype: list (of tuple)
+        """
+        return [('<', '?{}>; rel="{}"'.format(query, rel)) for rel, query in self.queries.items()]
+
+    def uris(self, instance_uri):
+        """
+        Returns the URIs of this page and of the other pages.
+
+        :param instance_uri: The container's URI.
+        :type instance_uri: str
+        :return: This page's URI, and the other pages' URIs by their link relation
+        :rtype: tuple
+        """
+        return instance_uri + '?' + self.query, {rel: instance_uri + '?' + q for rel, q in self.queries.items()}
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+A columnar representation of a container's members.
+
+Members can be given to a :class:`.ContainerRenderer` as plain URIs, (URI, label) or (URI, class URI, label) tuples,
+or dicts with 'uri' & 'title' keys. A :class:`MemberTable` holds them normalized, in parallel URI, label and, if any
+member has one, class columns, built once, so that each of the Members profile's representations reads the columns
+rather than telling the forms apart for every member.
+"""
+from itertools import repeat
+
+# the form each member was given in, so that it can be given back in that form, e.g. in the Members profile's JSON
+_URI = 0
+_PAIR = 1
+_TRIPLE = 2
+_DICT = 3
+
+
+class MemberTable:
+    """
+    A container's members, as parallel columns of their URIs, labels & classes, with None where a member has no
+    label or class. ``classes`` is None if no member has a class.
+
+    A MemberTable is a sequence of the members in the forms they were given in, so it can be used in place of the list
+    it was made from, and slicing it slices its columns.
+    """
+    __slots__ = ('uris', 'labels', 'classes', 'kinds')
+
+    def __init__(self, uris, labels=None, classes=None, kinds=None):
+        """
+        Constructor
+
+        :param uris: The members' URIs.
+        :type uris: list (of str)
+        :param labels: The members' labels, or None for members without one.
+        :type labels: list
+        :param classes: The members' class URIs, or None for members without one, or None if no member has a class.
+        :type classes: list
+        :param kinds: The form each member was given in, as for :meth:`from_members`. By default, members with
+        a label are (URI, label) tuples, or (URI, class URI, label) tuples if they have a class, and others plain URIs.
+        :type kinds: bytes
+        """
+        self.uris = uris
+        self.labels = labels if labels is not None else [None] * len(uris)
+        self.classes = classes
+        if kinds is None:
+            kinds = bytes(
+                _URI if label is None and cls is None else _PAIR if cls is None else _TRIPLE
+                for label, cls in zip(self.labels, classes if classes is not None else repeat(None))
+            )
+        self.kinds = kinds
+
+    @classmethod
+    def from_members(cls, members):
+        """
+        Makes a table from members in any of the forms :class:`.ContainerRenderer` takes.
+
+        :param members: The members.
+        :type members: iterable
+        :rtype: :class:`.MemberTable`
+        """
+        if isinstance(members, MemberTable):
+            return members
+        uris = []
+        labels = []
+        classes = None
+        kinds = bytearray()
+        for member in members:
+            if isinstance(member, str):
+                uris.append(member)
+                labels.append(None)
+                kinds.append(_URI)
+            elif isinstance(member, dict):
+                uris.append(member['uri'])
+                labels.append(member.get('title'))
+                kinds.append(_DICT)
+            elif len(member) > 2:
+                if classes is None:
+                    classes = [None] * len(uris)
+                uris.append(member[0])
+                classes.append(member[1])
+                labels.append(member[2])
+                kinds.append(_TRIPLE)
+                continue
+            else:
+                uris.append(member[0])
+                labels.append(member[1] if len(member) > 1 else None)
+                kinds.append(_PAIR)
+            if classes is not None:
+                classes.append(None)
+        return cls(uris, labels, classes, bytes(kinds))
+
+    def __len__(self):
+        return len(self.uris)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MemberTable(
+                self.uris[index],
+                self.labels[index],
+                self.classes[index] if self.classes is not None else None,
+                self.kinds[index]
+            )
+        return self._member(self.kinds[index], self.uris[index], self.labels[index],
+                            self.classes[index] if self.classes is not None else None)
+
+    def __iter__(self):
+        return map(self._member, self.kinds, self.uris, self.labels, self.classes_or_none())
+
+    def __repr__(self):
+        return 'MemberTable({} members)'.format(len(self))
+
+    @staticmethod
+    def _member(kind, uri, label, cls):
+        if kind == _URI:
+            return uri
+        if kind == _PAIR:
+            return uri, label
+        if kind == _TRIPLE:
+            return uri, cls, label
+        return {'uri': uri, 'title': label}
+
+    def classes_or_none(self):
+        """
+        Returns the class column, or Nones if no member has a class.
+
+        :rtype: iterable
+        """
+        return self.classes if self.classes is not None else repeat(None, len(self.uris))
+
+    def rows(self):
+        """
+        Returns each member's URI, label & class.
+
+        :rtype: iterator (of tuple)
+        """
+        return zip(self.uris, self.labels, self.classes_or_none())
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Member sources: where a :class:`.ContainerRenderer` gets its members from, a page at a time, instead of being given
+them as a list.
+
+A member source is any object with two methods:
+
+* ``fetch(offset, limit)``, returning the members on a page, in any of the forms :class:`.ContainerRenderer` takes
+* ``count()``, returning the total number of members
+
+Either or both may be coroutine functions, for :meth:`.ContainerRenderer.arender`. A ContainerRenderer only calls a
+member source for the Members profile: ``count()`` once the profile has been negotiated, if no members_total_count
+was given, and ``fetch()`` once the requested page has been validated.
+
+For cursor paging (see :class:`.ContainerRenderer`'s ``cursor_paging``), a member source must also be able to seek by
+key, like :class:`KeysetMemberSource`, with two more methods:
+
+* ``key(member)``, returning the key the members are ordered by, which must be JSON-serializable
+* ``seek(key, limit, forward=True)``, returning up to ``limit`` members after the key, or before it, nearest first,
+  going backward, starting from the first, or last, member if the key is None
+
+so that a deep page is found by the key of the member before it, e.g. with ``WHERE uri > ? ORDER BY uri LIMIT ?``,
+rather than by counting through all the members before it, as an OFFSET does.
+
+:class:`MemberSource` and :class:`AsyncMemberSource` can be subclassed, and the adapters below wrap lists, iterators
+and SQL-style callables:
+
+.. code-block:: python
+
+    ContainerRenderer(
+        request, uri, label, comment, None, None,
+        CallableMemberSource(
+            lambda offset, limit: db.execute(
+                'SELECT uri, label FROM item ORDER BY uri LIMIT ? OFFSET ?', (limit, offset)
+            ).fetchall(),
+            lambda: db.execute('SELECT COUNT(*) FROM item').fetchone()[0]
+        ),
+        None
+    )
+"""
+import inspect
+import json
+from abc import ABCMeta, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+from pyldapi.member_table import MemberTable
+
+
+class MemberSource(object, metaclass=ABCMeta):
+    """
+    A source of a container's members, as described above.
+    """
+
+    @abstractmethod
+    def fetch(self, offset, limit):
+        """
+        Returns the members on a page.
+
+        :param offset: The number of members before the page.
+        :type offset: int
+        :param limit: The page size.
+        :type limit: int
+        :rtype: list
+        """
+
+    @abstractmethod
+    def count(self):
+        """
+        Returns the total number of members.
+
+        :rtype: int
+        """
+
+
+class AsyncMemberSource(object, metaclass=ABCMeta):
+    """
+    A source of a container's members for async endpoints, whose methods are coroutine functions.
+    """
+
+    @abstractmethod
+    async def fetch(self, offset, limit):
+        """
+        Returns the members on a page.
+
+        :param offset: The number of members before the page.
+        :type offset: int
+        :param limit: The page size.
+        :type limit: int
+        :rtype: list
+        """
+
+    @abstractmethod
+    async def count(self):
+        """
+        Returns the total number of members.
+
+        :rtype: int
+        """
+
+
+class ListMemberSource(MemberSource):
+    """
+    The members of a list, or any other sequence.
+    """
+
+    def __init__(self, members):
+        """
+        Constructor
+
+        :param members: The members.
+        :type members: list
+        """
+        self.members = members
+
+    def fetch(self, offset, limit):
+        page = self.members[offset:offset + limit]
+        # a MemberTable's slice is a MemberTable
+        return page if isinstance(page, (list, MemberTable)) else list(page)
+
+    def count(self):
+        return len(self.members)
+
+
+class IteratorMemberSource(MemberSource):
+    """
+    The members that an iterable, e.g. a generator, yields.
+
+    Given the count, only the members up to the end of the page are taken from the iterable, otherwise counting
+    takes them all, and keeps them, so a generator's members can only be fetched once.
+    """
+
+    def __init__(self, members, count=None):
+        """
+        Constructor
+
+        :param members: The members.
+        :type members: iterable
+        :param count: The total number of members, if known.
+        :type count: int
+        """
+        self.members = members
+        self._count = count
+
+    def fetch(self, offset, limit):
+        if isinstance(self.members, list):
+            return self.members[offset:offset + limit]
+        return list(islice(self.members, offset, offset + limit))
+
+    def count(self):
+        if self._count is None:
+            self.members = list(self.members)
+            self._count = len(self.members)
+        return self._count
+
+
+class CallableMemberSource(MemberSource):
+    """
+    Members fetched, and counted, by callables, e.g. SQL queries with LIMIT & OFFSET and a COUNT(*) query. Either
+    callable may be a coroutine function, for :meth:`.ContainerRenderer.arender`.
+    """
+
+    def __init__(self, fetch, count):
+        """
+        Constructor
+
+        :param fetch: Called with the offset & limit of a page, returning its members.
+        :type fetch: callable
+        :param count: Returns the total number of members, or, if it is known, the number itself.
+        :type count: callable or int
+        """
+        self._fetch = fetch
+        self._count = count
+
+    def fetch(self, offset, limit):
+        return self._fetch(offset, limit)
+
+    def count(self):
+        if callable(self._count):
+            return self._count()
+        return self._count
+
+
+class KeysetMemberSource(MemberSource):
+    """
+    A source of a container's members that can seek by key, as described above, for cursor paging.
+
+    A cursor's key is only sought if it is one of ``key_types``, so that a made-up cursor, e.g. with a number for a
+    key among strings, is rejected rather than failing to compare. Member sources without ``key_types``, or with it
+    set to None, are given any key.
+    """
+
+    key_types = (str,)
+
+    def key(self, member):
+        """
+        Returns the key of a member, by default its URI.
+
+        :param member: The member, in any of the forms :class:`.ContainerRenderer` takes.
+        :rtype: str
+        """
+        return member_uri(member)
+
+    @abstractmethod
+    def seek(self, key, limit, forward=True):
+        """
+        Returns the members after, or before, a key.
+
+        :param key: The key, or None to start from the first, or last, member.
+        :param limit: The most members to return.
+        :type limit: int
+        :param forward: Whether to return the members after the key, in order, or those before it, in reverse order.
+        :type forward: bool
+        :rtype: list
+        """
+
+
+class SortedMemberSource(KeysetMemberSource):
+    """
+    The members of a list sorted by key, sought by bisecting their keys.
+    """
+
+    def __init__(self, members, key=None, key_types=None):
+        """
+        Constructor
+
+        :param members: The members, sorted by key.
+        :type members: list
+        :param key: Returns the key of a member, by default its URI.
+        :type key: callable
+        :param key_types: The types of the keys, by default those of the members' keys.
+        :type key_types: tuple (of type)
+        """
+        self.members = members
+        if key is not None:
+            self.key = key
+        self.keys = [self.key(m) for m in members]
+        if key_types is not None:
+            self.key_types = key_types
+        elif self.keys:
+            self.key_types = tuple({type(k) for k in self.keys})
+
+    def fetch(self, offset, limit):
+        return self.members[offset:offset + limit]
+
+    def count(self):
+        return len(self.members)
+
+    def seek(self, key, limit, forward=True):
+        if forward:
+            start = 0 if key is None else bisect_right(self.keys, key)
+            return self.members[start:start + limit]
+        end = len(self.members) if key is None else bisect_left(self.keys, key)
+        return self.members[max(end - limit, 0):end][::-1]
+
+
+def member_uri(member):
+    """
+    Returns the URI of a member given in any of the forms :class:`.ContainerRenderer` takes.
+
+    :rtype: str
+    """
+    if isinstance(member, dict):
+        return member['uri']
+    if isinstance(member, tuple):
+        return member[0]
+    return member
+
+
+def encode_cursor(key, forward=True):
+    """
+    Makes an opaque cursor for the page after, or before, a key.
+
+    :param key: The key, or None for the first, or last, page.
+    :param forward: Whether the page is after the key.
+    :type forward: bool
+    :rtype: str
+    """
+    token = json.dumps([1 if forward else 0, key], separators=(',', ':')).encode('utf-8')
+    return urlsafe_b64encode(token).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Reads a cursor made by :func:`encode_cursor`.
+
+    :param cursor: The cursor.
+    :type cursor: str
+    :return: The key & whether the page is after it
+    :rtype: tuple
+    :raises ValueError: If the cursor is invalid.
+    """
+    try:
+        forward, key = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (TypeError, ValueError):
+        raise ValueError('Invalid cursor {!r}'.format(cursor))
+    if forward not in (0, 1):
+        raise ValueError('Invalid cursor {!r}'.format(cursor))
+    return key, bool(forward)
+
+
+def is_member_source(obj):
+    """
+    Tells whether an object is a member source, i.e. has ``fetch`` & ``count`` methods.
+
+    :rtype: bool
+    """
+    return callable(getattr(obj, 'fetch', None)) and callable(getattr(obj, 'count', None))
+
+
+def to_member_source(members):
+    """
+    Returns the member source for members given in any of the forms :class:`.ContainerRenderer` takes: a member
+    source, a list, tuple or :class:`.MemberTable`, or another iterable.
+
+    :rtype: :class:`.MemberSource`
+    """
+    if is_member_source(members):
+        return members
+    if isinstance(members, (list, tuple, MemberTable)):
+        return ListMemberSource(members)
+    return IteratorMemberSource(members)
+
+
+def call_member_source(method, *args):
+    """
+    Calls a sync member source's method.
+
+    :raises TypeError: If the method is a coroutine function, which only :meth:`.ContainerRenderer.arender` can call.
+    """
+    result = method(*args)
+    if inspect.isawaitable(result):
+        if inspect.iscoroutine(result):
+            result.close()
+        raise TypeError(
+            'The async member source {!r} can only be used by arender()'.format(getattr(method, '__self__', method))
+        )
+    return result
+
+
+async def acall_member_source(method, *args):
+    """
+    Calls a sync or async member source's method.
+    """
+    result = method(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
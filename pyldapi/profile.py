@@ -13,7 +13,23 @@ class Profile:
         mediatypes = ['text/html', 'text/turtle', 'application/rdf+xml', 'application/rdf+json']
         languages = ['en', 'pl'] # 'en' for English and 'pl' for Polish.
 
+    Profiles are immutable values: they are equal if all their elements are equal and they can be used as dictionary
+    keys, e.g. in caches. The mediatypes and languages given are stored as tuples and the set of mediatypes, and the
+    tuple of public mediatypes (those not starting with '_', like '_internal'), are precomputed.
     """
+    __slots__ = (
+        'uri',
+        'label',
+        'comment',
+        'mediatypes',
+        'default_mediatype',
+        'languages',
+        'default_language',
+        'mediatype_set',
+        'public_mediatypes',
+        '_hash',
+    )
+
     def __init__(
             self,
             uri,
@@ -42,10 +58,47 @@ class Profile:
         :param uri: The namespace URI for the *profile* view.
         :type uri: str
         """
-        self.label = label
-        self.comment = comment
-        self.mediatypes = mediatypes
-        self.default_mediatype = default_mediatype
-        self.languages = languages if languages is not None else ['en']
-        self.default_language = default_language
-        self.uri = uri
+        mediatypes = tuple(mediatypes)
+        languages = tuple(languages) if languages is not None else ('en',)
+        _set = object.__setattr__
+        _set(self, 'label', label)
+        _set(self, 'comment', comment)
+        _set(self, 'mediatypes', mediatypes)
+        _set(self, 'default_mediatype', default_mediatype)
+        _set(self, 'languages', languages)
+        _set(self, 'default_language', default_language)
+        _set(self, 'uri', uri)
+        _set(self, 'mediatype_set', frozenset(mediatypes))
+        _set(self, 'public_mediatypes', tuple(m for m in mediatypes if not m.startswith('_')))
+        _set(self, '_hash', hash(self._key()))
+
+    def _key(self):
+        return (
+            self.uri,
+            self.label,
+            self.comment,
+            self.mediatypes,
+            self.default_mediatype,
+            self.languages,
+            self.default_language,
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Profile):
+            return NotImplemented
+        return self is other or (self._hash == other._hash and self._key() == other._key())
+
+    def __reduce__(self):
+        return self.__class__, self._key()
+
+    def __repr__(self):
+        return 'Profile({!r}, {!r})'.format(self.uri, self.label)
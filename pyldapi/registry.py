@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+from collections.abc import Mapping
+from threading import Lock
+
+
+class ProfileRegistry(Mapping):
+    """
+    A compiled, immutable set of :class:`.Profile` objects keyed by token.
+
+    A registry behaves like the read-only ``dict`` of profiles that :class:`.Renderer` has always used but also holds
+    the indexes that content negotiation needs so that each lookup is a single dictionary access rather than a scan
+    of every profile:
+
+    * token -> :class:`.Profile`
+    * profile URI -> token
+    * token -> set of Media Types
+    * token -> languages
+
+    Registries are intended to be built once per endpoint, e.g. at module level, and passed to a :class:`.Renderer`
+    in place of a ``dict`` of profiles:
+
+    .. code-block:: python
+
+        profiles = ProfileRegistry({'sdo': sdo_profile, 'dcat': dcat_profile})
+
+    Since :class:`.Profile` objects are immutable values, registries with the same tokens and profiles are equal and
+    hash alike, so a registry can key caches of anything derived from its profiles.
+    """
+    __slots__ = ('_profiles', '_tokens_by_uri', '_mediatypes', '_languages', '_key', '_hash', '_overlays')
+
+    def __init__(self, *profiles):
+        """
+        Constructor
+
+        :param profiles: One or more mappings of token -> :class:`.Profile`. Where the same token appears in more than
+        one mapping, the later mapping wins.
+        :type profiles: dict (of :class:`.Profile` class objects)
+        """
+        _profiles = {}
+        for mapping in profiles:
+            _profiles.update(mapping)
+
+        _tokens_by_uri = {}
+        _mediatypes = {}
+        _languages = {}
+        key = []
+        for token, profile in _profiles.items():
+            # the first token given for a URI wins, as it did with the linear scans this replaces
+            _tokens_by_uri.setdefault(profile.uri, token)
+            _mediatypes[token] = profile.mediatype_set
+            _languages[token] = profile.languages
+            key.append((token, profile))
+
+        object.__setattr__(self, '_profiles', _profiles)
+        object.__setattr__(self, '_tokens_by_uri', _tokens_by_uri)
+        object.__setattr__(self, '_mediatypes', _mediatypes)
+        object.__setattr__(self, '_languages', _languages)
+        object.__setattr__(self, '_key', tuple(key))
+        object.__setattr__(self, '_hash', hash(self._key))
+        object.__setattr__(self, '_overlays', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    def __getitem__(self, token):
+        return self._profiles[token]
+
+    def __iter__(self):
+        return iter(self._profiles)
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __contains__(self, token):
+        return token in self._profiles
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, ProfileRegistry):
+            return self._hash == other._hash and self._key == other._key
+        return Mapping.__eq__(self, other)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(self._profiles))
+
+    @property
+    def uris(self):
+        """
+        A ``dict`` of profile URI -> token for every profile in this registry.
+
+        The returned dict is shared and must not be modified.
+
+        :rtype: dict
+        """
+        return self._tokens_by_uri
+
+    def token_for_uri(self, uri, default=None):
+        """
+        Returns the token of the profile identified by the given URI.
+
+        :param uri: A profile URI.
+        :type uri: str
+        :param default: The value to return if no profile has this URI.
+        :return: A profile token
+        :rtype: str
+        """
+        return self._tokens_by_uri.get(uri, default)
+
+    def mediatypes(self, token):
+        """
+        Returns the set of Media Types available for the profile with the given token.
+
+        :param token: A profile token.
+        :type token: str
+        :return: The profile's Media Types
+        :rtype: frozenset
+        """
+        return self._mediatypes[token]
+
+    def languages(self, token):
+        """
+        Returns the languages available for the profile with the given token.
+
+        :param token: A profile token.
+        :type token: str
+        :return: The profile's languages, in the order given
+        :rtype: tuple
+        """
+        return self._languages[token]
+
+    def overlay(self, profiles):
+        """
+        Returns a registry of this registry's profiles with the given profiles laid over them, i.e. added or, for
+        tokens already present, replacing them.
+
+        Neither registry is modified. The result is built on the first call and returned, without any copying, on
+        every later call with equal profiles, which is how :class:`.Renderer` adds its built-in profiles per request.
+
+        :param profiles: The profiles to lay over this registry's.
+        :type profiles: :class:`.ProfileRegistry`
+        :rtype: :class:`.ProfileRegistry`
+        """
+        registry = self._overlays.get(profiles)
+        if registry is None:
+            registry = self._overlays[profiles] = self.__class__(self, profiles)
+        return registry
+
+    @classmethod
+    def compile(cls, *profiles):
+        """
+        Returns a registry for the given mappings of token -> :class:`.Profile`, reusing a previously built registry
+        with the same content if there is one.
+
+        This lets endpoints that still build a ``dict`` of profiles per request share one compiled registry.
+
+        :param profiles: One or more mappings of token -> :class:`.Profile`.
+        :type profiles: dict (of :class:`.Profile` class objects)
+        :rtype: :class:`.ProfileRegistry`
+        """
+        merged = {}
+        for mapping in profiles:
+            merged.update(mapping)
+        key = tuple(merged.items())
+
+        with _compiled_lock:
+            registry = _compiled.get(key)
+            if registry is not None:
+                _compiled.move_to_end(key)
+                return registry
+
+        registry = cls(merged)
+        with _compiled_lock:
+            _compiled[key] = registry
+            if len(_compiled) > COMPILED_REGISTRIES_MAX:
+                _compiled.popitem(last=False)
+        return registry
+
+
+# the number of distinct profile sets ProfileRegistry.compile() keeps compiled registries for
+COMPILED_REGISTRIES_MAX = 128
+
+_compiled = OrderedDict()
+_compiled_lock = Lock()
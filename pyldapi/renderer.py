@@ -1,33 +1,130 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta
+from functools import lru_cache
 
 from fastapi import Response
-from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
 
 from rdflib import Graph, Namespace, URIRef, BNode, Literal
 from rdflib.namespace import PROF, RDF, RDFS, XSD
 from rdflib.namespace import DCTERMS
 from pyldapi.profile import Profile
+from pyldapi.registry import ProfileRegistry
+from pyldapi.caching import LRUCache
+from pyldapi.accept import AcceptHeader, parse_accept, parse_accept_language, match_language
+from pyldapi.alternates import INSTANCE_URI_PLACEHOLDER, BASE_URL_PLACEHOLDER, PlaceholderRequest, \
+    NotPrerenderable, split_representation, join_representation, is_split
+from pyldapi.serializers import SERIALIZERS, OFFLOAD_THRESHOLD, serialize, aserialize, serialize_jsonld
+from pyldapi.templating import render_template_async
+from pyldapi.json_encoding import dumps
+from pyldapi.jsonld import alt_profiles_jsonld
+from pyldapi.validators import make_etag, format_http_date, parse_http_date, is_not_modified
+from pyldapi.response_cache import respond
+from pyldapi.responses import BytesResponse
+from pyldapi.links import LinkHeaderTemplate, compile_link_header, make_link_tokens, make_link_list_profiles
 from pyldapi.exceptions import ProfilesMediatypesException
-import re
 import connegp
 from .data import MEDIATYPE_NAMES, RDF_MEDIATYPES
 
 templates = Jinja2Templates(directory="templates")
 
+# the Alternates profile, which every Renderer adds to the profiles it is given
+ALT_PROFILE = Profile(
+    'http://www.w3.org/ns/dx/conneg/altr',  # the ConnegP URI for Alt Rep Data Model
+    'Alternate Representations',
+    'The representation of the resource that lists all other representations (profiles and Media Types)',
+    ['text/html', 'application/json'] + RDF_MEDIATYPES,
+    'text/html',
+    languages=['en'],  # default 'en' only for now
+)
+ALT_PROFILES = ProfileRegistry({'alt': ALT_PROFILE})
+
+# marks a negotiation result that hasn't been resolved yet; None can be a result
+_UNRESOLVED = object()
+
+# the methods that negotiation decisions are made by, which, if overridden, may read more of the request than the
+# negotiation cache's key holds
+_NEGOTIATION_METHODS = (
+    '_get_profiles_from_qsa',
+    '_get_profiles_from_http',
+    '_get_available_profiles',
+    '_get_profile',
+    '_get_mediatypes_from_qsa',
+    '_get_mediatypes_from_http',
+    '_get_available_mediatypes',
+    '_get_mediatype',
+    '_get_languages_from_qsa',
+    '_get_languages_from_http',
+    '_get_available_languages',
+    '_get_language',
+)
+
+
+# the methods that make the profile links of the Link header, which, if overridden, can't be compiled once
+_LINK_HEADER_METHODS = (
+    '_make_header_link_tokens',
+    '_make_header_link_list_profiles',
+)
+
+
+@lru_cache(maxsize=256)
+def _overrides_negotiation(cls):
+    return any(getattr(cls, name) is not getattr(Renderer, name) for name in _NEGOTIATION_METHODS)
+
+
+@lru_cache(maxsize=256)
+def _overrides_link_header(cls):
+    return any(getattr(cls, name) is not getattr(Renderer, name) for name in _LINK_HEADER_METHODS)
+
 
 class Renderer(object, metaclass=ABCMeta):
     """
     Abstract class as a parent for classes that validate the profiles & mediatypes for an API-delivered resource (typically
     either registers or objects) and also creates an 'alternates profile' for them, based on all available profiles & mediatypes.
+
+    The (profile, mediatype, language) decision for each distinct combination of profiles and negotiation inputs (the
+    _profile/_view, _mediatype/_format & _lang QSAs and the Accept, Accept-Profile & Accept-Language headers) is
+    remembered in :attr:`negotiation_cache`, per Renderer class. Subclasses that override any of the ``_get_*``
+    negotiation methods don't use it.
+
+    The Link header for each profile set and selected profile is compiled once, into a :class:`.LinkHeaderTemplate`
+    held in :attr:`link_header_cache`, and only has the instance URI inserted per request, unless a subclass overrides
+    :meth:`_make_header_link_tokens` or :meth:`_make_header_link_list_profiles`. Likewise, the
+    representations of the Alternates profile are rendered once per Renderer class, profile set, default profile and
+    Media Type into :attr:`alt_cache`. Clear it if alt.html, or a serializer, is changed while the application runs.
+
+    RDF is serialized by the serializer for the negotiated Media Type in :attr:`serializers`, which is shared by all
+    Renderers and can be changed with :func:`.register_serializer`, or replaced in a subclass. Async endpoints can have
+    graphs of :attr:`serialization_offload_threshold` or more triples serialized in a thread or process pool, set as
+    :attr:`serialization_executor`, rather than on the event loop.
+
+    Subclasses that can cheaply fingerprint their data, e.g. with a version number, should return it from
+    :meth:`_get_fingerprint`, and can give :meth:`_get_last_modified`, so that responses have an ETag (and
+    Last-Modified) and revalidation requests get a 304 Not Modified response before anything is rendered.
+
+    Endpoints that call :meth:`render_cached` (or :meth:`arender_cached`) rather than :meth:`render` have finished
+    responses, with gzip & brotli compressed copies, kept in :attr:`response_cache`, if it is set to a
+    :class:`.ResponseCache`.
+
+    With ``lazy=True``, :attr:`profile`, :attr:`mediatype`, :attr:`language` and :attr:`headers` are each resolved
+    when first used, and the Link header is only made along with the rest of the headers.
     """
+    negotiation_cache = LRUCache(maxsize=1024)
+    link_header_cache = LRUCache(maxsize=1024)
+    alt_cache = LRUCache(maxsize=256)
+    serializers = SERIALIZERS
+    serialization_executor = None
+    serialization_offload_threshold = OFFLOAD_THRESHOLD
+    # the headers of a full response that a 304 Not Modified response also has
+    NOT_MODIFIED_HEADERS = ('ETag', 'Last-Modified', 'Link', 'Content-Language', 'Access-Control-Allow-Origin')
+    response_cache = None
 
     def __init__(self,
                  request,
                  instance_uri,
                  profiles,
                  default_profile_token,
+                 lazy=False,
                  ):
         """
         Constructor
@@ -36,14 +133,19 @@ class Renderer(object, metaclass=ABCMeta):
         :type request: :class:`flask.request`
         :param instance_uri: The URI that triggered this API endpoint (can be via redirects but the main URI is needed).
         :type instance_uri: str
-        :param profiles: A dictionary of profiles available for this resource.
-        :type profiles: dict (of :class:`.View` class objects)
+        :param profiles: A dictionary of profiles available for this resource or a :class:`.ProfileRegistry` of them,
+        which saves indexing the profiles on every request.
+        :type profiles: dict (of :class:`.View` class objects) or :class:`.ProfileRegistry`
         :param default_profile_token: The ID of the default profile (key of a profile in the dictionary of :class:
         `.Profile` objects)
         :type default_profile_token: str (a key in profiles)
         :param alternates_template: The Jinja2 template to use for rendering the HTML *alternates view*. If None, then
         it will default to try and use a template called :code:`alternates.html`.
         :type alternates_template: str
+        :param lazy: If True, the profile, mediatype, language & headers are only resolved when first used, so a
+        subclass returning early, e.g. with a 404, doesn't pay for negotiation or the Link header. Otherwise they are
+        all resolved here.
+        :type lazy: bool
 
         .. seealso:: See the :class:`.View` class on how to create a dictionary of profiles.
 
@@ -53,52 +155,105 @@ class Renderer(object, metaclass=ABCMeta):
         self.instance_uri = instance_uri
 
         # ensure alternates token isn't hogged by user
-        for k, v in profiles.items():
-            if k == 'alternates':
-                self.vf_error = 'You must not manually add a profile with token \'alternates\' as this is auto-created.'
-
-        self.profiles = profiles
-        # auto-add in an Alternates profile
-        self.profiles['alt'] = Profile(
-            'http://www.w3.org/ns/dx/conneg/altr',  # the ConnegP URI for Alt Rep Data Model
-            'Alternate Representations',
-            'The representation of the resource that lists all other representations (profiles and Media Types)',
-            ['text/html', 'application/json'] + RDF_MEDIATYPES,
-            'text/html',
-            languages=['en'],  # default 'en' only for now
-        )
-        self.profile = None
+        if 'alternates' in profiles:
+            self.vf_error = 'You must not manually add a profile with token \'alternates\' as this is auto-created.'
+
+        # index the profiles once so that negotiation doesn't have to scan them, and auto-add in the Alternates
+        # profile, without changing the profiles given
+        if not isinstance(profiles, ProfileRegistry):
+            profiles = ProfileRegistry.compile(profiles)
+        self.profiles = profiles.overlay(ALT_PROFILES)
 
         # ensure that the default profile is actually a given profile
         if default_profile_token == "alternates":
             self.vf_error = 'You cannot specify \'alternates\' as the default profile.'
 
         # ensure the default profile is in the list of profiles
-        if default_profile_token not in self.profiles.keys():
+        if default_profile_token not in self.profiles:
             self.vf_error = 'The profile token you specified ({}) for the default profile ' \
                             'is not in the list of profiles you supplied ({})'\
                 .format(default_profile_token, ', '.join(self.profiles.keys()))
 
         self.default_profile_token = default_profile_token
 
-        # get profile & mediatype for this request, flag any errors but do not except out
-        self.profile = self._get_profile()
-        self.mediatype = self._get_mediatype()
-        self.language = self._get_language()
+        # the profile, mediatype, language & headers are resolved when first used; lazily, that's by the render path
+        self._profile = _UNRESOLVED
+        self._mediatype = _UNRESOLVED
+        self._language = _UNRESOLVED
+        self._headers = None
+        self._overridden = set()
+        self._negotiation_key = None
+        self._extra_links = []
+        self._link_header = None
+
+        if not lazy:
+            # get profile & mediatype for this request, flag any errors but do not except out
+            self._negotiate()
+            # make headers only if there's no error
+            self.headers
+
+    @property
+    def profile(self):
+        """
+        The token of the profile negotiated for this request.
+
+        :rtype: str
+        """
+        if self._profile is _UNRESOLVED:
+            self._negotiate('profile')
+        return self._profile
+
+    @profile.setter
+    def profile(self, value):
+        self._overridden.add('profile')
+        self._profile = value
+
+    @property
+    def mediatype(self):
+        """
+        The Media Type negotiated for this request.
+
+        :rtype: str
+        """
+        if self._mediatype is _UNRESOLVED:
+            self._negotiate('mediatype')
+        return self._mediatype
+
+    @mediatype.setter
+    def mediatype(self, value):
+        self._overridden.add('mediatype')
+        self._mediatype = value
 
-        # make headers only if there's no error
-        if self.vf_error is None:
-            self.headers = dict()
-            self.headers['Link'] = '<' + self.profiles[self.profile].uri + '>; rel="profile"'
-            self.headers['Content-Type'] = self.mediatype
-            self.headers['Content-Language'] = self.language
+    @property
+    def language(self):
+        """
+        The language negotiated for this request.
+
+        :rtype: str
+        """
+        if self._language is _UNRESOLVED:
+            self._negotiate('language')
+        return self._language
 
-            self.headers['Link'] += ', ' + self._make_header_link_tokens()
-            self.headers['Link'] += ', ' + self._make_header_link_list_profiles()
+    @language.setter
+    def language(self, value):
+        self._overridden.add('language')
+        self._language = value
 
-            # Issue 18 - https://github.com/RDFLib/pyLDAPI/issues/18
-            # Enable CORS for browser client consumption
-            self.headers['Access-Control-Allow-Origin'] = '*'
+    @property
+    def headers(self):
+        """
+        The response headers for this request, made when first used. None if the Renderer has a vf_error.
+
+        :rtype: dict
+        """
+        if self._headers is None and self.vf_error is None:
+            self._headers = self._make_headers()
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
 
     #
     # getting request's preferences
@@ -106,6 +261,52 @@ class Renderer(object, metaclass=ABCMeta):
 
     # TODO: wrap all the input parsing functions in try/except block pushing errors to vf_error
 
+    def _negotiate(self, name=None):
+        """
+        Resolves the profile token for this request and, as named, its mediatype or language, or all three if no
+        name is given. All three are taken from the negotiation cache instead if this combination of profiles and
+        request inputs has been negotiated before.
+
+        :param name: 'profile', 'mediatype', 'language' or None.
+        :type name: str
+        """
+        cache = self.negotiation_cache
+        use_cache = cache is not None and cache.enabled and self.vf_error is None and not self._overridden \
+            and not _overrides_negotiation(type(self))
+        if use_cache and self._negotiation_key is None:
+            query_params = self.request.query_params
+            headers = getattr(self.request, 'headers', {})
+            self._negotiation_key = (
+                type(self),
+                self.profiles,
+                self.default_profile_token,
+                query_params.get('_view'),
+                query_params.get('_profile'),
+                query_params.get('_format'),
+                query_params.get('_mediatype'),
+                query_params.get('_lang'),
+                headers.get('Accept'),
+                headers.get('Accept-Profile'),
+                headers.get('Accept-Language'),
+            )
+            decision = cache.get(self._negotiation_key)
+            if decision is not None:
+                self._profile, self._mediatype, self._language = decision
+                return
+
+        # the mediatype & language depend on the profile chosen
+        if self._profile is _UNRESOLVED:
+            self._profile = self._get_profile()
+        if name in (None, 'mediatype') and self._mediatype is _UNRESOLVED:
+            self._mediatype = self._get_mediatype()
+        if name in (None, 'language') and self._language is _UNRESOLVED:
+            self._language = self._get_language()
+
+        # only remember decisions made wholly from the request, not from values a subclass has set
+        if use_cache and not self._overridden \
+                and self._mediatype is not _UNRESOLVED and self._language is not _UNRESOLVED:
+            cache.put(self._negotiation_key, (self._profile, self._mediatype, self._language))
+
     def _get_profiles_from_qsa(self):
         """
         Reads either _profile or _view Query String Argument and returns a list of Profile tokens
@@ -121,15 +322,15 @@ class Renderer(object, metaclass=ABCMeta):
             pqsa = connegp.ProfileQsaParser(profiles_string)
             if pqsa.valid:
                 profiles = []
-                for profile in pqsa.profiles:
-                    if profile['profile'].startswith('<'):
+                for p in pqsa.profiles:
+                    if p['profile'].startswith('<'):
                         # convert this valid URI/URN to a token
-                        for token, profile in self.profiles.items():
-                            if profile.uri == profile['profile'].strip('<>'):
-                                profiles.append(token)
+                        token = self.profiles.token_for_uri(p['profile'].strip('<>'))
+                        if token is not None:
+                            profiles.append(token)
                     else:
                         # it's already a token so just add it
-                        profiles.append(profile['profile'])
+                        profiles.append(p['profile'])
                 if len(profiles) > 0:
                     return profiles
 
@@ -149,9 +350,9 @@ class Renderer(object, metaclass=ABCMeta):
                     profiles = []
                     for p in ap.profiles:
                         # convert this valid URI/URN to a token
-                        for token, profile in self.profiles.items():
-                            if profile.uri == p['profile']:
-                                profiles.append(token)
+                        token = self.profiles.token_for_uri(p['profile'])
+                        if token is not None:
+                            profiles.append(token)
                     if len(profiles) == 0:
                         return None
                     else:
@@ -165,11 +366,7 @@ class Renderer(object, metaclass=ABCMeta):
             return None
 
     def _get_available_profiles(self):
-        uris = {}
-        for token, profile in self.profiles.items():
-            uris[profile.uri] = token
-
-        return uris
+        return self.profiles.uris
 
     def _get_profile(self):
         # if we get a profile from QSA, use that
@@ -185,11 +382,10 @@ class Renderer(object, metaclass=ABCMeta):
 
         # if we have a result from QSA or HTTP, got through each in order and see if there's an available
         # profile for that token, return first one
-        profiles_available = self._get_available_profiles()
+        profiles_available = self._get_available_profiles().values()
         for profile in profiles_requested:
-            for k, v in profiles_available.items():
-                if profile == v:
-                    return v  # return the profile token
+            if profile in profiles_available:
+                return profile  # return the profile token
 
         # if no match found, should never o
         return self.default_profile_token
@@ -211,34 +407,15 @@ class Renderer(object, metaclass=ABCMeta):
             return None
 
     def _get_mediatypes_from_http(self):
-        """Returns a list of Media Type tokens from an Accept HTTP header in descending weighted order
-        :return: List of URIs of accept profiles in descending request order
-        :rtype: list
+        """Returns the Accept HTTP header's media-ranges, parsed, whose ``mediatypes`` are in descending weighted order.
+        Overrides may return a list of Media Types in descending request order instead
+        :return: The parsed Accept header
+        :rtype: :class:`.AcceptHeader` or list
         """
         if hasattr(self.request, 'headers'):
             if self.request.headers.get('Accept') is not None:
                 try:
-                    # Chrome breaking Accept header variable by adding v=b3
-                    # Issue https://github.com/RDFLib/pyLDAPI/issues/21
-                    mediatypes_string = re.sub('v=(.*);', '', self.request.headers['Accept'])
-
-                    # split the header into individual URIs, with weights still attached
-                    mediatypes = mediatypes_string.split(',')
-
-                    # remove \s
-                    mediatypes = [x.strip() for x in mediatypes]
-
-                    # split off any weights and sort by them with default weight = 1
-                    mediatypes = [
-                        (float(x.split(';')[1].replace('q=', ''))
-                         if ";q=" in x else 1, x.split(';')[0]) for x in mediatypes
-                    ]
-
-                    # sort profiles by weight, heaviest first
-                    mediatypes.sort(reverse=True)
-
-                    # return only the orderd list of mediatypes, not weights
-                    return[x[1] for x in mediatypes]
+                    return parse_accept(self.request.headers['Accept'])
                 except Exception:
                     raise ProfilesMediatypesException(
                         'You have requested a Media Type using an Accept header that is incorrectly formatted.')
@@ -246,140 +423,154 @@ class Renderer(object, metaclass=ABCMeta):
         return None
 
     def _get_available_mediatypes(self):
-        return self.profiles[self.profile].mediatypes
+        return self.profiles.mediatypes(self.profile)
 
     def _get_mediatype(self):
-        mediatypes_requested = self._get_mediatypes_from_qsa()
-        if mediatypes_requested is None:
-            mediatypes_requested = self._get_mediatypes_from_http()
-
-        # no Media Types requested so return default
-        if mediatypes_requested is None:
-            return self.profiles[self.profile].default_mediatype
-
-        # iterate through requested Media Types until a valid one is found
+        default = self.profiles[self.profile].default_mediatype
         mediatypes_available = self._get_available_mediatypes()
-        for mediatype in mediatypes_requested:
-            if mediatype in mediatypes_available:
+
+        mediatypes_requested = self._get_mediatypes_from_qsa()
+        if mediatypes_requested is not None:
+            # iterate through requested Media Types until a valid one is found
+            for mediatype in mediatypes_requested:
+                if mediatype in mediatypes_available:
+                    return mediatype
+            # no valid Media Type is found so return default
+            return default
+
+        # match the Accept header's media-ranges, including wildcards, against the available Media Types
+        mediatypes_requested = self._get_mediatypes_from_http()
+        if isinstance(mediatypes_requested, AcceptHeader):
+            mediatype = mediatypes_requested.best_match(mediatypes_available, default)
+            if mediatype is not None:
                 return mediatype
+        elif mediatypes_requested is not None:
+            for mediatype in mediatypes_requested:
+                if mediatype in mediatypes_available:
+                    return mediatype
 
-        # no valid Media Type is found so return default
-        return self.profiles[self.profile].default_mediatype
+        # no acceptable Media Types requested so return default
+        return default
 
     def _get_languages_from_qsa(self):
         """Returns a list of Languages from QSA
         :return: list
         """
-        # languages = self.request.values.get('_lang')
-        languages = None
+        languages = self.request.query_params.get('_lang')
         if languages is not None:
-            languages = str(languages).replace(' ', '_').replace('+', '_').split(',')
-            # if the internal mediatype is requested, return the default
-            if languages == "_internal":
-                return self.profiles[self.profile].default_language
-            else:
+            languages = [x.strip() for x in str(languages).split(',') if x.strip()]
+            # if the internal language is requested, return the default
+            if languages[:1] == ['_internal']:
+                return [self.profiles[self.profile].default_language]
+            elif len(languages) > 0:
                 return languages
 
         return None
 
     def _get_languages_from_http(self):
         """
-        Reads an Accept HTTP header and returns an array of Media Type string in descending weighted order
-        :return: List of URIs of accept profiles in descending request order
+        Reads an Accept-Language HTTP header and returns a list of language tags in descending weighted order
+        :return: List of language tags in descending request order
         :rtype: list
         """
         if hasattr(self.request, 'headers'):
             if self.request.headers.get('Accept-Language') is not None:
                 try:
-                    # split the header into individual URIs, with weights still attached
-                    languages = self.request.headers['Accept-Language'].split(',')
-                    # remove \s
-                    languages = [x.strip() for x in languages]
-
-                    # split off any weights and sort by them with default weight = 1
-                    languages = [
-                        (float(x.split(';')[1].replace('q=', ''))
-                         if len(x.split(';')) == 2 else 1, x.split(';')[0]) for x in languages
-                    ]
-
-                    # sort profiles by weight, heaviest first
-                    languages.sort(reverse=True)
-
-                    # return only the orderd list of languages, not weights
-                    return[x[1] for x in languages]
+                    languages = parse_accept_language(self.request.headers['Accept-Language'])
                 except Exception:
                     raise ProfilesMediatypesException(
                         'You have requested a language using an Accept-Language header that is incorrectly formatted.')
+                # languages with a weight of 0 are not acceptable
+                return [x[0] for x in languages if x[1] > 0]
 
         return None
 
     def _get_available_languages(self):
-        return self.profiles[self.profile].languages
+        return self.profiles.languages(self.profile)
 
     def _get_language(self):
         languages_requested = self._get_languages_from_qsa()
         if languages_requested is None:
             languages_requested = self._get_languages_from_http()
 
-        # no Media Types requested so return default
+        # no languages requested so return default
         if languages_requested is None:
             return self.profiles[self.profile].default_language
 
-        # iterate through requested Media Types until a valid one is found
-        languages_available = self._get_available_mediatypes()
-        for language in languages_requested:
-            if language in languages_available:
-                return language
-
-        # no valid Media Type is found so return default
-        return self.profiles[self.profile].default_language
+        # find the first requested language, or a more general form of it, that the profile has, else the default
+        return match_language(
+            tuple(languages_requested),
+            self._get_available_languages(),
+            self.profiles[self.profile].default_language
+        )
 
     # end getting request's preferences
 
     #
     # making response headers
     #
-    def _make_header_link_tokens(self):
-        individual_links = []
-        link_header_template = '<http://www.w3.org/ns/dx/prof/Profile>; rel="type"; token="{}"; anchor=<{}>, '
+    def _make_headers(self):
+        headers = dict()
+        headers['Link'] = self._get_link_header().render(self.instance_uri)
+        headers['Content-Type'] = self.mediatype
+        headers['Content-Language'] = self.language
+
+        # Issue 18 - https://github.com/RDFLib/pyLDAPI/issues/18
+        # Enable CORS for browser client consumption
+        headers['Access-Control-Allow-Origin'] = '*'
+        return headers
+
+    def _get_link_header(self):
+        # the profile links plus any that subclasses have added
+        if self._link_header is None:
+            self._link_header = self._get_link_header_template().extend(*self._extra_links)
+        return self._link_header
+
+    def _add_header_links(self, *links):
+        """
+        Adds links to the Link header, after those for the profiles. Each link is either a whole link, as a str, or a
+        tuple of its fragments either side of the instance URI, as for :meth:`.LinkHeaderTemplate.from_links`.
 
-        for token, profile in self.profiles.items():
-            individual_links.append(link_header_template.format(token, profile.uri))
+        :param links: The links to add.
+        """
+        self._extra_links.extend(links)
+        if self._link_header is not None:
+            self._link_header = self._link_header.extend(*links)
+        if self._headers is not None:
+            self._headers['Link'] = self._get_link_header().render(self.instance_uri)
+
+    def _get_link_header_template(self):
+        # overridden profile links are made per request, as they were before the Link header was compiled
+        if _overrides_link_header(type(self)):
+            return LinkHeaderTemplate.from_links(
+                '<' + self.profiles[self.profile].uri + '>; rel="profile"',
+                self._make_header_link_tokens(),
+                self._make_header_link_list_profiles()
+            )
+        key = (self.profiles, self.profile)
+        template = self.link_header_cache.get(key)
+        if template is None:
+            template = compile_link_header(self.profiles, self.profile)
+            self.link_header_cache.put(key, template)
+        return template
 
-        return ''.join(individual_links).rstrip(', ')
+    def _make_header_link_tokens(self):
+        return ', '.join(make_link_tokens(self.profiles))
 
     def _make_header_link_list_profiles(self):
-        individual_links = []
-        for token, profile in self.profiles.items():
-            # create an individual Link statement per Media Type
-            for mediatype in profile.mediatypes:
-                # set the rel="self" just for this profile & mediatype
-                if mediatype != '_internal':
-                    if token == self.profile and mediatype == self.profiles[self.profile].default_mediatype:
-                        rel = 'self'
-                    else:
-                        rel = 'alternate'
-
-                    individual_links.append(
-                        '<{}?_profile={}&_mediatype={}>; rel="{}"; type="{}"; profile="{}", '.format(
-                            self.instance_uri,
-                            token,
-                            mediatype,
-                            rel,
-                            mediatype,
-                            profile.uri)
-                    )
-
-        # append to, or create, Link header
-        return ''.join(individual_links).rstrip(', ')
+        return LinkHeaderTemplate.from_links(
+            *make_link_list_profiles(self.profiles, self.profile)
+        ).render(self.instance_uri)
 
     # end making response headers
 
     #
     # making response content
     #
-    def _generate_alt_profiles_rdf(self):
+    def _generate_alt_profiles_rdf(self, instance_uri=None):
         # Alt R Data Model as per https://www.w3.org/TR/dx-prof-conneg/#altr
+        if instance_uri is None:
+            instance_uri = self.instance_uri
         g = Graph()
         ALTR = Namespace('http://www.w3.org/ns/dx/conneg/altr#')
         g.bind('altr', ALTR)
@@ -388,7 +579,7 @@ class Renderer(object, metaclass=ABCMeta):
 
         g.bind('prof', PROF)
 
-        instance_uri = URIRef(self.instance_uri)
+        instance_uri = URIRef(instance_uri)
 
         # for each Profile, lis it via its URI and give annotations
         for token, p in self.profiles.items():
@@ -399,32 +590,69 @@ class Renderer(object, metaclass=ABCMeta):
 
         # for each Profile and Media Type, create a Representation
         for token, p in self.profiles.items():
-            for mt in p.mediatypes:
-                if not str(mt).startswith('_'):  # ignore Media Types like `_internal`
-                    rep = BNode()
-                    g.add((rep, RDF.type, ALTR.Representation))
-                    g.add((rep, DCTERMS.conformsTo, URIRef(p.uri)))
-                    g.add((rep, URIRef(DCTERMS + 'format'), Literal(mt)))
-                    g.add((rep, PROF.hasToken, Literal(token, datatype=XSD.token)))
+            for mt in p.public_mediatypes:  # ignore Media Types like `_internal`
+                rep = BNode()
+                g.add((rep, RDF.type, ALTR.Representation))
+                g.add((rep, DCTERMS.conformsTo, URIRef(p.uri)))
+                g.add((rep, URIRef(DCTERMS + 'format'), Literal(mt)))
+                g.add((rep, PROF.hasToken, Literal(token, datatype=XSD.token)))
 
-                    # if this is the default format for the Profile, say so
-                    if mt == p.default_mediatype:
-                        g.add((rep, ALTR.isProfilesDefault, Literal(True, datatype=XSD.boolean)))
+                # if this is the default format for the Profile, say so
+                if mt == p.default_mediatype:
+                    g.add((rep, ALTR.isProfilesDefault, Literal(True, datatype=XSD.boolean)))
 
-                    # link this representation to the instances
-                    g.add((instance_uri, ALTR.hasRepresentation, rep))
+                # link this representation to the instances
+                g.add((instance_uri, ALTR.hasRepresentation, rep))
 
-                    # if this is the default Profile and the default Media Type, set it as the instance's default Rep
-                    if token == self.default_profile_token and mt == p.default_mediatype:
-                        g.add((instance_uri, ALTR.hasDefaultRepresentation, rep))
+                # if this is the default Profile and the default Media Type, set it as the instance's default Rep
+                if token == self.default_profile_token and mt == p.default_mediatype:
+                    g.add((instance_uri, ALTR.hasDefaultRepresentation, rep))
 
         return g
 
+    def _writes_jsonld(self):
+        # JSON-LD for the built-in profiles is written directly, unless another JSON-LD serializer has been set
+        return self.mediatype == 'application/ld+json' and \
+            self.serializers.get('application/ld+json') is serialize_jsonld
+
+    def _get_rdf_response_mediatype(self, mimetype=None):
+        # serialize in the negotiated Media Type, falling back to Turtle for any the serializers don't know
+        if mimetype is None:
+            mimetype = self.mediatype
+        if mimetype not in self.serializers:
+            mimetype = 'text/turtle'
+        return mimetype
+
     def _make_rdf_response(self, graph, mimetype=None, headers=None, delete_graph=True):
+        mimetype = self._get_rdf_response_mediatype(mimetype)
+        response_bytes = serialize(graph, mimetype, self.serializers)
+        return self._finish_rdf_response(graph, response_bytes, mimetype, headers, delete_graph)
+
+    async def _amake_rdf_response(self, graph, mimetype=None, headers=None, delete_graph=True):
+        """
+        Makes the same response as :meth:`_make_rdf_response` but, for graphs of at least
+        :attr:`serialization_offload_threshold` triples, serializes the graph in :attr:`serialization_executor`,
+        if it is set, so as not to hold up the event loop.
+
+        :rtype: :class:`fastapi.Response`
+        """
+        mimetype = self._get_rdf_response_mediatype(mimetype)
+        response_bytes = await aserialize(
+            graph,
+            mimetype,
+            self.serializers,
+            self.serialization_executor,
+            self.serialization_offload_threshold
+        )
+        return self._finish_rdf_response(graph, response_bytes, mimetype, headers, delete_graph)
+
+    def _finish_rdf_response(self, graph, response_bytes, mimetype, headers=None, delete_graph=True):
         if headers is None:
             headers = self.headers
-
-        response_text = graph.serialize(format=mimetype or "text/turtle")
+        # name the Media Type written, which is Turtle for any negotiated one the serializers don't know
+        if headers.get('Content-Type', mimetype) != mimetype:
+            headers = dict(headers)
+            headers['Content-Type'] = mimetype
 
         if delete_graph:
             # destroy the triples in the triplestore, then delete the triplestore
@@ -433,8 +661,9 @@ class Renderer(object, metaclass=ABCMeta):
             graph.destroy({})
             del graph
 
-        return Response(
-            response_text,
+        # the Content-Length is set from the bytes
+        return BytesResponse(
+            response_bytes,
             media_type=mimetype,
             headers=headers
         )
@@ -462,45 +691,155 @@ class Renderer(object, metaclass=ABCMeta):
         :return: a rendered template (HTML)
         :rtype: TemplateResponse
         """
+        response = self._get_prerendered_alt_profile_html(additional_alt_template_context)
+        if response is not None:
+            return response
+
+        return templates.TemplateResponse("alt.html",
+                                          context=self._get_alt_profile_html_context(
+                                              additional_alt_template_context,
+                                              alt_template_context_replace
+                                          ),
+                                          headers=self.headers)
+
+    async def _arender_alt_profile_html(
+        self,
+        additional_alt_template_context=None,
+        alt_template_context_replace=False
+    ):
+        """Renders the Alternates Profile in HTML as :meth:`_render_alt_profile_html` does, but with Jinja's async
+        support when the template is rendered per request
+
+        :rtype: Response
+        """
+        response = self._get_prerendered_alt_profile_html(additional_alt_template_context)
+        if response is not None:
+            return response
+
+        html = await render_template_async(
+            templates,
+            "alt.html",
+            self._get_alt_profile_html_context(additional_alt_template_context, alt_template_context_replace)
+        )
+        return Response(html, media_type='text/html', headers=self.headers)
+
+    def _get_prerendered_alt_profile_html(self, additional_alt_template_context=None):
+        # without additional context, the template is rendered once per profile set and kept in alt_cache
+        if additional_alt_template_context is None or not isinstance(additional_alt_template_context, dict):
+            key = (type(self), self.profiles, self.default_profile_token, 'text/html')
+            fragments = self.alt_cache.get(key)
+            if fragments is None:
+                fragments = self._prerender_alt_profile_html()
+                self.alt_cache.put(key, fragments)
+            if fragments is not False:
+                return BytesResponse(
+                    join_representation(fragments, 'text/html', self.instance_uri, str(self.request.base_url)),
+                    media_type='text/html',
+                    headers=self.headers
+                )
+        return None
+
+    def _get_alt_profile_html_context(self, additional_alt_template_context=None, alt_template_context_replace=False):
+        _template_context = self._get_alt_template_context(self.instance_uri, self.request)
+        if additional_alt_template_context is not None and isinstance(additional_alt_template_context, dict):
+            if alt_template_context_replace:
+                _template_context = additional_alt_template_context
+            else:
+                _template_context.update(additional_alt_template_context)
+        return _template_context
+
+    def _get_alt_template_context(self, instance_uri, request):
         profiles = {}
         for token, profile in self.profiles.items():
             profiles[token] = {
                 'label': str(profile.label), 'comment': str(profile.comment),
-                'mediatypes': tuple(f for f in profile.mediatypes if not f.startswith('_')),
+                'mediatypes': profile.public_mediatypes,
                 'default_mediatype': str(profile.default_mediatype),
-                'languages': profile.languages if profile.languages is not None else ['en'],
+                'languages': profile.languages,
                 'default_language': str(profile.default_language),
                 'uri': str(profile.uri)
             }
 
-        _template_context = {
-            'uri': self.instance_uri,
+        return {
+            'uri': instance_uri,
             'default_profile_token': self.default_profile_token,
             'profiles': profiles,
             'mediatype_names': MEDIATYPE_NAMES,
-            'request': self.request
+            'request': request
         }
-        if additional_alt_template_context is not None and isinstance(additional_alt_template_context, dict):
-            if alt_template_context_replace:
-                _template_context = additional_alt_template_context
-            else:
-                _template_context.update(additional_alt_template_context)
 
-        return templates.TemplateResponse("alt.html",
-                                          context=_template_context,
-                                          headers=self.headers)
+    def _prerender_alt_profile_html(self):
+        """Renders alt.html with placeholders for the instance URI and the request's base URL
+
+        :return: The fragments of the rendered template or False if the template uses more of the request, or changes
+        the placeholders
+        :rtype: tuple or bool
+        """
+        context = self._get_alt_template_context(INSTANCE_URI_PLACEHOLDER, PlaceholderRequest())
+        try:
+            html = templates.get_template("alt.html").render(context)
+        except NotPrerenderable:
+            return False
+        fragments = split_representation(html.encode('utf-8'), (INSTANCE_URI_PLACEHOLDER, BASE_URL_PLACEHOLDER))
+        # a placeholder the template changed can't have the request's value put in its place
+        return fragments if is_split(fragments) else False
 
     def _render_alt_profile_rdf(self):
-        g = self._generate_alt_profiles_rdf()
-        return self._make_rdf_response(g)
+        # subclasses that add to the Alternates profile's RDF get it generated per request
+        if type(self)._generate_alt_profiles_rdf is not Renderer._generate_alt_profiles_rdf:
+            g = self._generate_alt_profiles_rdf()
+            return self._make_rdf_response(g)
+
+        key = (type(self), self.profiles, self.default_profile_token, self.mediatype)
+        fragments = self.alt_cache.get(key)
+        if fragments is None:
+            if self._writes_jsonld():
+                rendered = dumps(
+                    alt_profiles_jsonld(self.profiles, self.default_profile_token, INSTANCE_URI_PLACEHOLDER)
+                )
+            else:
+                g = self._generate_alt_profiles_rdf(INSTANCE_URI_PLACEHOLDER)
+                rendered = serialize(g, self.mediatype, self.serializers)
+            fragments = split_representation(rendered)
+            self.alt_cache.put(key, fragments)
+
+        return BytesResponse(
+            join_representation(fragments, self.mediatype, self.instance_uri),
+            media_type=self.mediatype,
+            headers=self.headers
+        )
+
+    async def _arender_alt_profile_rdf(self):
+        # only RDF generated per request needs serializing
+        if type(self)._generate_alt_profiles_rdf is not Renderer._generate_alt_profiles_rdf:
+            g = self._generate_alt_profiles_rdf()
+            return await self._amake_rdf_response(g)
+        return self._render_alt_profile_rdf()
+
+    def _get_alt_profile_json(self, instance_uri):
+        return {
+            'uri': instance_uri,
+            'profiles': list(self.profiles.keys()),
+            'default_profile': self.default_profile_token
+        }
 
     def _render_alt_profile_json(self):
-        return JSONResponse(
-            content={
-                'uri': self.instance_uri,
-                'profiles': list(self.profiles.keys()),
-                'default_profile': self.default_profile_token
-            },
+        # subclasses that change the Alternates profile's JSON get it made per request
+        if type(self)._get_alt_profile_json is not Renderer._get_alt_profile_json:
+            return BytesResponse(
+                dumps(self._get_alt_profile_json(self.instance_uri)),
+                media_type='application/json',
+                headers=self.headers
+            )
+
+        key = (type(self), self.profiles, self.default_profile_token, 'application/json')
+        fragments = self.alt_cache.get(key)
+        if fragments is None:
+            fragments = split_representation(dumps(self._get_alt_profile_json(INSTANCE_URI_PLACEHOLDER)))
+            self.alt_cache.put(key, fragments)
+
+        return BytesResponse(
+            join_representation(fragments, 'application/json', self.instance_uri),
             media_type='application/json',
             headers=self.headers
         )
@@ -526,6 +865,27 @@ class Renderer(object, metaclass=ABCMeta):
         else:  # application/json
             return self._render_alt_profile_json()
 
+    async def _arender_alt_profile(
+        self,
+        additional_alt_template_context=None,
+        alt_template_context_replace=False
+    ):
+        """
+        Return a Response object depending on the value assigned to :code:`self.mediatype`, as
+        :meth:`_render_alt_profile` does, for :meth:`arender`.
+
+        :rtype: Response
+        """
+        if self.mediatype == 'text/html':
+            return await self._arender_alt_profile_html(
+                additional_alt_template_context,
+                alt_template_context_replace
+            )
+        elif self.mediatype in RDF_MEDIATYPES:
+            return await self._arender_alt_profile_rdf()
+        else:  # application/json
+            return self._render_alt_profile_json()
+
     def render(
         self,
         alt_template: str = "alt.html",
@@ -547,11 +907,218 @@ class Renderer(object, metaclass=ABCMeta):
         # if there's been an error with the request, return that
         if self.vf_error is not None:
             return Response(self.vf_error, status=400, media_type='text/plain')
-        elif self.profile == 'alt' or self.profile == 'alternates':
+
+        # if the client's copy is current, say so before doing any rendering
+        not_modified = self._check_validators(self._get_fingerprint(), self._get_last_modified())
+        if not_modified is not None:
+            return not_modified
+
+        if self.profile == 'alt' or self.profile == 'alternates':
             return self._render_alt_profile(
                 additional_alt_template_context,
                 alt_template_context_replace
             )
         return None
 
+    async def arender(
+        self,
+        alt_template: str = "alt.html",
+        additional_alt_template_context=None,
+        alt_template_context_replace=False
+    ):
+        """
+        The async counterpart of :meth:`render`, for async endpoints.
+
+        Unless the request is in error or for the Alternates profile, it awaits :meth:`_aload_instance_data` and
+        returns None for the subclass to render its profiles, as :meth:`render` does. HTML is rendered with Jinja's
+        async support and RDF serialized with :meth:`_amake_rdf_response`, which can use
+        :attr:`serialization_executor`.
+
+        .. code-block:: python
+
+            class PersonRenderer(Renderer):
+                async def _aload_instance_data(self):
+                    self.person = await db.fetch_person(self.instance_uri)
+
+                async def arender(self):
+                    response = await super().arender()
+                    if response is None and self.profile == 'sdo':
+                        response = await self._amake_rdf_response(self._person_graph())
+                    return response
+        """
+        # if there's been an error with the request, return that
+        if self.vf_error is not None:
+            return Response(self.vf_error, status_code=400, media_type='text/plain')
+
+        # if the client's copy is current, say so before loading any data
+        not_modified = self._check_validators(await self._aget_fingerprint(), await self._aget_last_modified())
+        if not_modified is not None:
+            return not_modified
+
+        if self.profile == 'alt' or self.profile == 'alternates':
+            return await self._arender_alt_profile(
+                additional_alt_template_context,
+                alt_template_context_replace
+            )
+        await self._aload_instance_data()
+        return None
+
+    async def _aload_instance_data(self):
+        """
+        Loads the data the selected profile needs, e.g. from an async database driver. :meth:`arender` awaits it
+        only for profiles other than the Alternates profile.
+
+        This does nothing by default.
+        """
+        pass
+
+    #
+    # validators & conditional requests
+    #
+    def _get_fingerprint(self):
+        """
+        Returns a fingerprint of the data this resource is rendered from, e.g. a version number, a modification
+        timestamp or a hash, that changes whenever the data does. It should be cheap to get, as it is used before
+        anything is rendered.
+
+        Combined with the negotiated profile, Media Type & language, it makes the response's ETag, and a request
+        with a matching If-None-Match gets a 304 Not Modified response. By default there is no fingerprint, and so no
+        ETag.
+
+        :return: A fingerprint or None
+        """
+        return None
+
+    def _get_last_modified(self):
+        """
+        Returns when the data this resource is rendered from last changed, for the Last-Modified header and
+        If-Modified-Since requests. By default this isn't known.
+
+        :return: A datetime (naive datetimes are taken to be in UTC) or None
+        :rtype: :class:`datetime.datetime`
+        """
+        return None
+
+    async def _aget_fingerprint(self):
+        """
+        Returns the fingerprint for :meth:`arender`. Override this, rather than :meth:`_get_fingerprint`, to get the
+        fingerprint from an async data source.
+        """
+        return self._get_fingerprint()
+
+    async def _aget_last_modified(self):
+        """
+        Returns the last modified datetime for :meth:`arender`, as :meth:`_aget_fingerprint` does the fingerprint.
+        """
+        return self._get_last_modified()
+
+    def _check_validators(self, fingerprint, last_modified):
+        """
+        Adds the ETag & Last-Modified headers for the given validators and returns a 304 Not Modified response if the
+        request's If-None-Match or If-Modified-Since header shows that the client's copy is current.
+
+        :return: A 304 response or None
+        :rtype: Response
+        """
+        if fingerprint is None and last_modified is None:
+            return None
+
+        etag = None
+        if fingerprint is not None:
+            etag = make_etag(fingerprint, self.profile, self.mediatype, self.language)
+            self.headers['ETag'] = etag
+        if last_modified is not None:
+            self.headers['Last-Modified'] = format_http_date(last_modified)
+
+        method = getattr(self.request, 'scope', {}).get('method', 'GET')
+        if method in ('GET', 'HEAD') and is_not_modified(getattr(self.request, 'headers', {}), etag, last_modified):
+            return Response(
+                status_code=304,
+                headers={k: v for k, v in self.headers.items() if k in self.NOT_MODIFIED_HEADERS}
+            )
+        return None
+
+    #
+    # caching finished responses
+    #
+    def render_cached(self, **kwargs):
+        """
+        Returns the response :meth:`render` makes, from :attr:`response_cache` if this representation is already
+        cached, in the content-coding that the request's Accept-Encoding header prefers.
+
+        Responses are cached per instance URI, profile, Media Type, language & fingerprint (see
+        :meth:`_get_fingerprint`), and whatever else :meth:`_get_response_cache_key` adds, but not per the arguments
+        given, which are passed on to :meth:`render`, so these must be the same for every request to a resource.
+        Without a :attr:`response_cache`, this just renders.
+
+        :rtype: Response
+        """
+        if self.response_cache is None or self.vf_error is not None:
+            return self.render(**kwargs)
+        key = self._get_response_cache_key(self._get_fingerprint())
+        response = self._get_cached_response(key)
+        if response is None:
+            response = self._cache_response(key, self.render(**kwargs))
+        return response
+
+    async def arender_cached(self, **kwargs):
+        """
+        Returns the response :meth:`arender` makes, from :attr:`response_cache` if this representation is already
+        cached, as :meth:`render_cached` does.
+
+        :rtype: Response
+        """
+        if self.response_cache is None or self.vf_error is not None:
+            return await self.arender(**kwargs)
+        key = self._get_response_cache_key(await self._aget_fingerprint())
+        response = self._get_cached_response(key)
+        if response is None:
+            response = self._cache_response(key, await self.arender(**kwargs))
+        return response
+
+    def _get_response_cache_key(self, fingerprint):
+        """
+        Returns the key of this request's response in :attr:`response_cache`. This must start with the instance URI,
+        so that :meth:`.ResponseCache.invalidate` can find it. Subclasses whose responses depend on more of the request
+        should add that.
+
+        :rtype: tuple
+        """
+        key = (self.instance_uri, self.profile, self.mediatype, self.language, fingerprint)
+        if self.mediatype == 'text/html':
+            # templates may link relative to the request's base URL
+            key += (str(self.request.base_url),)
+        return key
+
+    def _get_cached_response(self, key):
+        entry = self.response_cache.get(key)
+        if entry is None:
+            return None
+        request_headers = getattr(self.request, 'headers', {})
+        if 'If-None-Match' in request_headers or 'If-Modified-Since' in request_headers:
+            # the client's copy is compared with the variant it would be sent, which has its own ETag
+            etag = entry.etags[entry.select_encoding(request_headers.get('Accept-Encoding'))]
+            last_modified = entry.headers.get('last-modified')
+            if is_not_modified(
+                request_headers,
+                etag,
+                parse_http_date(last_modified) if last_modified is not None else None
+            ):
+                keep = {h.lower() for h in self.NOT_MODIFIED_HEADERS}
+                headers = {k: v for k, v in entry.headers.items() if k in keep}
+                if etag is not None:
+                    headers['etag'] = etag
+                return Response(status_code=304, headers=headers)
+        return respond(entry, request_headers.get('Accept-Encoding'))
+
+    def _cache_response(self, key, response):
+        # only complete, successful responses are cached, and not those to HEAD requests, which may have no body
+        if response is None or response.status_code != 200 \
+                or getattr(self.request, 'scope', {}).get('method') == 'HEAD':
+            return response
+        entry = self.response_cache.put(key, response)
+        if entry is None:
+            return response
+        return respond(entry, getattr(self.request, 'headers', {}).get('Accept-Encoding'))
+
     # end making response content
@@ -2,23 +2,60 @@
 from pathlib import Path
 
 from fastapi import Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS
 from pyldapi.renderer import Renderer
 from pyldapi.profile import Profile
-from pyldapi.exceptions import ProfilesMediatypesException, CofCTtlError
+from pyldapi.registry import ProfileRegistry
+from pyldapi.exceptions import ProfilesMediatypesException, CofCTtlError, PagingError
+from pyldapi.templating import render_template_async
+from pyldapi.json_encoding import dumps, iter_json_object
+from pyldapi.jsonld import MEM_CONTEXT, iter_mem_profile_nodes
+from pyldapi.counts import is_exact_count
+from pyldapi.links import PageLinks
+from pyldapi.member_table import MemberTable
+from pyldapi.members import to_member_source, is_member_source, call_member_source, acall_member_source, \
+    encode_cursor, decode_cursor
+from pyldapi.responses import BytesResponse
+from pyldapi.streaming import STREAMING_MEDIATYPES, TripleWriter, iter_chunks, nt_iri, nt_literal
 from .data import RDF_MEDIATYPES, MEDIATYPE_NAMES
 
 templates = Jinja2Templates(directory="templates")
 
+# the Members profile, which every ContainerRenderer adds to the profiles it is given
+MEM_PROFILE = Profile(
+    'https://w3id.org/profile/mem',
+    'Members Profile',
+    'A very basic RDF data model-only profile that lists the sub-items (members) of collections (rdf:Bag)',
+    ['text/html'] + RDF_MEDIATYPES,
+    'text/html'
+)
+MEM_PROFILES = ProfileRegistry({'mem': MEM_PROFILE})
+
+# the namespaces of the Members profile's triples, with the prefixes used when streaming them as Turtle
+MEM_PREFIXES = {
+    'rdf': str(RDF),
+    'rdfs': str(RDFS),
+    'ldp': 'http://www.w3.org/ns/ldp#',
+    'xhv': 'https://www.w3.org/1999/xhtml/vocab#',
+}
+
+# the cursor of the last page, which is the one before the end
+LAST_PAGE_CURSOR = encode_cursor(None, forward=False)
+
 
 class ContainerRenderer(Renderer):
     """
     Specific implementation of the abstract Renderer for displaying Register information
     """
     DEFAULT_ITEMS_PER_PAGE = 100
+    # pages with at least this many members are streamed when rendered as JSON or JSON-LD
+    mem_json_streaming_threshold = 10000
+    # pages with at least this many members are streamed when rendered as Turtle or N-Triples
+    mem_rdf_streaming_threshold = 10000
+    INVALID_CURSOR_ERROR = 'The cursor is invalid. Follow the links to other pages rather than making cursors.'
 
     def __init__(self,
                  request,
@@ -33,7 +70,9 @@ class ContainerRenderer(Renderer):
                  profiles=None,
                  default_profile_token=None,
                  super_register=None,
-                 page_size_max=1000):
+                 page_size_max=1000,
+                 lazy=False,
+                 cursor_paging=False):
         """
         Constructor
 
@@ -47,17 +86,22 @@ class ContainerRenderer(Renderer):
         :type comment: str
         :param members: The items within this register as a list of URI strings or tuples with string elements
         like (URI, label). They can also be tuples like (URI, URI, label) if you want to manually specify an item's
-        class.
-        :type members: list
+        class, or dicts with 'uri' & 'title' keys. They can also be given as a :class:`.MemberTable`, or as another
+        iterable, which is read into a list. Instead, this can be a member source (see :mod:`pyldapi.members`), which
+        is only asked for the requested page, and the count, if the Members profile is rendered.
+        :type members: list or :class:`.MemberTable` or :class:`.MemberSource`
         :param contained_item_classes: The list of URI strings of each distinct class of item contained in this
         Register.
         :type contained_item_classes: list
         :param members_total_count: The total number of items in this Register (not of a page but the register as a
-        whole).
-        :type members_total_count: int
-        :param profiles: A dictionary of named :class:`.View` objects available for this Register, apart from 'reg'
-        which is auto-created.
-        :type profiles: dict
+        whole). This can also be a count provider, a callable returning the count that is only called for the Members
+        profile, like :class:`.CachedCount`, and the count can be an :class:`.ApproximateCount` (see
+        :mod:`pyldapi.counts`). If None, the member source is counted, or the members given are taken to be all of the
+        register's, and are counted and paged.
+        :type members_total_count: int or callable
+        :param profiles: A dictionary, or :class:`.ProfileRegistry`, of named :class:`.View` objects available for this
+        Register, apart from 'mem' which is auto-created.
+        :type profiles: dict or :class:`.ProfileRegistry`
         :param default_profile_token: The ID of the default :class:`.View` (key of a profile in the list of Views).
         :type default_profile_token: str
         :param super_register: A super-Register URI for this register. Can be within this API or external.
@@ -68,25 +112,27 @@ class ContainerRenderer(Renderer):
         :param per_page: Number of items to show per page if not specified in request. If None, then it will default to
         RegisterRenderer.DEFAULT_ITEMS_PER_PAGE.
         :type per_page: int or None
+        :param lazy: If True, negotiation and headers are left until first used, as for :class:`.Renderer`.
+        :type lazy: bool
+        :param cursor_paging: If True, pages are given by an opaque cursor QSA, holding the key of the member before,
+        or after, the page, rather than by a page number. Finding a page by key costs the same however deep it is, but
+        only the first, previous, next & last pages are linked to and the members aren't counted. The members must be
+        a member source that can seek by key (see :mod:`pyldapi.members`).
+        :type cursor_paging: bool
         """
         self.instance_uri = instance_uri
 
         if profiles is None:
-            profiles = {}
-        for k, v in profiles.items():
-            if k == 'mem':
-                raise ProfilesMediatypesException(
-                    'You must not manually add a profile with token \'mem\' as this is auto-created'
-                )
-        profiles.update({
-            'mem': Profile(
-                'https://w3id.org/profile/mem',
-                'Members Profile',
-                'A very basic RDF data model-only profile that lists the sub-items (members) of collections (rdf:Bag)',
-                ['text/html'] + RDF_MEDIATYPES,
-                'text/html'
+            profiles = ProfileRegistry({})
+        # a registry may already hold the auto-created 'mem' profile from an earlier request
+        if 'mem' in profiles and profiles['mem'] != MEM_PROFILE:
+            raise ProfilesMediatypesException(
+                'You must not manually add a profile with token \'mem\' as this is auto-created'
             )
-        })
+        # auto-add in the Members profile, without changing the profiles given
+        if not isinstance(profiles, ProfileRegistry):
+            profiles = ProfileRegistry.compile(profiles)
+        profiles = profiles.overlay(MEM_PROFILES)
         if default_profile_token is None:
             default_profile_token = 'mem'
 
@@ -94,106 +140,164 @@ class ContainerRenderer(Renderer):
             request,
             instance_uri,
             profiles,
-            default_profile_token
+            default_profile_token,
+            lazy=lazy
          )
         if self.vf_error is None:
             self.label = label
             self.comment = comment
             self.parent_container_uri = parent_container_uri
             self.parent_container_label = parent_container_label
+            # without a members_total_count, the members are counted, and paged, when rendered, so that arender() can
+            # load them with _aload_members_total_count() & _aload_members()
+            # without a count, the members given are all of the register's, so are paged from
+            if is_member_source(members) or (members is not None and members_total_count is None):
+                self.member_source = to_member_source(members)
+                members = None
+            else:
+                self.member_source = None
+                if members is not None and not isinstance(members, (list, tuple, MemberTable)):
+                    members = list(members)
+            self._members_given = members is not None
+            # the members as a MemberTable, made from them when first rendered
+            self._member_table = None
             if members is not None:
                 self.members = members
             else:
                 self.members = []
+            # a count provider is only called for the Members profile
+            if callable(members_total_count):
+                self.count_provider = members_total_count
+                members_total_count = None
+            else:
+                self.count_provider = None
             self.members_total_count = members_total_count
+            self.last_page_exact = True
 
             if request.query_params.get("per_page"):
                 self.per_page = int(request.query_params.get("per_page"))
             else:
                 self.per_page = ContainerRenderer.DEFAULT_ITEMS_PER_PAGE
-            if request.query_params.get("page"):
+            self.cursor_paging = cursor_paging
+            # the links to other pages, made once the page is known to exist
+            self.page_links = None
+            self.cursor = None
+            self.prev_cursor = None
+            self.next_cursor = None
+            if cursor_paging:
+                self.page = None
+            elif request.query_params.get("page"):
                 self.page = int(request.query_params.get("page"))
             else:
                 self.page = 1
 
             self.super_register = super_register
             self.page_size_max = page_size_max
-            self.paging_error = self._paging()
+            if cursor_paging:
+                self.paging_error = self._cursor_paging()
+            elif members_total_count is not None:
+                self.paging_error = self._paging()
+            else:
+                self.paging_error = None
 
     def _paging(self):
         # calculate last page
         self.last_page = int(round(self.members_total_count / self.per_page, 0)) + 1  # same as math.ceil()
+        # from an approximate count, the last page is only an estimate, so isn't linked to or enforced
+        self.last_page_exact = is_exact_count(self.members_total_count)
 
         # if we've gotten the last page value successfully, we can choke if someone enters a larger value
-        if self.page > self.last_page:
+        if self.last_page_exact and self.page > self.last_page:
             return 'You must enter either no value for page or an integer <= {} which is the last page number.'\
                 .format(self.last_page)
 
         if self.per_page > self.page_size_max:
             return 'You must choose a page size <= {}'.format(self.page_size_max)
 
-        # set up Link headers
-        links = list()
-        # signalling this is an LDP Resource
-        links.append('<http://www.w3.org/ns/ldp#Resource>; rel="type"')
-        # signalling that this is, in fact, a Resource described in pages
-        links.append('<http://www.w3.org/ns/ldp#Page>; rel="type"')
-
-        # other Query String Arguments
-        other_qsas = [x + "=" + self.request.query_params[x] for x in self.request.query_params if x not in ["page", "per_page"]]
-        if len(other_qsas) > 0:
-            other_qsas_str = "&".join(other_qsas) + "&"
-        else:
-            other_qsas_str = ''
-
-        # always add a link to first
+        # always link to first
         self.first_page = 1
-        links.append(
-            '<{}?{}per_page={}&page=1>; rel="first"'.format(
-                self.instance_uri,
-                other_qsas_str,
-                self.per_page
-            )
+        # if this isn't the first page, link to "prev"
+        self.prev_page = self.page - 1 if self.page > 1 else None
+        # if this isn't the last page, link to next
+        self.next_page = self.page + 1 if self.page < self.last_page else None
+        # link to last, if it's known
+        self.page_links = PageLinks.for_pages(
+            self.request.query_params,
+            self.per_page,
+            self.page,
+            self.prev_page,
+            self.next_page,
+            self.last_page if self.last_page_exact else None
         )
+        self._add_paging_header_links()
 
-        # if this isn't the first page, add a link to "prev"
-        if self.page > 1:
-            self.prev_page = self.page - 1
-            links.append('<{}?per_page={}&page={}>; rel="prev"'.format(
-                self.instance_uri,
-                self.per_page,
-                self.prev_page
-            ))
-        else:
-            self.prev_page = None
-
-        # if this isn't the last page, add a link to next
-        if self.page < self.last_page:
-            self.next_page = self.page + 1
-            links.append(
-                '<{}?{}per_page={}&page={}>; rel="next"'.format(
-                    self.instance_uri,
-                    other_qsas_str,
-                    self.per_page,
-                    self.next_page
-                )
-            )
-        else:
-            self.next_page = None
-
-        # always add a link to last
-        links.append(
-            '<{}?{}per_page={}&page={}>; rel="last"'.format(
-                self.instance_uri,
-                other_qsas_str,
-                self.per_page, self.last_page
-            )
+        return None
+
+    def _add_paging_header_links(self):
+        # add the paging links to the compiled profile links, still splitting at the instance URI
+        self._add_header_links(
+            # signalling this is an LDP Resource
+            '<http://www.w3.org/ns/ldp#Resource>; rel="type"',
+            # signalling that this is, in fact, a Resource described in pages
+            '<http://www.w3.org/ns/ldp#Page>; rel="type"',
+            *self.page_links.header_links()
         )
 
-        self.headers['Link'] += ', ' + ', '.join(links)
+    def _cursor_paging(self):
+        if self.member_source is None or not callable(getattr(self.member_source, 'seek', None)):
+            raise PagingError('Cursor paging needs a member source that can seek by key')
+        self.first_page = self.prev_page = self.next_page = self.last_page = None
+
+        if self.per_page > self.page_size_max:
+            return 'You must choose a page size <= {}'.format(self.page_size_max)
 
+        self.cursor = self.request.query_params.get('cursor') or None
+        if self.cursor is None:
+            self._cursor_key, self._cursor_forward = None, True
+        else:
+            try:
+                self._cursor_key, self._cursor_forward = decode_cursor(self.cursor)
+            except ValueError:
+                return self.INVALID_CURSOR_ERROR
+            # a key the member source's keys can't be compared with would fail when sought
+            key_types = getattr(self.member_source, 'key_types', None)
+            if key_types is not None and self._cursor_key is not None and not isinstance(self._cursor_key, key_types):
+                return self.INVALID_CURSOR_ERROR
         return None
 
+    def _set_cursor_page(self, members):
+        """
+        Sets the members, and the cursors & links to the pages before & after them, from the members the member
+        source sought, which are one more than a page, if there are more beyond it, and in reverse order when going
+        backward.
+        """
+        more = len(members) > self.per_page
+        members = list(members[:self.per_page])
+        if not self._cursor_forward:
+            members.reverse()
+        self.members = members
+
+        # coming from a key, there are members on its side of the page
+        if self._cursor_forward:
+            has_prev, has_next = self._cursor_key is not None, more
+        else:
+            has_prev, has_next = more, self._cursor_key is not None
+        if members:
+            if has_prev:
+                self.prev_cursor = encode_cursor(self.member_source.key(members[0]), forward=False)
+            if has_next:
+                self.next_cursor = encode_cursor(self.member_source.key(members[-1]))
+
+        self.page_links = PageLinks.for_cursors(
+            self.request.query_params,
+            self.per_page,
+            self.cursor,
+            self.prev_cursor,
+            self.next_cursor,
+            LAST_PAGE_CURSOR
+        )
+        self._add_paging_header_links()
+
     def render(
         self,
         additional_alt_template_context=None,
@@ -212,7 +316,30 @@ class ContainerRenderer(Renderer):
             alt_template_context_replace=alt_template_context_replace
         )
         if response is None and self.profile == 'mem':
+            if self.members_total_count is None and not self.cursor_paging:
+                if self.count_provider is not None:
+                    self.members_total_count = call_member_source(self.count_provider)
+                elif self.member_source is not None:
+                    self.members_total_count = call_member_source(self.member_source.count)
+                else:
+                    self.members_total_count = len(self.members)
+                self.paging_error = self._paging()
             if self.paging_error is None:
+                if self.cursor_paging:
+                    self._set_cursor_page(call_member_source(
+                        self.member_source.seek,
+                        self._cursor_key,
+                        self.per_page + 1,
+                        self._cursor_forward
+                    ))
+                elif self.member_source is not None:
+                    if self._is_head_request():
+                        return self._make_mem_profile_head_response()
+                    self.members = call_member_source(
+                        self.member_source.fetch,
+                        (self.page - 1) * self.per_page,
+                        self.per_page
+                    )
                 if self.mediatype == 'text/html':
                     return self._render_mem_profile_html(
                         additional_mem_template_context,
@@ -226,11 +353,189 @@ class ContainerRenderer(Renderer):
                 return Response(self.paging_error, status_code=400, media_type='text/plain')
         return response
 
+    async def arender(
+        self,
+        additional_alt_template_context=None,
+        alt_template_context_replace=False,
+        additional_mem_template_context=None,
+        mem_template_context_replace=False
+    ):
+        """
+        Renders the register profile, as :meth:`render` does, for async endpoints.
+
+        Members not given to the constructor are loaded with :meth:`_aload_members`, and, if no members_total_count
+        was given, counted with :meth:`_aload_members_total_count`, before rendering.
+
+        :return: A Response object.
+        :rtype: Response
+        """
+        response = await super(ContainerRenderer, self).arender(
+            additional_alt_template_context=additional_alt_template_context,
+            alt_template_context_replace=alt_template_context_replace
+        )
+        if response is None and self.profile == 'mem':
+            if self.paging_error is None:
+                if not self._members_given and not self.cursor_paging and self._is_head_request():
+                    return self._make_mem_profile_head_response()
+                if self.mediatype == 'text/html':
+                    return await self._arender_mem_profile_html(
+                        additional_mem_template_context,
+                        mem_template_context_replace
+                    )
+                elif self.mediatype in RDF_MEDIATYPES:
+                    return await self._arender_mem_profile_rdf()
+                else:
+                    return self._render_mem_profile_json()
+            else:  # there is a paging error (e.g. page > last_page)
+                return Response(self.paging_error, status_code=400, media_type='text/plain')
+        return response
+
+    async def _aload_instance_data(self):
+        await super(ContainerRenderer, self)._aload_instance_data()
+        # a member source, or count provider, is only asked for the members, and their count, for the Members profile
+        if (self.member_source is not None or self.count_provider is not None) and self.profile != 'mem':
+            return
+        if self.cursor_paging:
+            if self.paging_error is None:
+                self._set_cursor_page(await acall_member_source(
+                    self.member_source.seek,
+                    self._cursor_key,
+                    self.per_page + 1,
+                    self._cursor_forward
+                ))
+            return
+        if self.members_total_count is None:
+            self.members_total_count = await self._aload_members_total_count()
+            self.paging_error = self._paging()
+        if self.profile == 'mem' and self.paging_error is None and not self._members_given \
+                and not self._is_head_request():
+            self.members = await self._aload_members((self.page - 1) * self.per_page, self.per_page)
+
+    async def _aload_members_total_count(self):
+        """
+        Counts the members of this container, for :meth:`arender`, if no members_total_count was given.
+
+        By default, this is the count provider's count, the member source's or the number of members given.
+
+        :rtype: int
+        """
+        if self.count_provider is not None:
+            return await acall_member_source(self.count_provider)
+        if self.member_source is not None:
+            return await acall_member_source(self.member_source.count)
+        return len(self.members)
+
+    async def _aload_members(self, offset, limit):
+        """
+        Loads the members on the requested page, for :meth:`arender`, if no members were given.
+
+        By default, they are fetched from the member source, if there is one, otherwise there are none.
+
+        :param offset: The number of members before the page.
+        :type offset: int
+        :param limit: The page size.
+        :type limit: int
+        :return: The members, in any of the forms the constructor takes
+        :rtype: list
+        """
+        if self.member_source is not None:
+            return await acall_member_source(self.member_source.fetch, offset, limit)
+        return []
+
+    def _get_member_table(self):
+        """
+        Returns the members as a :class:`.MemberTable`, which the Members profile's representations are rendered from.
+
+        :rtype: :class:`.MemberTable`
+        """
+        if self._member_table is None or self._member_table[0] is not self.members:
+            self._member_table = (self.members, MemberTable.from_members(self.members))
+        return self._member_table[1]
+
+    def _is_head_request(self):
+        return getattr(self.request, 'scope', {}).get('method') == 'HEAD'
+
+    def _make_mem_profile_head_response(self):
+        # the headers a GET would be answered with, without loading the members for a body that isn't sent, whose
+        # length, for the Content-Length, therefore isn't known
+        response = Response(media_type=self.mediatype, headers=self.headers)
+        del response.headers['content-length']
+        return response
+
+    def _get_response_cache_key(self, fingerprint):
+        # pages differ by the page & page size, and link to other pages with the other Query String Arguments
+        key = super(ContainerRenderer, self)._get_response_cache_key(fingerprint)
+        if self.profile == 'mem':
+            key += (str(self.request.query_params),)
+        return key
+
+    def _get_fingerprint(self):
+        if self.profile == 'mem':
+            return self._get_mem_fingerprint(self._get_members_fingerprint())
+        return super(ContainerRenderer, self)._get_fingerprint()
+
+    async def _aget_fingerprint(self):
+        if self.profile == 'mem':
+            return self._get_mem_fingerprint(await self._aget_members_fingerprint())
+        return await super(ContainerRenderer, self)._aget_fingerprint()
+
+    def _get_mem_fingerprint(self, members_fingerprint):
+        # the Members profile's page also shows the container's own details & the paging
+        if members_fingerprint is None:
+            return None
+        return (
+            members_fingerprint,
+            self.label,
+            self.comment,
+            self.parent_container_uri,
+            self.parent_container_label,
+            self.members_total_count,
+            self.page,
+            self.per_page,
+            self.cursor,
+        )
+
+    def _get_members_fingerprint(self):
+        """
+        Returns a fingerprint of this container's members, e.g. a version number of the register, that changes whenever
+        they do, for the ETag of the Members profile's pages. Each page's ETag also depends on the page, the page size
+        and the container's details. By default there is no fingerprint, and so no ETag.
+
+        :return: A fingerprint or None
+        """
+        return None
+
+    async def _aget_members_fingerprint(self):
+        """
+        Returns the members' fingerprint for :meth:`arender`, e.g. from an async data source.
+        """
+        return self._get_members_fingerprint()
+
     def _render_mem_profile_html(
         self,
         additional_mem_template_context=None,
         mem_template_context_replace=False
     ):
+        return templates.TemplateResponse("mem.html",
+                                          context=self._get_mem_template_context(
+                                              additional_mem_template_context,
+                                              mem_template_context_replace
+                                          ),
+                                          headers=self.headers)
+
+    async def _arender_mem_profile_html(
+        self,
+        additional_mem_template_context=None,
+        mem_template_context_replace=False
+    ):
+        html = await render_template_async(
+            templates,
+            "mem.html",
+            self._get_mem_template_context(additional_mem_template_context, mem_template_context_replace)
+        )
+        return Response(html, media_type='text/html', headers=self.headers)
+
+    def _get_mem_template_context(self, additional_mem_template_context=None, mem_template_context_replace=False):
         _template_context = {
             'uri': self.instance_uri,
             'label': self.label,
@@ -238,12 +543,17 @@ class ContainerRenderer(Renderer):
             'parent_container_uri': self.parent_container_uri,
             'parent_container_label': self.parent_container_label,
             'members': self.members,
+            'member_table': self._get_member_table(),
             'page': self.page,
             'per_page': self.per_page,
             'first_page': self.first_page,
             'prev_page': self.prev_page,
             'next_page': self.next_page,
             'last_page': self.last_page,
+            'last_page_exact': self.last_page_exact,
+            'prev_cursor': self.prev_cursor,
+            'next_cursor': self.next_cursor,
+            'page_links': self.page_links,
             'mediatype_names': MEDIATYPE_NAMES,
             'request': self.request
         }
@@ -252,10 +562,7 @@ class ContainerRenderer(Renderer):
                 _template_context = additional_mem_template_context
             else:
                 _template_context.update(additional_mem_template_context)
-
-        return templates.TemplateResponse("mem.html",
-                                          context=_template_context,
-                                          headers=self.headers)
+        return _template_context
 
     def _generate_mem_profile_rdf(self):
         g = Graph()
@@ -270,27 +577,15 @@ class ContainerRenderer(Renderer):
         g.add((u, RDF.type, RDF.Bag))
         g.add((u, RDFS.label, Literal(self.label)))
         g.add((u, RDFS.comment, Literal(self.comment, lang='en')))
-        for member in self.members:
-            if "uri" in member:
-                member_uri = URIRef(member["uri"])
-                g.add((u, RDFS.member, member_uri))
-                g.add((member_uri, RDFS.label, Literal(member["title"])))
-            elif isinstance(member, tuple):
-                member_uri = URIRef(member[0])
-                g.add((u, RDFS.member, member_uri))
-                g.add((member_uri, RDFS.label, Literal(member[1])))
-            else:
-                g.add((u, RDFS.member, URIRef(member)))
-
-        # other Query String Arguments
-        other_qsas = [x + "=" + self.request.query_params[x] for x in self.request.query_params if x not in ["page", "per_page"]]
-        if len(other_qsas) > 0:
-            other_qsas_str = "&".join(other_qsas) + "&"
-        else:
-            other_qsas_str = ''
-
-        page_uri_str = "{}?{}per_page={}&page={}".format(self.instance_uri, other_qsas_str, self.per_page, self.page)
-        page_uri_str_nonum = "{}?{}per_page={}&page=".format(self.instance_uri, other_qsas_str, self.per_page)
+        for member_uri, member_label, member_class in self._get_member_table().rows():
+            member_uri = URIRef(member_uri)
+            g.add((u, RDFS.member, member_uri))
+            if member_label is not None:
+                g.add((member_uri, RDFS.label, Literal(member_label)))
+            if member_class is not None:
+                g.add((member_uri, RDF.type, URIRef(member_class)))
+
+        page_uri_str, page_links = self.page_links.uris(self.instance_uri)
         page_uri = URIRef(page_uri_str)
 
         # pagination
@@ -299,14 +594,8 @@ class ContainerRenderer(Renderer):
         g.add((page_uri, LDP.pageOf, u))
 
         # links to other pages
-        g.add((page_uri, XHV.first, URIRef(page_uri_str_nonum + '1')))
-        g.add((page_uri, XHV.last, URIRef(page_uri_str_nonum + str(self.last_page))))
-
-        if self.page != 1:
-            g.add((page_uri, XHV.prev, URIRef(page_uri_str_nonum + str(self.page - 1))))
-
-        if self.page != self.last_page:
-            g.add((page_uri, XHV.next, URIRef(page_uri_str_nonum + str(self.page + 1))))
+        for rel, page_link in page_links.items():
+            g.add((page_uri, XHV[rel], URIRef(page_link)))
 
         if self.parent_container_uri is not None:
             g.add((URIRef(self.parent_container_uri), RDF.Bag, u))
@@ -315,20 +604,132 @@ class ContainerRenderer(Renderer):
                 g.add((URIRef(self.parent_container_uri), RDFS.label, Literal(self.parent_container_label)))
         return g
 
+    def _iter_mem_profile_triples(self):
+        """
+        Writes the same triples as :meth:`_generate_mem_profile_rdf`, straight from the members, as lines of
+        N-Triples or Turtle in this request's mediatype.
+
+        :rtype: generator (of str)
+        """
+        w = TripleWriter(self.mediatype, MEM_PREFIXES)
+        rdf_type = w.name('rdf', 'type')
+        rdfs_label = w.name('rdfs', 'label')
+        rdfs_member = w.name('rdfs', 'member')
+
+        yield w.preamble()
+        u = nt_iri(self.instance_uri)
+        yield w.triple(u, rdf_type, w.name('rdf', 'Bag'))
+        yield w.triple(u, rdfs_label, nt_literal(self.label))
+        yield w.triple(u, w.name('rdfs', 'comment'), nt_literal(self.comment, lang='en'))
+        for member_uri, member_label, member_class in self._get_member_table().rows():
+            member_uri = nt_iri(member_uri)
+            yield w.triple(u, rdfs_member, member_uri)
+            if member_label is not None:
+                yield w.triple(member_uri, rdfs_label, nt_literal(member_label))
+            if member_class is not None:
+                yield w.triple(member_uri, rdf_type, nt_iri(member_class))
+
+        page_uri_str, page_links = self.page_links.uris(self.instance_uri)
+        page_uri = nt_iri(page_uri_str)
+
+        # pagination
+        # this page
+        yield w.triple(page_uri, rdf_type, w.name('ldp', 'Page'))
+        yield w.triple(page_uri, w.name('ldp', 'pageOf'), u)
+
+        # links to other pages
+        for rel, page_link in page_links.items():
+            yield w.triple(page_uri, w.name('xhv', rel), nt_iri(page_link))
+
+        if self.parent_container_uri is not None:
+            parent = nt_iri(self.parent_container_uri)
+            yield w.triple(parent, w.name('rdf', 'Bag'), u)
+            yield w.triple(parent, rdfs_member, u)
+            if self.parent_container_label is not None:
+                yield w.triple(parent, rdfs_label, nt_literal(self.parent_container_label))
+
+    def _render_built_in_mem_profile_rdf(self):
+        # subclasses that make their own graph get it serialized
+        if type(self)._generate_mem_profile_rdf is not ContainerRenderer._generate_mem_profile_rdf:
+            return None
+        # write Turtle & N-Triples directly, streaming the members of large pages, and JSON-LD directly
+        if self.mediatype in STREAMING_MEDIATYPES:
+            if len(self._get_member_table()) >= self.mem_rdf_streaming_threshold:
+                return StreamingResponse(
+                    iter_chunks(self._iter_mem_profile_triples()),
+                    media_type=self.mediatype,
+                    headers=self.headers
+                )
+            return BytesResponse(
+                ''.join(self._iter_mem_profile_triples()).encode('utf-8'),
+                media_type=self.mediatype,
+                headers=self.headers
+            )
+        if self._writes_jsonld():
+            return self._make_mem_profile_jsonld_response()
+        return None
+
+    def _make_mem_profile_jsonld_response(self):
+        page_uri_str, page_links = self.page_links.uris(self.instance_uri)
+        member_table = self._get_member_table()
+        nodes = iter_mem_profile_nodes(
+            self.instance_uri,
+            self.label,
+            self.comment,
+            member_table,
+            page_uri_str,
+            page_links,
+            self.parent_container_uri,
+            self.parent_container_label
+        )
+        # stream the members of large pages, rather than encoding them all at once
+        if len(member_table) >= self.mem_json_streaming_threshold:
+            return StreamingResponse(
+                iter_json_object({'@context': MEM_CONTEXT}, '@graph', nodes),
+                media_type='application/ld+json',
+                headers=self.headers
+            )
+        return BytesResponse(
+            dumps({'@context': MEM_CONTEXT, '@graph': list(nodes)}),
+            media_type='application/ld+json',
+            headers=self.headers
+        )
+
     def _render_mem_profile_rdf(self):
+        response = self._render_built_in_mem_profile_rdf()
+        if response is not None:
+            return response
         g = self._generate_mem_profile_rdf()
         return self._make_rdf_response(g)
 
+    async def _arender_mem_profile_rdf(self):
+        # the triples of large pages are streamed, so written in Starlette's threadpool as the response is sent
+        response = self._render_built_in_mem_profile_rdf()
+        if response is not None:
+            return response
+        g = self._generate_mem_profile_rdf()
+        return await self._amake_rdf_response(g)
+
     def _render_mem_profile_json(self):
-        return JSONResponse(
-            content={
-                'uri': self.instance_uri,
-                'label': self.label,
-                'comment': self.comment,
-                'profiles': list(self.profiles.keys()),
-                'default_profile': self.default_profile_token,
-                'register_items': self.members
-            },
+        container = {
+            'uri': self.instance_uri,
+            'label': self.label,
+            'comment': self.comment,
+            'profiles': list(self.profiles.keys()),
+            'default_profile': self.default_profile_token,
+        }
+        # stream the members of large pages, rather than encoding them all at once
+        # the members are written in the forms they were given in, which a list of them already is
+        members = self.members if isinstance(self.members, (list, tuple)) else self._get_member_table()
+        if len(members) >= self.mem_json_streaming_threshold:
+            return StreamingResponse(
+                iter_json_object(container, 'register_items', members),
+                media_type='application/json',
+                headers=self.headers
+            )
+        container['register_items'] = list(members)
+        return BytesResponse(
+            dumps(container),
             media_type='application/json',
             headers=self.headers
         )
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+A cache of finished responses, with their bodies precompressed, for :meth:`.Renderer.render_cached`.
+
+Each entry holds a response's body, status & headers and, for bodies worth compressing, gzip and, if the ``brotli``
+package is installed, brotli encoded copies of the body. A hit is answered with the variant the request's
+Accept-Encoding header prefers, without rendering or compressing anything.
+"""
+import gzip
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from pyldapi.accept import select_encoding
+from pyldapi.responses import BytesResponse, encode_header, encode_headers
+from pyldapi.validators import coding_etag
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+# the headers of a response that are made afresh for each variant sent
+_VARIANT_HEADERS = ('content-length', 'content-encoding')
+
+
+class CachedResponse:
+    """
+    A cached response: the status & headers, as a dict of lower-cased names, and the body in each content-coding,
+    keyed by the coding or None for the unencoded body.
+
+    The headers sent with each variant are encoded once, into ``raw_headers``, when the response is cached. Each
+    compressed variant has its own ETag, in ``etags``, made by :func:`.coding_etag`.
+    """
+    __slots__ = ('status_code', 'headers', 'bodies', 'expires', 'size', 'raw_headers', 'etags')
+
+    def __init__(self, status_code, headers, bodies, expires=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.bodies = bodies
+        self.expires = expires
+        self.size = sum(len(b) for b in bodies.values())
+
+        etag = headers.get('etag')
+        self.etags = {encoding: coding_etag(etag, encoding) if etag is not None else None for encoding in bodies}
+        raw_headers = {k: v for k, v in headers.items() if k != 'etag'}
+        if self.encodings:
+            raw_headers['vary'] = headers['vary'] + ', Accept-Encoding' if 'vary' in headers else 'Accept-Encoding'
+        raw_headers = encode_headers(raw_headers)
+        self.raw_headers = {}
+        for encoding in bodies:
+            variant_headers = list(raw_headers)
+            if self.etags[encoding] is not None:
+                variant_headers.append(encode_header('etag', self.etags[encoding]))
+            if encoding is not None:
+                variant_headers.append(encode_header('content-encoding', encoding))
+            self.raw_headers[encoding] = variant_headers
+
+    @property
+    def encodings(self):
+        """
+        The content-codings the body is available in, most preferred first.
+
+        :rtype: tuple (of str)
+        """
+        return tuple(e for e in self.bodies if e is not None)
+
+    def select_encoding(self, accept_encoding=None):
+        """
+        Returns the content-coding of the variant to send for a request's Accept-Encoding header.
+
+        :param accept_encoding: The request's Accept-Encoding header.
+        :type accept_encoding: str
+        :return: The content-coding, or None for the body as it is
+        :rtype: str
+        """
+        encodings = self.encodings
+        if encodings and accept_encoding is not None:
+            try:
+                return select_encoding(accept_encoding, encodings)
+            except ValueError:
+                pass
+        return None
+
+
+class ResponseCache:
+    """
+    A thread-safe cache of finished responses, bounded by the total size of the bodies held, dropping the least
+    recently used response beyond that, with an optional time to live for each response.
+
+    .. code-block:: python
+
+        Renderer.response_cache = ResponseCache(max_bytes=256 * 1024 * 1024, ttl=300)
+
+        # ... and when the data behind a resource changes
+        Renderer.response_cache.invalidate('http://example.com/thing')
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=None, min_compress_size=512, gzip_level=6, brotli_quality=5):
+        """
+        Constructor
+
+        :param max_bytes: The most bytes of bodies, including compressed copies, to hold.
+        :type max_bytes: int
+        :param ttl: The default number of seconds a response is kept for, or None to keep it until evicted.
+        :type ttl: float
+        :param min_compress_size: The size of the smallest body to keep compressed copies of.
+        :type min_compress_size: int
+        :param gzip_level: The gzip compression level.
+        :type gzip_level: int
+        :param brotli_quality: The brotli quality level.
+        :type brotli_quality: int
+        """
+        self._data = OrderedDict()
+        self._by_uri = {}
+        self._lock = Lock()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.min_compress_size = min_compress_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.currbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns the cached response for key, marking it as most recently used, or None if there is none or it has
+        expired.
+
+        :rtype: :class:`.CachedResponse`
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires is not None and entry.expires <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, response, ttl=None):
+        """
+        Caches a finished response, along with compressed copies of its body.
+
+        :param key: The key, a tuple starting with the resource's instance URI.
+        :type key: tuple
+        :param response: The response. Responses without a body in memory, like streaming responses, aren't cached.
+        :type response: :class:`fastapi.Response`
+        :param ttl: The number of seconds to keep the response for, instead of the cache's ttl.
+        :type ttl: float
+        :return: The cached response, or None if it wasn't cached
+        :rtype: :class:`.CachedResponse`
+        """
+        body = getattr(response, 'body', None)
+        if not isinstance(body, bytes):
+            return None
+
+        headers = {k: v for k, v in response.headers.items() if k not in _VARIANT_HEADERS}
+        bodies = {}
+        if len(body) >= self.min_compress_size:
+            if brotli is not None:
+                bodies['br'] = brotli.compress(body, quality=self.brotli_quality)
+            bodies['gzip'] = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        bodies[None] = body
+
+        ttl = self.ttl if ttl is None else ttl
+        entry = CachedResponse(
+            response.status_code,
+            headers,
+            bodies,
+            time.monotonic() + ttl if ttl is not None else None
+        )
+        if entry.size > self.max_bytes:
+            return None
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = entry
+            self._by_uri.setdefault(key[0], set()).add(key)
+            self.currbytes += entry.size
+            while self.currbytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+        return entry
+
+    def _remove(self, key):
+        # the lock must be held
+        entry = self._data.pop(key)
+        self.currbytes -= entry.size
+        keys = self._by_uri.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_uri[key[0]]
+
+    def invalidate(self, instance_uri):
+        """
+        Removes every cached response for a resource, i.e. for each of its profiles, Media Types, languages and pages.
+
+        :param instance_uri: The resource's URI.
+        :type instance_uri: str
+        :return: The number of responses removed
+        :rtype: int
+        """
+        with self._lock:
+            keys = list(self._by_uri.get(instance_uri, ()))
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        """
+        Removes all responses and resets the hit and miss counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self._by_uri.clear()
+            self.currbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns the cache's statistics.
+
+        :return: hits, misses, max_bytes, currbytes & currsize
+        :rtype: dict
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'max_bytes': self.max_bytes,
+            'currbytes': self.currbytes,
+            'currsize': len(self._data),
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+def respond(entry, accept_encoding=None):
+    """
+    Makes a response from a cached response, in the content-coding the Accept-Encoding header prefers.
+
+    :param entry: The cached response.
+    :type entry: :class:`.CachedResponse`
+    :param accept_encoding: The request's Accept-Encoding header.
+    :type accept_encoding: str
+    :rtype: :class:`fastapi.Response`
+    """
+    encoding = entry.select_encoding(accept_encoding)
+    return BytesResponse(entry.bodies[encoding], status_code=entry.status_code, raw_headers=entry.raw_headers[encoding])
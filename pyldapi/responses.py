@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Responses for bodies that are already encoded.
+
+Renderers serialize straight to UTF-8 bytes, so a response only needs to take the body as it is and set its
+Content-Length from the body's length. :class:`BytesResponse` does that and also takes headers that are already
+encoded, like those :class:`.ResponseCache` keeps for each cached response, so that they aren't encoded again for
+every response. Header names, and the Content-Type & other short values that recur from response to response, are
+encoded once and then looked up.
+"""
+from functools import lru_cache
+
+from fastapi import Response
+
+# values longer than this, like Link headers, vary from resource to resource so are encoded each time
+_CACHED_VALUE_LENGTH = 128
+
+
+@lru_cache(maxsize=256)
+def _encode_name(name):
+    return name.lower().encode('latin-1')
+
+
+@lru_cache(maxsize=1024)
+def _encode_value(value):
+    return value.encode('latin-1')
+
+
+@lru_cache(maxsize=64)
+def _encode_content_type(mediatype, charset):
+    if mediatype.startswith('text/') and 'charset=' not in mediatype.lower():
+        mediatype += '; charset=' + charset
+    return mediatype.encode('latin-1')
+
+
+def encode_header(name, value):
+    """
+    Encodes a header as ASGI expects it.
+
+    :param name: The header's name.
+    :type name: str
+    :param value: The header's value.
+    :type value: str
+    :return: The header's lower-cased name and its value, encoded
+    :rtype: tuple (of bytes)
+    """
+    if len(value) <= _CACHED_VALUE_LENGTH:
+        return _encode_name(name), _encode_value(value)
+    return _encode_name(name), value.encode('latin-1')
+
+
+def encode_headers(headers):
+    """
+    Encodes headers as ASGI expects them.
+
+    :param headers: The headers.
+    :type headers: Mapping
+    :rtype: list (of tuple)
+    """
+    return [encode_header(k, v) for k, v in headers.items()]
+
+
+class BytesResponse(Response):
+    """
+    A response whose body is already encoded, as bytes or a memoryview, which is sent as it is. Its Content-Length
+    is the body's length.
+
+    Headers can be given already encoded, as ``raw_headers``, as well as, or instead of, as a Mapping of str.
+    """
+
+    def __init__(self, content=None, status_code=200, headers=None, media_type=None, background=None,
+                 raw_headers=None):
+        """
+        Constructor
+
+        :param content: The body.
+        :type content: bytes
+        :param status_code: The HTTP status code.
+        :type status_code: int
+        :param headers: The headers, as str.
+        :type headers: Mapping
+        :param media_type: The Media Type, which sets the Content-Type unless a header does.
+        :type media_type: str
+        :param background: A task to run after the response is sent.
+        :param raw_headers: Encoded headers: (lower-cased name, value) bytes pairs.
+        :type raw_headers: list (of tuple)
+        """
+        self._given_raw_headers = raw_headers
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def init_headers(self, headers=None):
+        raw_headers = list(self._given_raw_headers) if self._given_raw_headers is not None else []
+        if headers is not None:
+            raw_headers.extend(encode_header(k, v) for k, v in headers.items())
+        names = {name for name, _ in raw_headers}
+
+        if b'content-length' not in names and not (self.status_code < 200 or self.status_code in (204, 304)):
+            raw_headers.append((b'content-length', str(len(self.body)).encode('latin-1')))
+
+        if b'content-type' not in names and self.media_type is not None:
+            raw_headers.append((b'content-type', _encode_content_type(self.media_type, self.charset)))
+
+        self.raw_headers = raw_headers
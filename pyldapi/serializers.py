@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+The serializers that :meth:`.Renderer._make_rdf_response` uses to write RDF graphs, keyed by Media Type.
+
+A serializer is any callable taking an rdflib Graph and returning the serialized graph as UTF-8 encoded bytes. The
+built-in serializers write N-Triples directly and use rdflib for Turtle, RDF/XML & JSON-LD. Applications can replace
+them, or add others, for all Renderers:
+
+.. code-block:: python
+
+    register_serializer('application/ld+json', my_json_ld_serializer)
+
+or for one Renderer subclass, by giving it its own ``serializers`` dict.
+
+Serializing a large graph can hold an event loop for long enough to delay every other request on it, so
+:func:`aserialize` can serialize graphs above a size threshold in a :class:`concurrent.futures.Executor` instead. A
+:class:`concurrent.futures.ProcessPoolExecutor` is sent the graph as N-Triples bytes, and serializes it with the
+worker process's :data:`SERIALIZERS`.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from rdflib import Graph, Literal
+
+from pyldapi.streaming import STREAM_CHUNK_LINES, nt_literal, nt_term
+
+
+def serialize_ntriples(graph):
+    """
+    Writes a graph as N-Triples, without going through rdflib's serializer plugins.
+
+    :param graph: The graph.
+    :type graph: :class:`rdflib.Graph`
+    :rtype: bytes
+    """
+    # subjects, predicates & IRI objects repeat, so each is only written once
+    written = {}
+    # lines are encoded a chunk at a time into the one buffer, so the graph is never held as text as well as bytes
+    buffer = BytesIO()
+    lines = []
+    for s, p, o in graph:
+        ws = written.get(s)
+        if ws is None:
+            ws = written[s] = nt_term(s)
+        wp = written.get(p)
+        if wp is None:
+            wp = written[p] = nt_term(p)
+        if isinstance(o, Literal):
+            wo = nt_literal(o)
+        else:
+            wo = written.get(o)
+            if wo is None:
+                wo = written[o] = nt_term(o)
+        lines.append(ws + ' ' + wp + ' ' + wo + ' .\n')
+        if len(lines) >= STREAM_CHUNK_LINES:
+            buffer.write(''.join(lines).encode('utf-8'))
+            lines = []
+    buffer.write(''.join(lines).encode('utf-8'))
+    return buffer.getvalue()
+
+
+def rdflib_serializer(rdflib_format):
+    """
+    Makes a serializer that uses one of rdflib's serializer plugins.
+
+    :param rdflib_format: The name of the rdflib serializer, e.g. 'turtle'.
+    :type rdflib_format: str
+    :return: A serializer
+    :rtype: callable
+    """
+    def serialize(graph):
+        # rdflib writes the encoded graph into a BytesIO, whose bytes are returned as they are
+        return graph.serialize(format=rdflib_format, encoding='utf-8')
+    serialize.__name__ = 'serialize_{}'.format(rdflib_format.replace('-', '_'))
+    return serialize
+
+
+# the built-in JSON-LD serializer, which Renderers bypass for the built-in profiles, writing their JSON-LD directly
+serialize_jsonld = rdflib_serializer('json-ld')
+
+SERIALIZERS = {
+    'text/turtle': rdflib_serializer('turtle'),
+    'application/rdf+xml': rdflib_serializer('xml'),
+    'application/ld+json': serialize_jsonld,
+    'application/n-triples': serialize_ntriples,
+}
+
+
+def register_serializer(mediatype, serializer):
+    """
+    Sets the serializer all Renderers use for a Media Type, replacing any built-in one.
+
+    :param mediatype: The Media Type, e.g. 'text/turtle'.
+    :type mediatype: str
+    :param serializer: A callable taking an rdflib Graph and returning bytes.
+    :type serializer: callable
+    """
+    SERIALIZERS[mediatype] = serializer
+
+
+def serialize(graph, mediatype, serializers=None):
+    """
+    Serializes a graph in the given Media Type.
+
+    :param graph: The graph.
+    :type graph: :class:`rdflib.Graph`
+    :param mediatype: The Media Type.
+    :type mediatype: str
+    :param serializers: The serializers to use, by default :data:`SERIALIZERS`.
+    :type serializers: dict
+    :rtype: bytes
+    """
+    serializer = (SERIALIZERS if serializers is None else serializers).get(mediatype)
+    if serializer is None:
+        raise ValueError('There is no serializer for the Media Type {}'.format(mediatype))
+    return serializer(graph)
+
+
+# the number of triples at and above which aserialize() sends a graph to its executor
+OFFLOAD_THRESHOLD = 5000
+
+
+def _serialize_ntriples_bytes(ntriples, mediatype):
+    # run in a worker process, which gets the graph as N-Triples as that's compact and quick to parse
+    graph = Graph().parse(data=ntriples, format='nt')
+    return serialize(graph, mediatype)
+
+
+async def aserialize(graph, mediatype, serializers=None, executor=None, threshold=OFFLOAD_THRESHOLD):
+    """
+    Serializes a graph in the given Media Type, in the executor if one is given and the graph has at least
+    ``threshold`` triples, otherwise directly, as :func:`serialize` does.
+
+    :param graph: The graph.
+    :type graph: :class:`rdflib.Graph`
+    :param mediatype: The Media Type.
+    :type mediatype: str
+    :param serializers: The serializers to use, by default :data:`SERIALIZERS`. A process pool always uses the
+    worker process's :data:`SERIALIZERS`.
+    :type serializers: dict
+    :param executor: A thread or process pool.
+    :type executor: :class:`concurrent.futures.Executor`
+    :param threshold: The number of triples at and above which the executor is used.
+    :type threshold: int
+    :rtype: bytes
+    """
+    if executor is None or len(graph) < threshold:
+        return serialize(graph, mediatype, serializers)
+
+    serializers = SERIALIZERS if serializers is None else serializers
+    if mediatype not in serializers:
+        raise ValueError('There is no serializer for the Media Type {}'.format(mediatype))
+
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        if serializers[mediatype] is serialize_ntriples:
+            # the N-Triples that would be sent to the process are the response
+            return serialize_ntriples(graph)
+        return await loop.run_in_executor(executor, _serialize_ntriples_bytes, serialize_ntriples(graph), mediatype)
+    return await loop.run_in_executor(executor, serialize, graph, mediatype, serializers)
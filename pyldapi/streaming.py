@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Writing RDF as text, triple by triple, without building an rdflib Graph.
+
+Large, simply-shaped representations, like a page of a container's members, can be written straight from their data
+as N-Triples or as Turtle statements. :func:`iter_chunks` then groups the lines into chunks of bytes for a
+:class:`starlette.responses.StreamingResponse`.
+"""
+import re
+
+from rdflib import BNode, Literal, URIRef
+
+# the Media Types that can be streamed, with one triple per line
+STREAMING_MEDIATYPES = ('text/turtle', 'application/n-triples')
+
+# the number of lines written into each chunk of a streamed response
+STREAM_CHUNK_LINES = 1000
+
+# characters not allowed as-is in an IRIREF, which are written as \u escapes instead
+_IRI_ESCAPES = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+
+_STRING_ESCAPES = {
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\r': '\\r',
+}
+_STRING_ESCAPES_RE = re.compile(r'[\\"\n\r]')
+
+
+def _escape_iri_char(match):
+    return '\\u{:04X}'.format(ord(match.group()))
+
+
+def _escape_string_char(match):
+    return _STRING_ESCAPES[match.group()]
+
+
+def nt_iri(uri):
+    """
+    Writes a URI as an N-Triples, or Turtle, IRI.
+
+    :param uri: The URI.
+    :type uri: str
+    :rtype: str
+    """
+    if _IRI_ESCAPES.search(uri) is not None:
+        uri = _IRI_ESCAPES.sub(_escape_iri_char, uri)
+    return '<{}>'.format(uri)
+
+
+def nt_literal(value, lang=None):
+    """
+    Writes a value as an N-Triples, or Turtle, literal: rdflib Literals as they are, strings as plain (or
+    language-tagged) literals and other values with the datatype that :class:`rdflib.Literal` gives them.
+
+    :param value: The value.
+    :param lang: The language of a string value.
+    :type lang: str
+    :rtype: str
+    """
+    datatype = None
+    if isinstance(value, Literal):
+        value, lang, datatype = str(value), value.language, value.datatype
+    elif not isinstance(value, str):
+        literal = Literal(value, lang=lang)
+        value, lang, datatype = str(literal), literal.language, literal.datatype
+    if _STRING_ESCAPES_RE.search(value) is not None:
+        value = _STRING_ESCAPES_RE.sub(_escape_string_char, value)
+    quoted = '"' + value + '"'
+    if lang is not None:
+        return quoted + '@' + lang
+    if datatype is not None:
+        return quoted + '^^' + nt_iri(datatype)
+    return quoted
+
+
+def nt_term(term):
+    """
+    Writes an rdflib term as N-Triples.
+
+    :param term: A URIRef, BNode or Literal.
+    :rtype: str
+    """
+    if isinstance(term, URIRef):
+        return nt_iri(term)
+    if isinstance(term, Literal):
+        return nt_literal(term)
+    if isinstance(term, BNode):
+        return '_:{}'.format(term)
+    raise ValueError('{!r} cannot be written as N-Triples'.format(term))
+
+
+class TripleWriter:
+    """
+    Writes triples, one per line, as N-Triples or as Turtle, where predicates and classes named with
+    :meth:`name` are written as prefixed names.
+    """
+    __slots__ = ('turtle', 'prefixes')
+
+    def __init__(self, mediatype, prefixes):
+        """
+        Constructor
+
+        :param mediatype: 'text/turtle' or 'application/n-triples'.
+        :type mediatype: str
+        :param prefixes: prefix -> namespace URI
+        :type prefixes: dict
+        """
+        if mediatype not in STREAMING_MEDIATYPES:
+            raise ValueError('Triples cannot be streamed as {}'.format(mediatype))
+        self.turtle = mediatype == 'text/turtle'
+        self.prefixes = prefixes
+
+    def preamble(self):
+        """
+        The lines to write before the triples: the Turtle prefix declarations.
+
+        :rtype: str
+        """
+        if not self.turtle:
+            return ''
+        return ''.join('@prefix {}: {} .\n'.format(p, nt_iri(ns)) for p, ns in self.prefixes.items()) + '\n'
+
+    def name(self, prefix, local_name):
+        """
+        Writes a term in one of the writer's namespaces.
+
+        :param prefix: The namespace's prefix.
+        :type prefix: str
+        :param local_name: The term's name within the namespace.
+        :type local_name: str
+        :rtype: str
+        """
+        if self.turtle:
+            return '{}:{}'.format(prefix, local_name)
+        return nt_iri(self.prefixes[prefix] + local_name)
+
+    @staticmethod
+    def triple(s, p, o):
+        """
+        Writes a triple of already written terms.
+
+        :rtype: str
+        """
+        return '{} {} {} .\n'.format(s, p, o)
+
+
+def iter_chunks(lines, chunk_lines=STREAM_CHUNK_LINES):
+    """
+    Groups lines of text into UTF-8 encoded chunks.
+
+    :param lines: The lines, each ending with a newline.
+    :type lines: iterable (of str)
+    :param chunk_lines: The number of lines in each chunk.
+    :type chunk_lines: int
+    :rtype: generator (of bytes)
+    """
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            yield ''.join(chunk).encode('utf-8')
+            chunk = []
+    if chunk:
+        yield ''.join(chunk).encode('utf-8')
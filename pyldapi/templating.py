@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Async rendering of the Jinja2 templates that Renderers use.
+
+Jinja compiles templates differently for async rendering, so each templates' environment gets an async overlay, with
+its own template cache, made on first use and remade if the environment's loader is replaced.
+"""
+from weakref import WeakKeyDictionary
+
+# the size of each async overlay's template cache, as for a default Jinja2 Environment
+ASYNC_TEMPLATE_CACHE_SIZE = 400
+
+_async_environments = WeakKeyDictionary()
+
+
+def get_async_environment(env):
+    """
+    Returns an async overlay of a Jinja2 Environment.
+
+    :param env: The Environment.
+    :type env: :class:`jinja2.Environment`
+    :rtype: :class:`jinja2.Environment`
+    """
+    async_env = _async_environments.get(env)
+    if async_env is None or async_env.loader is not env.loader:
+        async_env = _async_environments[env] = env.overlay(
+            enable_async=True,
+            cache_size=ASYNC_TEMPLATE_CACHE_SIZE
+        )
+    return async_env
+
+
+async def render_template_async(templates, name, context):
+    """
+    Renders a template with Jinja's async support.
+
+    :param templates: The templates, as the Renderers' module-level ``templates``.
+    :type templates: :class:`fastapi.templating.Jinja2Templates`
+    :param name: The template's name, e.g. 'alt.html'.
+    :type name: str
+    :param context: The template context.
+    :type context: dict
+    :return: The rendered template
+    :rtype: str
+    """
+    template = get_async_environment(templates.env).get_template(name)
+    return await template.render_async(context)
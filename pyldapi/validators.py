@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP validators, ETag & Last-Modified, and conditional GET (RFC 7232) for Renderers.
+
+A Renderer's content fingerprint, e.g. a version number or a hash of its source data, identifies its data but not its
+representation, so the ETag is a digest of the fingerprint and the negotiated profile, Media Type & language.
+"""
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+
+def make_etag(fingerprint, *variant):
+    """
+    Makes a strong ETag for a representation of data with the given fingerprint.
+
+    :param fingerprint: Anything whose str() changes when the data does.
+    :param variant: What else the representation depends on, e.g. its profile, Media Type & language.
+    :return: A quoted entity tag
+    :rtype: str
+    """
+    digest = blake2b(digest_size=16)
+    for part in (fingerprint,) + variant:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x1f')
+    return '"{}"'.format(digest.hexdigest())
+
+
+def coding_etag(etag, coding):
+    """
+    Makes the ETag of a representation's body in a content-coding, e.g. gzip, which, as its bytes differ, needs a
+    strong ETag of its own.
+
+    :param etag: The representation's ETag.
+    :type etag: str
+    :param coding: The content-coding, or None for the body as it is.
+    :type coding: str
+    :rtype: str
+    """
+    if coding is None or not etag.endswith('"'):
+        return etag
+    return '{}-{}"'.format(etag[:-1], coding)
+
+
+def format_http_date(dt):
+    """
+    Formats a datetime as an HTTP date. Naive datetimes are taken to be in UTC.
+
+    :param dt: The datetime.
+    :type dt: :class:`datetime.datetime`
+    :rtype: str
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def parse_http_date(value):
+    """
+    Parses an HTTP date.
+
+    :param value: The date.
+    :type value: str
+    :return: The date, in UTC, or None if it can't be parsed
+    :rtype: :class:`datetime.datetime`
+    """
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _opaque_tag(tag):
+    # If-None-Match compares entity tags weakly, i.e. ignoring any W/ prefix
+    tag = tag.strip()
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def is_not_modified(request_headers, etag=None, last_modified=None):
+    """
+    Tells whether a GET request's conditional headers show that the client's copy of the representation is current.
+
+    If-None-Match is used if it's given, otherwise If-Modified-Since.
+
+    :param request_headers: The request's headers.
+    :type request_headers: Mapping
+    :param etag: The representation's ETag.
+    :type etag: str
+    :param last_modified: When the representation last changed.
+    :type last_modified: :class:`datetime.datetime`
+    :rtype: bool
+    """
+    if_none_match = request_headers.get('If-None-Match')
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        return _opaque_tag(etag) in (_opaque_tag(t) for t in if_none_match.split(','))
+
+    if_modified_since = request_headers.get('If-Modified-Since')
+    if if_modified_since is not None and last_modified is not None:
+        since = parse_http_date(if_modified_since)
+        if since is None:
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates are to the second
+        return last_modified.replace(microsecond=0) <= since
+    return False
@@ -0,0 +1,67 @@
+from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
+from rdflib import Graph, URIRef, RDFS
+
+from pyldapi import ContainerRenderer
+
+CONTAINER = 'http://example.com/items'
+
+
+def make_request(query_string=b'', headers=None, method='GET', path='/'):
+    """
+    Makes a request to render a resource for, without a server.
+
+    :param query_string: The request's Query String.
+    :type query_string: bytes
+    :param headers: The request's headers.
+    :type headers: dict
+    :param method: The request's method.
+    :type method: str
+    :param path: The request's path.
+    :type path: str
+    :rtype: :class:`fastapi.requests.Request`
+    """
+    return Request({
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    })
+
+
+def make_container_renderer(request, members, members_total_count=None, cls=ContainerRenderer, **kwargs):
+    """
+    Makes a renderer for the container of items at :data:`CONTAINER`.
+
+    :param request: The request, e.g. from :func:`make_request`.
+    :type request: :class:`fastapi.requests.Request`
+    :param members: The container's members, or a member source.
+    :param members_total_count: The total number of members, if known.
+    :type members_total_count: int
+    :param cls: The renderer's class.
+    :type cls: type
+    :rtype: :class:`pyldapi.ContainerRenderer`
+    """
+    return cls(request, CONTAINER, 'Items', 'Some items', None, None, members, members_total_count, **kwargs)
+
+
+def members_of(response, container=CONTAINER):
+    """
+    Returns the URIs, sorted, of the members in an RDF/XML Members profile response.
+
+    :rtype: list (of str)
+    """
+    g = Graph().parse(data=response.body, format='xml')
+    return sorted(str(m) for m in g.objects(URIRef(container), RDFS.member))
+
+
+async def read_body(response):
+    """
+    Returns a response's body, reading it from the iterator of a streamed one.
+
+    :rtype: bytes
+    """
+    if isinstance(response, StreamingResponse):
+        return b''.join([chunk async for chunk in response.body_iterator])
+    return response.body
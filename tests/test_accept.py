@@ -0,0 +1,74 @@
+
+from pyldapi import Renderer, Profile
+from pyldapi.accept import parse_accept, parse_accept_language, match_language
+
+from tests.conftest import make_request
+
+RDF = frozenset(['text/turtle', 'application/rdf+xml', 'application/ld+json', 'application/n-triples'])
+
+
+def test_parse_accept_order():
+    a = parse_accept('text/*;q=0.3, text/html;q=0.7, text/html;level=1, */*;q=0.5')
+    expected = ['text/html', 'text/html', '*/*', 'text/*']
+    actual = a.mediatypes
+    assert actual == expected, 'Got {}, expected {}'.format(actual, expected)
+
+
+def test_specificity():
+    # RFC 9110, Section 12.5.1
+    a = parse_accept('text/*;q=0.3, text/plain;q=0.7, text/plain;format=flowed, */*;q=0.5')
+    assert a.quality('text/plain;format=flowed') == 1
+    assert a.quality('text/plain') == 0.7
+    assert a.quality('text/html') == 0.3
+    assert a.quality('image/jpeg') == 0.5
+
+
+def test_best_match():
+    chrome = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,' \
+             'application/signed-exchange;v=b3;q=0.7'
+    assert parse_accept(chrome).best_match(RDF | {'text/html'}, 'text/turtle') == 'text/html'
+    # wildcards select the default
+    assert parse_accept(chrome).best_match(RDF, 'application/rdf+xml') == 'application/rdf+xml'
+    assert parse_accept('text/*').best_match(RDF, 'application/rdf+xml') == 'text/turtle'
+    # weights with whitespace
+    assert parse_accept('text/turtle; q=0.5, application/rdf+xml').best_match(RDF, 'text/turtle') == \
+        'application/rdf+xml'
+    # q=0 means not acceptable
+    assert parse_accept('text/turtle;q=0, text/html').best_match(RDF, 'text/turtle') is None
+    assert parse_accept('*/*').best_match(['_internal'], 'text/turtle') is None
+
+
+def test_invalid_weight():
+    try:
+        parse_accept('text/turtle;q=high')
+    except ValueError:
+        pass
+    else:
+        assert False, 'An invalid weight was accepted'
+
+
+def test_parse_accept_language():
+    expected = (('en-AU', 1.0), ('pl', 1.0), ('en', 0.9), ('*', 0.1))
+    actual = parse_accept_language('en-AU, en;q=0.9, *;q=0.1, pl')
+    assert actual == expected, 'Got {}, expected {}'.format(actual, expected)
+
+
+def test_match_language():
+    assert match_language(('en-AU',), ('en', 'pl'), 'en') == 'en'
+    assert match_language(('de', 'PL'), ('en', 'pl'), 'en') == 'pl'
+    assert match_language(('zh-Hant-x-private',), ('zh-Hant',), 'en') == 'zh-Hant'
+    assert match_language(('en',), ('fr', 'en-GB'), 'fr') == 'en-GB'
+    assert match_language(('de',), ('fr', 'en'), 'fr') == 'fr'
+    assert match_language(('*',), ('fr', 'en'), 'fr') == 'fr'
+
+
+def test_renderer_language():
+    profiles = {
+        'multi': Profile('http://example.com/multi', 'Multi', 'Multilingual', ['text/turtle'], 'text/turtle',
+                         languages=['en', 'pl'], default_language='en')
+    }
+    r = Renderer(make_request(headers={'Accept-Language': 'pl-PL, en;q=0.5'}), 'http://x.com', profiles, 'multi')
+    assert r.language == 'pl'
+    assert r.headers['Content-Language'] == 'pl'
+    r = Renderer(make_request(b'_lang=en-AU', {'Accept-Language': 'pl'}), 'http://x.com', profiles, 'multi')
+    assert r.language == 'en'
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+
+from jinja2 import DictLoader, FileSystemLoader
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+import pyldapi
+from pyldapi import Renderer, Profile
+from pyldapi.renderer import templates
+from pyldapi.data import RDF_MEDIATYPES
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'sdo': Profile(
+        'https://schema.org',
+        'schema.org',
+        'Schema.org is a collaborative, community activity',
+        RDF_MEDIATYPES + ['_internal'],
+        'text/turtle'
+    )
+}
+
+
+def test_alt_profile_rdf():
+    # each Media Type is rendered once then reused for other instance URIs
+    for instance_uri in ['http://example.com/one', 'http://example.com/two?a=1&b=2']:
+        for mediatype in RDF_MEDIATYPES:
+            r = Renderer(
+                make_request(b'_profile=alt', {'Accept': mediatype}),
+                instance_uri,
+                profiles,
+                'sdo'
+            )
+            response = r.render()
+            assert response.headers['Content-Type'].startswith(mediatype)
+            actual = Graph().parse(data=response.body, format=mediatype)
+            expected = r._generate_alt_profiles_rdf()
+            assert isomorphic(actual, expected), \
+                'The cached {} Alternates profile for {} is not as generated'.format(mediatype, instance_uri)
+
+
+def test_alt_profile_json():
+    r = Renderer(make_request(b'_profile=alt&_mediatype=application/json'), 'http://example.com/"one"', profiles, 'sdo')
+    expected = {'uri': 'http://example.com/"one"', 'profiles': ['sdo', 'alt'], 'default_profile': 'sdo'}
+    actual = json.loads(r.render().body)
+    assert actual == expected, 'Got {}, expected {}'.format(actual, expected)
+
+
+def test_alt_cache_per_class():
+    def serialize_turtle(graph):
+        return b'# custom\n' + graph.serialize(format='turtle', encoding='utf-8')
+
+    class CustomSerializerRenderer(Renderer):
+        serializers = dict(Renderer.serializers, **{'text/turtle': serialize_turtle})
+
+    class CustomJsonRenderer(Renderer):
+        def _get_alt_profile_json(self, instance_uri):
+            return dict(super()._get_alt_profile_json(instance_uri), path=self.request.url.path)
+
+    # rendered by Renderer first, so that the cache holds its representations
+    for cls in (Renderer, CustomSerializerRenderer):
+        body = cls(make_request(b'_profile=alt', {'Accept': 'text/turtle'}), 'http://example.com/one', profiles,
+                   'sdo').render().body
+        assert body.startswith(b'# custom') == (cls is CustomSerializerRenderer)
+
+    for cls in (Renderer, CustomJsonRenderer):
+        r = cls(make_request(b'_profile=alt&_mediatype=application/json'), 'http://example.com/one', profiles, 'sdo')
+        assert ('path' in json.loads(r.render().body)) == (cls is CustomJsonRenderer)
+
+
+def test_alt_profile_html():
+    loader = templates.env.loader
+    templates.env.loader = FileSystemLoader(os.path.join(os.path.dirname(pyldapi.__file__), 'templates'))
+    try:
+        for instance_uri in ['http://example.com/one', 'http://example.com/two?a=1&b=2']:
+            request = make_request(b'_profile=alt')
+            r = Renderer(request, instance_uri, profiles, 'sdo')
+            actual = r.render().body.decode('utf-8')
+            expected = templates.get_template('alt.html').render(
+                r._get_alt_template_context(instance_uri, request)
+            )
+            assert actual == expected, 'The pre-rendered Alternates profile for {} is not as rendered'.format(
+                instance_uri
+            )
+    finally:
+        templates.env.loader = loader
+
+
+def test_alt_profile_html_not_prerenderable():
+    loader = templates.env.loader
+    try:
+        for source, prerendered in (
+            ('<a href="{{ request.base_url }}x">{{ uri }}</a>', True),
+            ('<a href="{{ request.base_url.path }}x">{{ uri }}</a>', False),
+            ('<a href="x">{{ uri|urlencode }}</a>', False),
+            ('<a href="x">{{ uri|upper }}</a>', False),
+        ):
+            templates.env.loader = DictLoader({'alt.html': source})
+            templates.env.cache.clear()
+            Renderer.alt_cache.clear()
+            request = make_request(b'_profile=alt')
+            r = Renderer(request, 'http://example.com/one', profiles, 'sdo')
+            assert (r._prerender_alt_profile_html() is not False) == prerendered, source
+            # the sync fallback needs Starlette's TemplateResponse, so the async one is checked
+            actual = asyncio.run(r.arender()).body.decode('utf-8')
+            expected = templates.get_template('alt.html').render(r._get_alt_template_context(r.instance_uri, request))
+            assert actual == expected
+            assert 'pyldapi' not in actual
+    finally:
+        templates.env.loader = loader
+        templates.env.cache.clear()
+        Renderer.alt_cache.clear()
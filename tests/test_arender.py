@@ -0,0 +1,94 @@
+import asyncio
+import os
+
+from jinja2 import FileSystemLoader
+from rdflib import Graph
+
+import pyldapi
+from pyldapi import Renderer, ContainerRenderer, Profile
+from pyldapi.renderer import templates
+from pyldapi.renderer_container import templates as container_templates
+from pyldapi.data import RDF_MEDIATYPES
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'sdo': Profile(
+        'https://schema.org',
+        'schema.org',
+        'Schema.org is a collaborative, community activity',
+        RDF_MEDIATYPES,
+        'text/turtle'
+    )
+}
+
+
+class AsyncContainerRenderer(ContainerRenderer):
+    # a container whose members are only known to an async data source
+    items = ['http://example.com/item/{}'.format(i) for i in range(25)]
+
+    def __init__(self, request):
+        self.loaded = []
+        super().__init__(request, 'http://example.com/items', 'Items', 'Some items', None, None, None, None,
+                         lazy=True)
+
+    async def _aload_members_total_count(self):
+        await asyncio.sleep(0)
+        self.loaded.append('count')
+        return len(self.items)
+
+    async def _aload_members(self, offset, limit):
+        await asyncio.sleep(0)
+        self.loaded.append((offset, limit))
+        return [(uri, 'Item {}'.format(uri.rsplit('/', 1)[1])) for uri in self.items[offset:offset + limit]]
+
+
+def package_templates(test):
+    def with_package_templates():
+        loaders = [t.env.loader for t in (templates, container_templates)]
+        for t in (templates, container_templates):
+            t.env.loader = FileSystemLoader(os.path.join(os.path.dirname(pyldapi.__file__), 'templates'))
+        try:
+            test()
+        finally:
+            for t, loader in zip((templates, container_templates), loaders):
+                t.env.loader = loader
+    with_package_templates.__name__ = test.__name__
+    return with_package_templates
+
+
+@package_templates
+def test_arender_alt_profile_html():
+    request = make_request(b'_profile=alt')
+    r = Renderer(request, 'http://example.com/one', profiles, 'sdo')
+    context = dict(r._get_alt_template_context('http://example.com/one', request), extra=1)
+    expected = templates.get_template('alt.html').render(context)
+    actual = asyncio.run(r.arender(additional_alt_template_context={'extra': 1})).body.decode('utf-8')
+    assert actual == expected, 'The async rendered Alternates profile differs from the sync one'
+
+
+@package_templates
+def test_arender_loads_members():
+    r = AsyncContainerRenderer(make_request(b'_profile=mem&page=2&per_page=10'))
+    response = asyncio.run(r.arender())
+    assert r.loaded == ['count', (10, 10)], 'Loaded {}'.format(r.loaded)
+    html = response.body.decode('utf-8')
+    assert all(uri + '"' in html for uri in AsyncContainerRenderer.items[10:20])
+    assert AsyncContainerRenderer.items[9] + '"' not in html
+    assert 'page=3>; rel="last"' in response.headers['Link']
+
+
+def test_arender_rdf():
+    r = AsyncContainerRenderer(make_request(b'_profile=mem&_mediatype=application/rdf+xml&per_page=5'))
+    response = asyncio.run(r.arender())
+    assert response.media_type == 'application/rdf+xml'
+    g = Graph().parse(data=response.body, format='xml')
+    assert len(g) == len(r._generate_mem_profile_rdf())
+
+
+def test_arender_other_profile_loads_no_members():
+    r = AsyncContainerRenderer(make_request(b'_profile=alt&_mediatype=application/json'))
+    response = asyncio.run(r.arender())
+    assert r.loaded == [], 'The Alternates profile loaded {}'.format(r.loaded)
+    assert response.media_type == 'application/json'
@@ -0,0 +1,97 @@
+
+from pyldapi import Renderer, Profile, LRUCache
+from pyldapi.data import RDF_MEDIATYPES
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'agor': Profile(
+        'http://linked.data.gov.au/def/agor',
+        'AGOR Profile',
+        'A profile of organisations according to the Australian Government Organisations Register',
+        ['text/html'] + RDF_MEDIATYPES,
+        'text/turtle'
+    ),
+}
+
+
+def test_lru_eviction():
+    c = LRUCache(maxsize=2)
+    c.put('a', 1)
+    c.put('b', 2)
+    assert c.get('a') == 1  # 'a' is now the most recently used
+    c.put('c', 3)
+    assert 'b' not in c
+    assert c.get('a') == 1 and c.get('c') == 3
+    assert c.get('b') is None
+    assert c.info() == {'hits': 3, 'misses': 1, 'maxsize': 2, 'currsize': 2}
+
+
+def test_lru_disabled():
+    c = LRUCache(maxsize=2, enabled=False)
+    c.put('a', 1)
+    assert c.get('a') is None
+    assert len(c) == 0
+
+
+def test_negotiation_cache():
+    cache = Renderer.negotiation_cache
+    cache.clear()
+    headers = {'Accept': 'application/rdf+xml', 'Accept-Language': 'en'}
+
+    r = Renderer(make_request(headers=headers), 'http://whocares.com', dict(profiles), 'agor')
+    assert (r.profile, r.mediatype, r.language) == ('agor', 'application/rdf+xml', 'en')
+    assert cache.misses == 1 and cache.hits == 0
+
+    r = Renderer(make_request(headers=headers), 'http://whocares.com/other', dict(profiles), 'agor')
+    assert (r.profile, r.mediatype, r.language) == ('agor', 'application/rdf+xml', 'en')
+    assert cache.hits == 1
+
+    # different QSA so a different decision
+    r = Renderer(make_request(b'_profile=alt', headers), 'http://whocares.com', dict(profiles), 'agor')
+    assert (r.profile, r.mediatype) == ('alt', 'application/rdf+xml')
+    assert cache.misses == 2
+
+
+def test_negotiation_cache_per_class():
+    class PathRenderer(Renderer):
+        # a profile chosen by the request's path, which the negotiation cache's key doesn't hold
+        def _get_profile(self):
+            return 'alt' if self.request.url.path == '/alt' else super()._get_profile()
+
+    class OtherRenderer(Renderer):
+        pass
+
+    cache = Renderer.negotiation_cache
+    cache.clear()
+
+    def make(cls, path):
+        return cls(make_request(path=path), 'http://whocares.com' + path, dict(profiles), 'agor')
+
+    for path, profile in (('/x', 'agor'), ('/alt', 'alt'), ('/x', 'agor'), ('/alt', 'alt')):
+        assert make(PathRenderer, path).profile == profile
+    assert len(cache) == 0, 'A Renderer overriding the negotiation methods used the negotiation cache'
+
+    assert make(Renderer, '/x').profile == 'agor'
+    assert make(OtherRenderer, '/x').profile == 'agor'
+    assert len(cache) == 2, 'Renderer classes share negotiation decisions'
+
+
+def test_negotiation_methods_overridden():
+    class ListRenderer(Renderer):
+        # Media Types requested by a list, as before Accept headers were parsed into an AcceptHeader
+        def _get_mediatypes_from_http(self):
+            return ['application/ld+json', 'text/turtle']
+
+    class AvailableRenderer(Renderer):
+        # only the agor profile, by URI, may be chosen
+        def _get_available_profiles(self):
+            return {'http://linked.data.gov.au/def/agor': 'agor'}
+
+    r = ListRenderer(make_request(headers={'Accept': 'text/html'}), 'http://whocares.com', dict(profiles), 'agor')
+    assert r.mediatype == 'application/ld+json'
+
+    assert Renderer(make_request(b'_profile=alt'), 'http://whocares.com', dict(profiles), 'agor').profile == 'alt'
+    r = AvailableRenderer(make_request(b'_profile=alt'), 'http://whocares.com', dict(profiles), 'agor')
+    assert r.profile == 'agor'
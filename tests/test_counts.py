@@ -0,0 +1,82 @@
+import asyncio
+
+from rdflib import Graph, Namespace
+
+from pyldapi import ApproximateCount, CachedCount
+
+from tests.conftest import make_request, make_container_renderer
+
+XHV = Namespace('https://www.w3.org/1999/xhtml/vocab#')
+ITEMS = ['http://example.com/item/{}'.format(i) for i in range(25)]
+
+
+def make_renderer(query_string, members_total_count, members=ITEMS):
+    return make_container_renderer(make_request(query_string, {'Accept': 'application/rdf+xml'}), members,
+                                   members_total_count)
+
+
+def test_cached_count():
+    calls = []
+
+    def count():
+        calls.append(1)
+        return len(ITEMS)
+
+    items_count = CachedCount(count, ttl=60)
+    for _ in range(3):
+        r = make_renderer(b'_profile=mem&per_page=10', items_count)
+        r.render()
+        assert r.last_page == 3
+    assert len(calls) == 1
+
+    # not needed for the Alternates profile
+    make_renderer(b'_profile=alt&_mediatype=application/json', items_count).render()
+    items_count.invalidate()
+    make_renderer(b'_profile=alt&_mediatype=application/json', items_count).render()
+    assert len(calls) == 1
+
+    make_renderer(b'_profile=mem&per_page=10', items_count).render()
+    assert len(calls) == 2
+
+    # the count expires
+    items_count = CachedCount(count, ttl=0)
+    make_renderer(b'_profile=mem', items_count).render()
+    make_renderer(b'_profile=mem', items_count).render()
+    assert len(calls) == 4
+
+
+def test_async_cached_count():
+    calls = []
+
+    async def count():
+        await asyncio.sleep(0)
+        calls.append(1)
+        return 7
+
+    items_count = CachedCount(count, ttl=60, exact=False)
+    for _ in range(2):
+        r = make_renderer(b'_profile=mem&per_page=10', items_count, None)
+        asyncio.run(r.arender())
+        assert r.members_total_count == 7 and isinstance(r.members_total_count, ApproximateCount)
+    assert len(calls) == 1
+
+
+def test_approximate_count():
+    # the estimate is too low, so the page after its last page is still given
+    r = make_renderer(b'_profile=mem&per_page=10&page=3', ApproximateCount(12), ITEMS[20:])
+    response = r.render()
+    assert response.status_code == 200
+    assert r.last_page == 2 and not r.last_page_exact
+    assert not r._get_mem_template_context()['last_page_exact']
+
+    assert 'rel="last"' not in response.headers['link']
+    assert 'rel="first"' in response.headers['link']
+    g = Graph().parse(data=response.body, format='xml')
+    assert (None, XHV.last, None) not in g
+    assert (None, XHV.first, None) in g
+    assert (None, XHV.prev, None) in g
+
+    # an exact count gives the last page
+    response = make_renderer(b'_profile=mem&per_page=10&page=2', 25, ITEMS[10:20]).render()
+    assert 'rel="last"' in response.headers['link']
+    assert (None, XHV.last, None) in Graph().parse(data=response.body, format='xml')
@@ -0,0 +1,86 @@
+import asyncio
+import re
+from urllib.parse import urlsplit
+
+import pytest
+from rdflib import Graph, Namespace
+
+from pyldapi import SortedMemberSource, PagingError
+from pyldapi.members import encode_cursor
+
+from tests.conftest import make_request, make_container_renderer, members_of
+
+XHV = Namespace('https://www.w3.org/1999/xhtml/vocab#')
+ITEMS = [('http://example.com/item/{:02d}'.format(i), 'Item {}'.format(i)) for i in range(25)]
+
+
+class Page:
+    def __init__(self, query_string, members=None, asynchronous=False):
+        r = make_container_renderer(
+            make_request(query_string, {'Accept': 'application/rdf+xml'}),
+            SortedMemberSource(ITEMS) if members is None else members,
+            cursor_paging=True
+        )
+        self.response = asyncio.run(r.arender()) if asynchronous else r.render()
+        links = re.findall(r'<([^>]*)>; rel="(first|prev|next|last)"', self.response.headers['link'])
+        self.links = {rel: uri for uri, rel in links}
+        g = Graph().parse(data=self.response.body, format='xml')
+        self.members = members_of(self.response)
+        self.rdf_links = {
+            str(p).rsplit('#', 1)[1]: str(o) for s, p, o in g if str(p).startswith(str(XHV))
+        }
+
+    def follow(self, rel, **kwargs):
+        return Page(urlsplit(self.links[rel]).query.encode(), **kwargs)
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_cursor_paging(asynchronous):
+    first = Page(b'_profile=mem&per_page=10', asynchronous=asynchronous)
+    assert first.members == [uri for uri, label in ITEMS[:10]]
+    assert set(first.links) == {'first', 'next', 'last'}
+    assert first.links == first.rdf_links, 'The RDF links to other pages differ from the Link header'
+    assert '&page=' not in first.links['next'] and '_profile=mem&per_page=10&cursor=' in first.links['next']
+
+    second = first.follow('next', asynchronous=asynchronous)
+    assert second.members == [uri for uri, label in ITEMS[10:20]]
+    assert set(second.links) == {'first', 'prev', 'next', 'last'}
+    assert second.links == second.rdf_links
+
+    third = second.follow('next', asynchronous=asynchronous)
+    assert third.members == [uri for uri, label in ITEMS[20:]]
+    assert set(third.links) == {'first', 'prev', 'last'}
+
+    # going back
+    assert third.follow('prev').members == second.members
+    assert second.follow('prev').members == first.members
+    assert set(second.follow('prev').links) == {'first', 'next', 'last'}
+
+    # the last page is the last per_page members
+    last = first.follow('last')
+    assert last.members == [uri for uri, label in ITEMS[15:]]
+    assert set(last.links) == {'first', 'prev', 'last'}
+    assert last.follow('prev').members == [uri for uri, label in ITEMS[5:15]]
+
+
+def test_cursor_paging_errors():
+    r = make_container_renderer(make_request(b'_profile=mem&cursor=nonsense'), SortedMemberSource(ITEMS),
+                                cursor_paging=True)
+    assert r.render().status_code == 400
+
+    # a made-up cursor whose key can't be compared with the members' keys
+    for key in (5, [1], {'a': 1}):
+        query_string = '_profile=mem&cursor={}'.format(encode_cursor(key)).encode()
+        r = make_container_renderer(make_request(query_string), SortedMemberSource(ITEMS), cursor_paging=True)
+        assert r.render().status_code == 400
+
+    # keys of other types are checked against them
+    source = SortedMemberSource(list(range(25)), key=lambda m: m)
+    assert source.key_types == (int,)
+    r = make_container_renderer(make_request('_profile=mem&cursor={}'.format(encode_cursor('a')).encode(),
+                                             {'Accept': 'application/rdf+xml'}),
+                                source, cursor_paging=True)
+    assert r.render().status_code == 400
+
+    with pytest.raises(PagingError):
+        make_container_renderer(make_request(b'_profile=mem'), ITEMS, 25, cursor_paging=True)
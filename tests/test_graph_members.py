@@ -0,0 +1,110 @@
+import asyncio
+import re
+from urllib.parse import urlsplit
+
+from rdflib import Graph, URIRef, BNode, Literal, RDFS, DCTERMS
+
+from pyldapi import GraphMemberSource
+
+from tests.conftest import make_request, make_container_renderer, CONTAINER
+
+ITEMS = ['http://example.com/item/{:02d}'.format(i) for i in range(25)]
+
+
+def make_graph(predicate=RDFS.member, inverse=False):
+    g = Graph()
+    # added out of order, to be sorted
+    for uri in reversed(ITEMS):
+        if inverse:
+            g.add((URIRef(uri), predicate, URIRef(CONTAINER)))
+        else:
+            g.add((URIRef(CONTAINER), predicate, URIRef(uri)))
+        if uri != ITEMS[3]:
+            g.add((URIRef(uri), RDFS.label, Literal('Item ' + uri[-2:], lang='en')))
+    g.add((URIRef(CONTAINER), RDFS.member, BNode()))
+    g.add((URIRef(CONTAINER), RDFS.member, Literal('not a member')))
+    return g
+
+
+def render(source, query_string, asynchronous=False, **kwargs):
+    r = make_container_renderer(make_request(query_string, {'Accept': 'application/rdf+xml'}), source, **kwargs)
+    response = asyncio.run(r.arender()) if asynchronous else r.render()
+    return response, Graph().parse(data=response.body, format='xml')
+
+
+def test_graph_member_source():
+    source = GraphMemberSource(make_graph(), CONTAINER)
+    assert source.count() == 25
+    page = source.fetch(0, 5)
+    assert page.uris == ITEMS[:5]
+    assert page.labels[2] == Literal('Item 02', lang='en')
+    assert page.labels[3] is None
+    assert [uri for uri, label in source.seek(ITEMS[10], 3, forward=False)] == ITEMS[9:6:-1]
+
+    # pages are slices of one index, until the graph changes
+    index = source.index()
+    source.fetch(10, 5)
+    assert source.index() is index
+    source.graph.add((URIRef(CONTAINER), RDFS.member, URIRef('http://example.com/item/00a')))
+    assert source.index() is not index and source.count() == 26
+    assert source.fetch(0, 2).uris == [ITEMS[0], 'http://example.com/item/00a']
+
+    source = GraphMemberSource(make_graph(DCTERMS.isPartOf, inverse=True), CONTAINER, DCTERMS.isPartOf, inverse=True,
+                               label_predicate=None)
+    assert source.fetch(20, 10).uris == ITEMS[20:]
+    assert source.fetch(20, 10).labels == [None] * 5
+
+
+def test_graph_member_source_version():
+    version = [0]
+    source = GraphMemberSource(make_graph(), CONTAINER, version=lambda: version[0])
+    index = source.index()
+    # replacing a member doesn't change the number of triples, so isn't seen without a version or invalidate()
+    source.graph.remove((URIRef(CONTAINER), RDFS.member, URIRef(ITEMS[0])))
+    source.graph.add((URIRef(CONTAINER), RDFS.member, URIRef('http://example.com/item/99')))
+    assert source.index() is index
+    version[0] += 1
+    assert source.index()[-1] == 'http://example.com/item/99'
+
+    index = source.index()
+    source.invalidate()
+    assert source.index() is not index and source.index() == index
+
+    # labels are kept along with the index, rather than looked up for each page
+    assert source.fetch(1, 1).labels == [Literal('Item 02', lang='en')]
+    source.graph.remove((URIRef(ITEMS[2]), RDFS.label, None))
+    assert source.fetch(1, 1).labels == [Literal('Item 02', lang='en')]
+    version[0] += 1
+    assert source.fetch(1, 1).labels == [None]
+
+
+def test_graph_member_source_label_language():
+    g = make_graph()
+    g.add((URIRef(ITEMS[3]), RDFS.label, Literal('Objet 03', lang='fr')))
+    g.add((URIRef(ITEMS[3]), RDFS.label, Literal('Item 03')))
+    g.add((URIRef(ITEMS[3]), RDFS.label, Literal('Ding 03', lang='de')))
+    assert GraphMemberSource(g, CONTAINER).fetch(3, 1).labels == [Literal('Item 03')]
+    assert GraphMemberSource(g, CONTAINER, language='FR').fetch(3, 1).labels == [Literal('Objet 03', lang='fr')]
+    assert GraphMemberSource(g, CONTAINER, language='es').fetch(2, 2).labels == [
+        Literal('Item 02', lang='en'), Literal('Item 03')]
+
+
+def test_graph_container():
+    source = GraphMemberSource(make_graph(), CONTAINER)
+    response, g = render(source, b'_profile=mem&per_page=10&page=3')
+    assert sorted(str(m) for m in g.objects(URIRef(CONTAINER), RDFS.member)) == ITEMS[20:]
+    assert (URIRef(ITEMS[21]), RDFS.label, Literal('Item 21', lang='en')) in g
+    assert 'page=3>; rel="last"' in response.headers['link']
+
+    # cursor paging through the same source
+    seen = []
+    query_string = b'_profile=mem&per_page=10'
+    while query_string is not None:
+        response, g = render(source, query_string, cursor_paging=True)
+        seen.extend(sorted(str(m) for m in g.objects(URIRef(CONTAINER), RDFS.member)))
+        links = dict((rel, uri) for uri, rel in re.findall(r'<([^>]*)>; rel="(next)"', response.headers['link']))
+        query_string = urlsplit(links['next']).query.encode() if 'next' in links else None
+    assert seen == ITEMS
+
+    response, g = render(source, b'_profile=mem&per_page=10&page=2', asynchronous=True)
+    assert sorted(str(m) for m in g.objects(URIRef(CONTAINER), RDFS.member)) == ITEMS[10:20]
@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+from fastapi.responses import StreamingResponse
+
+from pyldapi import ContainerRenderer
+from pyldapi.json_encoding import dumps, iter_json_object, set_json_encoder, _dumps_stdlib
+
+from tests.conftest import make_request, read_body
+
+
+members = [('http://example.com/{}'.format(i), 'Ünïcödé "{}"'.format(i)) for i in range(25)]
+
+
+def test_encoders_agree():
+    obj = {'uri': 'http://example.com/', 'register_items': members, 'n': None}
+    assert isinstance(dumps(obj), bytes)
+    assert json.loads(dumps(obj)) == json.loads(_dumps_stdlib(obj)) == json.loads(json.dumps(obj))
+
+
+def test_set_json_encoder():
+    set_json_encoder(lambda obj: b'"custom"')
+    try:
+        assert dumps({}) == b'"custom"'
+    finally:
+        set_json_encoder()
+    assert dumps({}) == b'{}'
+
+
+def test_iter_json_object():
+    for chunk_items in (1, 10, 1000):
+        chunks = list(iter_json_object({'uri': 'http://example.com/'}, 'items', iter(members), chunk_items))
+        assert json.loads(b''.join(chunks)) == {'uri': 'http://example.com/', 'items': json.loads(dumps(members))}
+    assert json.loads(b''.join(iter_json_object({}, 'items', []))) == {'items': []}
+
+
+def test_mem_profile_json():
+    class StreamingContainerRenderer(ContainerRenderer):
+        mem_json_streaming_threshold = 10
+
+    bodies = []
+    for cls in (ContainerRenderer, StreamingContainerRenderer):
+        r = cls(make_request(), 'http://example.com/c', 'C', 'A C', None, None, members, len(members))
+        r.mediatype = 'application/json'
+        response = r._render_mem_profile_json()
+        assert isinstance(response, StreamingResponse) == (cls is StreamingContainerRenderer)
+        assert response.media_type == 'application/json'
+        bodies.append(asyncio.run(read_body(response)))
+    assert json.loads(bodies[0]) == json.loads(bodies[1])
+    assert [m[0] for m in json.loads(bodies[0])['register_items']] == [m[0] for m in members]
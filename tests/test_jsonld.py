@@ -0,0 +1,75 @@
+import asyncio
+
+from fastapi.responses import StreamingResponse
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from pyldapi import ContainerRenderer, Renderer, Profile, ListMemberSource
+from pyldapi.data import RDF_MEDIATYPES
+from pyldapi.jsonld import alt_profiles_jsonld
+from pyldapi.json_encoding import dumps
+
+from tests.conftest import make_request, read_body
+
+
+members = [
+    'http://example.com/plain',
+    ('http://example.com/tuple', 'A "quoted" label'),
+    {'uri': 'http://example.com/dict', 'title': 'Ünïcödé'},
+    ('http://example.com/integer', 42),
+    ('http://example.com/double', 3.5),
+    ('http://example.com/boolean', True),
+]
+
+
+def test_mem_profile_jsonld():
+    class StreamingContainerRenderer(ContainerRenderer):
+        mem_json_streaming_threshold = 2
+
+    for cls in (ContainerRenderer, StreamingContainerRenderer):
+        r = cls(
+            make_request(b'_profile=mem&page=2&per_page=6', {'Accept': 'application/ld+json'}),
+            'http://example.com/container',
+            'A Container',
+            'A test Container',
+            'http://example.com/parent',
+            'The Parent',
+            members,
+            20,
+        )
+        response = r.render()
+        assert isinstance(response, StreamingResponse) == (cls is StreamingContainerRenderer)
+        assert response.media_type == 'application/ld+json'
+        written = Graph().parse(data=asyncio.run(read_body(response)), format='json-ld')
+        expected = r._generate_mem_profile_rdf()
+        assert isomorphic(written, expected), 'The JSON-LD written by {} differs from the graph'.format(cls.__name__)
+
+
+def test_alt_profile_jsonld():
+    profiles = {
+        'sdo': Profile('https://schema.org', 'schema.org', 'Schema.org', RDF_MEDIATYPES + ['_internal'], 'text/turtle')
+    }
+    r = Renderer(make_request(b'_profile=alt'), 'http://example.com/thing', profiles, 'sdo')
+    written = Graph().parse(
+        data=dumps(alt_profiles_jsonld(r.profiles, r.default_profile_token, r.instance_uri)),
+        format='json-ld'
+    )
+    assert isomorphic(written, r._generate_alt_profiles_rdf())
+
+
+def test_mem_profile_jsonld_source():
+    class StreamingContainerRenderer(ContainerRenderer):
+        mem_json_streaming_threshold = 3
+
+    class IteratingMemberSource(ListMemberSource):
+        # pages of any iterable, which are only counted once read into the member table
+        def fetch(self, offset, limit):
+            return iter(super().fetch(offset, limit))
+
+    source = IteratingMemberSource(['http://example.com/item/{}'.format(i) for i in range(10)])
+    for per_page, streamed in ((2, False), (5, True)):
+        r = StreamingContainerRenderer(
+            make_request('_profile=mem&per_page={}'.format(per_page).encode(), {'Accept': 'application/ld+json'}),
+            'http://example.com/container', 'A Container', 'A test Container', None, None, source, None
+        )
+        assert isinstance(r.render(), StreamingResponse) == streamed
@@ -0,0 +1,78 @@
+
+from pyldapi import Renderer, ContainerRenderer, Profile
+from pyldapi.data import RDF_MEDIATYPES
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'agor': Profile(
+        'http://linked.data.gov.au/def/agor',
+        'AGOR Profile',
+        'A profile of organisations according to the Australian Government Organisations Register',
+        ['text/html'] + RDF_MEDIATYPES,
+        'text/turtle',
+        languages=['en', 'pl'],
+    ),
+}
+
+
+class RecordingRenderer(Renderer):
+    negotiation_cache = None
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        super().__init__(*args, **kwargs)
+
+    def _get_profile(self):
+        self.calls.append('profile')
+        return super()._get_profile()
+
+    def _get_mediatype(self):
+        self.calls.append('mediatype')
+        return super()._get_mediatype()
+
+    def _get_language(self):
+        self.calls.append('language')
+        return super()._get_language()
+
+    def _get_link_header_template(self):
+        self.calls.append('link')
+        return super()._get_link_header_template()
+
+
+def test_lazy_resolves_nothing_until_used():
+    r = RecordingRenderer(make_request(headers={'Accept': 'text/turtle'}), 'http://whocares.com', profiles, 'agor',
+                         lazy=True)
+    assert r.calls == [], 'A lazy Renderer negotiated in its constructor: {}'.format(r.calls)
+
+    assert r.mediatype == 'text/turtle'
+    assert r.calls == ['profile', 'mediatype']
+    assert r.profile == 'agor'
+    assert r.calls == ['profile', 'mediatype']
+
+    assert r.headers['Content-Language'] == 'en'
+    assert r.calls == ['profile', 'mediatype', 'link', 'language']
+    r.headers
+    assert r.calls == ['profile', 'mediatype', 'link', 'language'], 'The headers were made more than once'
+
+
+def test_lazy_matches_eager():
+    request = make_request(
+        query_string=b'_lang=pl',
+        headers={'Accept': 'application/rdf+xml', 'Accept-Profile': '<http://linked.data.gov.au/def/agor>'}
+    )
+    eager = Renderer(request, 'http://whocares.com', profiles, 'agor')
+    lazy = Renderer(request, 'http://whocares.com', profiles, 'agor', lazy=True)
+    assert (lazy.profile, lazy.mediatype, lazy.language) == (eager.profile, eager.mediatype, eager.language)
+    assert lazy.headers == eager.headers
+
+
+def test_lazy_container_paging_links():
+    request = make_request(query_string=b'page=2&per_page=10')
+    args = ('http://whocares.com', 'A Container', 'A test Container', None, None, ['http://a.com'], 35)
+    eager = ContainerRenderer(request, *args)
+    lazy = ContainerRenderer(request, *args, lazy=True)
+    assert lazy._headers is None
+    assert lazy.headers['Link'] == eager.headers['Link']
+    assert 'rel="next"' in lazy.headers['Link']
@@ -0,0 +1,38 @@
+from pyldapi import Renderer, Profile
+from pyldapi.links import LinkHeaderTemplate
+
+from tests.conftest import make_request
+
+
+def test_render():
+    t = LinkHeaderTemplate.from_links(
+        '<http://www.w3.org/ns/ldp#Resource>; rel="type"',
+        ('<', '?_profile=alt>; rel="alternate"'),
+    )
+    expected = '<http://www.w3.org/ns/ldp#Resource>; rel="type", <http://example.com?_profile=alt>; rel="alternate"'
+    actual = t.render('http://example.com')
+    assert actual == expected, 'Got {}, expected {}'.format(actual, expected)
+
+
+def test_extend():
+    t = LinkHeaderTemplate.from_links(('<', '>; rel="self"'))
+    t2 = t.extend(('<', '?page=1>; rel="first"'), ('<', '?page=2>; rel="next"'))
+    assert t.render('http://x.com') == '<http://x.com>; rel="self"'
+    expected = '<http://x.com>; rel="self", <http://x.com?page=1>; rel="first", <http://x.com?page=2>; rel="next"'
+    actual = t2.render('http://x.com')
+    assert actual == expected, 'Got {}, expected {}'.format(actual, expected)
+
+
+def test_overridden_profile_links():
+    class TokenlessRenderer(Renderer):
+        def _make_header_link_tokens(self):
+            return '<http://www.w3.org/ns/dx/prof/Profile>; rel="type"'
+
+    profiles = {'sdo': Profile('https://schema.org', 'S', 'C', ['text/turtle'], 'text/turtle')}
+    r = Renderer(make_request(), 'http://example.com/x', dict(profiles), 'sdo')
+    assert 'token="sdo"' in r.headers['Link']
+
+    link = TokenlessRenderer(make_request(), 'http://example.com/x', dict(profiles), 'sdo').headers['Link']
+    assert 'token="sdo"' not in link
+    assert '<http://www.w3.org/ns/dx/prof/Profile>; rel="type", ' in link
+    assert link.endswith(', ' + r._make_header_link_list_profiles()), link
@@ -0,0 +1,75 @@
+import os
+
+from jinja2 import FileSystemLoader
+from rdflib import Graph, Literal, URIRef, RDF, RDFS
+
+import pyldapi
+from pyldapi import ContainerRenderer, MemberTable
+from pyldapi.renderer_container import templates
+
+from tests.conftest import make_request
+
+members = [
+    'http://example.com/plain',
+    ('http://example.com/pair', 'A pair'),
+    ('http://example.com/triple', 'http://example.com/Class', 'A triple'),
+    {'uri': 'http://example.com/dict', 'title': 'A dict'},
+]
+
+
+def test_member_table():
+    table = MemberTable.from_members(members)
+    assert table.uris == [
+        'http://example.com/plain', 'http://example.com/pair', 'http://example.com/triple', 'http://example.com/dict'
+    ]
+    assert table.labels == [None, 'A pair', 'A triple', 'A dict']
+    assert table.classes == [None, None, 'http://example.com/Class', None]
+    assert len(table) == 4
+    assert list(table) == members, 'The members aren\'t given back in the forms they were given in'
+    assert table[2] == members[2]
+
+    page = table[1:3]
+    assert isinstance(page, MemberTable)
+    assert list(page) == members[1:3]
+    assert list(page.rows()) == [
+        ('http://example.com/pair', 'A pair', None),
+        ('http://example.com/triple', 'A triple', 'http://example.com/Class'),
+    ]
+
+    # without classes
+    table = MemberTable.from_members(members[:2])
+    assert table.classes is None
+    assert list(table[1:].rows()) == [('http://example.com/pair', 'A pair', None)]
+    assert list(MemberTable(['http://example.com/a'], ['A'])) == [('http://example.com/a', 'A')]
+
+
+def test_container_member_table():
+    for given in (members, MemberTable.from_members(members)):
+        r = ContainerRenderer(make_request(b'_profile=mem', {'Accept': 'application/rdf+xml'}),
+                              'http://example.com/items', 'Items', 'Some items', None, None, given, len(members))
+        assert r.member_source is None
+        g = Graph().parse(data=r.render().body, format='xml')
+        container = URIRef('http://example.com/items')
+        assert set(g.objects(container, RDFS.member)) == {URIRef(m) for m in MemberTable.from_members(members).uris}
+        triple = URIRef('http://example.com/triple')
+        assert (triple, RDFS.label, Literal('A triple')) in g
+        assert (triple, RDF.type, URIRef('http://example.com/Class')) in g
+        assert (URIRef('http://example.com/dict'), RDFS.label, Literal('A dict')) in g
+
+
+def test_mem_html_labels():
+    loader = templates.env.loader
+    templates.env.loader = FileSystemLoader(os.path.join(os.path.dirname(pyldapi.__file__), 'templates'))
+    try:
+        r = ContainerRenderer(make_request(b'_profile=mem'), 'http://example.com/items', 'Items', 'Some items', None,
+                              None, members, len(members))
+        html = templates.get_template('mem.html').render(r._get_mem_template_context())
+    finally:
+        templates.env.loader = loader
+    for uri, label in (
+        ('http://example.com/plain', 'http://example.com/plain'),
+        ('http://example.com/pair', 'A pair'),
+        ('http://example.com/triple', 'A triple'),
+        ('http://example.com/dict', 'A dict'),
+    ):
+        assert '<a href="{}">{}</a>'.format(uri, label) in html
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from pyldapi import ContainerRenderer, MemberSource, AsyncMemberSource, CallableMemberSource, IteratorMemberSource, \
+    KeysetMemberSource, ResponseCache, MemberTable
+
+from tests.conftest import make_request, make_container_renderer, members_of
+
+ITEMS = ['http://example.com/item/{}'.format(i) for i in range(25)]
+
+
+def recording_source(calls):
+    def fetch(offset, limit):
+        calls.append((offset, limit))
+        return ITEMS[offset:offset + limit]
+
+    def count():
+        calls.append('count')
+        return len(ITEMS)
+    return CallableMemberSource(fetch, count)
+
+
+def test_member_source_fetches_page():
+    calls = []
+    r = make_container_renderer(
+        make_request(b'_profile=mem&page=2&per_page=10', {'Accept': 'application/rdf+xml'}),
+        recording_source(calls)
+    )
+    assert calls == [], 'The member source was called before rendering'
+    response = r.render()
+    assert calls == ['count', (10, 10)]
+    assert members_of(response) == sorted(ITEMS[10:20])
+    assert r.last_page == 3
+
+
+def test_member_source_not_called():
+    # the Alternates profile doesn't need the members
+    calls = []
+    make_container_renderer(make_request(b'_profile=alt&_mediatype=application/json'), recording_source(calls)).render()
+    assert calls == []
+
+    # nor does a page that doesn't exist, with the count given
+    calls = []
+    r = make_container_renderer(make_request(b'_profile=mem&page=9'), recording_source(calls), len(ITEMS))
+    response = r.render()
+    assert response.status_code == 400
+    assert calls == []
+
+    # nor does a HEAD request
+    calls = []
+    response = make_container_renderer(
+        make_request(b'_profile=mem', {'Accept': 'text/turtle'}, method='HEAD'),
+        recording_source(calls)
+    ).render()
+    assert calls == ['count']
+    assert response.headers['content-type'] == 'text/turtle'
+    assert 'content-length' not in response.headers
+    assert 'rel="last"' in response.headers['link']
+
+
+def test_generator_members():
+    consumed = []
+
+    def generate():
+        for item in ITEMS:
+            consumed.append(item)
+            yield item
+
+    response = make_container_renderer(
+        make_request(b'_profile=mem&per_page=10', {'Accept': 'application/rdf+xml'}),
+        IteratorMemberSource(generate(), len(ITEMS)),
+        len(ITEMS)
+    ).render()
+    assert members_of(response) == sorted(ITEMS[:10])
+    assert consumed == ITEMS[:10], 'More of the generator was consumed than the page'
+
+    # without the count, the generator is counted
+    response = make_container_renderer(
+        make_request(b'_profile=mem&page=3&per_page=10', {'Accept': 'application/rdf+xml'}),
+        IteratorMemberSource(item for item in ITEMS)
+    ).render()
+    assert members_of(response) == sorted(ITEMS[20:])
+
+    # a generator that isn't a member source is the page's members, as a list is
+    response = make_container_renderer(
+        make_request(b'_profile=mem&page=2&per_page=10', {'Accept': 'application/rdf+xml'}),
+        (item for item in ITEMS[10:20]),
+        len(ITEMS)
+    ).render()
+    assert members_of(response) == sorted(ITEMS[10:20])
+
+    # without the count, a generator that isn't a member source is paged, as IteratorMemberSource's are
+    response = make_container_renderer(
+        make_request(b'_profile=mem&page=3&per_page=10', {'Accept': 'application/rdf+xml'}),
+        (item for item in ITEMS)
+    ).render()
+    assert members_of(response) == sorted(ITEMS[20:])
+
+
+def test_abstract_member_sources():
+    class NoCount(MemberSource):
+        def fetch(self, offset, limit):
+            return ITEMS[offset:offset + limit]
+
+    for cls in (MemberSource, AsyncMemberSource, KeysetMemberSource, NoCount):
+        with pytest.raises(TypeError):
+            cls()
+
+
+def test_head_response_not_cached():
+    class CachedContainerRenderer(ContainerRenderer):
+        response_cache = ResponseCache()
+
+        def _get_members_fingerprint(self):
+            return 1
+
+    for method in ('HEAD', 'GET'):
+        r = CachedContainerRenderer(make_request(b'_profile=mem', {'Accept': 'application/rdf+xml'}, method=method),
+                                    'http://example.com/items', 'Items', 'Some items', None, None,
+                                    recording_source([]), None)
+        response = r.render_cached()
+        assert response.status_code == 200
+    assert len(CachedContainerRenderer.response_cache) == 1
+    assert members_of(response) == sorted(ITEMS)
+
+
+class AsyncItems(AsyncMemberSource):
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, offset, limit):
+        await asyncio.sleep(0)
+        self.calls.append((offset, limit))
+        return ITEMS[offset:offset + limit]
+
+    async def count(self):
+        await asyncio.sleep(0)
+        self.calls.append('count')
+        return len(ITEMS)
+
+
+def test_async_member_source():
+    source = AsyncItems()
+    r = make_container_renderer(
+        make_request(b'_profile=mem&page=3&per_page=10', {'Accept': 'application/rdf+xml'}), source)
+    assert members_of(asyncio.run(r.arender())) == sorted(ITEMS[20:])
+    assert source.calls == ['count', (20, 10)]
+
+    source = AsyncItems()
+    asyncio.run(make_container_renderer(make_request(b'_profile=alt&_mediatype=application/json'), source).arender())
+    assert source.calls == []
+
+    r = make_container_renderer(make_request(b'_profile=mem', {'Accept': 'application/rdf+xml'}), AsyncItems())
+    with pytest.raises(TypeError):
+        r.render()
+
+
+def test_list_members_without_count():
+    # without a count, the list is the whole register, so is paged
+    for members in (ITEMS, MemberTable.from_members(ITEMS)):
+        r = make_container_renderer(
+            make_request(b'_profile=mem&page=2&per_page=10', {'Accept': 'application/rdf+xml'}), members)
+        assert members_of(r.render()) == sorted(ITEMS[10:20])
+        assert r.last_page == 3
+        r = make_container_renderer(
+            make_request(b'_profile=mem&page=3&per_page=10', {'Accept': 'application/rdf+xml'}), members)
+        assert members_of(asyncio.run(r.arender())) == sorted(ITEMS[20:])
+
+    # with a count, it is the page
+    r = make_container_renderer(make_request(b'_profile=mem&page=2&per_page=10', {'Accept': 'application/rdf+xml'}),
+                      ITEMS[10:20], len(ITEMS))
+    assert members_of(r.render()) == sorted(ITEMS[10:20])
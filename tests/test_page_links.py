@@ -0,0 +1,56 @@
+import re
+from urllib.parse import urlsplit, parse_qsl
+
+from rdflib import Graph, Namespace
+
+from pyldapi import ContainerRenderer
+from pyldapi.links import PageLinks
+
+from tests.conftest import make_request
+
+XHV = Namespace('https://www.w3.org/1999/xhtml/vocab#')
+ITEMS = ['http://example.com/item/{}'.format(i) for i in range(25)]
+
+
+def test_page_links():
+    links = PageLinks.for_pages({'_profile': 'mem', 'q': 'a&b=c d+e'}, 10, 2, 1, 3, 3)
+    assert links.query == '_profile=mem&q=a%26b%3Dc%20d%2Be&per_page=10&page=2'
+    assert list(links.queries) == ['first', 'prev', 'next', 'last']
+    assert links.queries['prev'] == '_profile=mem&q=a%26b%3Dc%20d%2Be&per_page=10&page=1'
+
+    # without a previous page or a known last page
+    links = PageLinks.for_pages({}, 10, 1, next_page=2)
+    assert links.header_links() == [
+        ('<', '?per_page=10&page=1>; rel="first"'),
+        ('<', '?per_page=10&page=2>; rel="next"'),
+    ]
+    assert links.uris('http://example.com/items') == (
+        'http://example.com/items?per_page=10&page=1',
+        {'first': 'http://example.com/items?per_page=10&page=1', 'next': 'http://example.com/items?per_page=10&page=2'}
+    )
+
+
+def test_container_page_links():
+    # other QSAs with '&' and spaces in them, and a repeated one, are kept in every link
+    query_string = b'_profile=mem&filter=fish%20%26%20chips&tag=a&tag=b&page=2&per_page=10'
+    r = ContainerRenderer(make_request(query_string, {'Accept': 'application/rdf+xml'}), 'http://example.com/items',
+                          'Items', 'Some items', None, None, ITEMS[10:20], len(ITEMS))
+    response = r.render()
+
+    header_links = {
+        rel: uri for uri, rel in re.findall(r'<([^>]*)>; rel="(first|prev|next|last)"', response.headers['link'])
+    }
+    assert set(header_links) == {'first', 'prev', 'next', 'last'}
+    for rel, page in (('first', '1'), ('prev', '1'), ('next', '3'), ('last', '3')):
+        assert parse_qsl(urlsplit(header_links[rel]).query) == [
+            ('_profile', 'mem'), ('filter', 'fish & chips'), ('tag', 'a'), ('tag', 'b'), ('per_page', '10'),
+            ('page', page)
+        ], 'The {} link lost the request\'s other QSAs'.format(rel)
+
+    g = Graph().parse(data=response.body, format='xml')
+    rdf_links = {str(p).rsplit('#', 1)[1]: str(o) for p, o in g.predicate_objects() if str(p).startswith(str(XHV))}
+    assert rdf_links == header_links
+
+    context = r._get_mem_template_context()
+    assert context['page_links'] is r.page_links
+    assert context['prev_page'] == 1 and context['next_page'] == 3
@@ -0,0 +1,103 @@
+
+from pyldapi import Renderer, Profile, ProfileRegistry
+from pyldapi.data import RDF_MEDIATYPES
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'agor': Profile(
+        'http://linked.data.gov.au/def/agor',
+        'AGOR Profile',
+        'A profile of organisations according to the Australian Government Organisations Register',
+        ['text/html'] + RDF_MEDIATYPES,
+        'text/turtle'
+    ),
+    'fake': Profile(
+        'http://fake.com',
+        'Fake Profile',
+        'A fake Profile for testing',
+        ['text/xml'],
+        'text/xml'
+    ),
+}
+
+
+def test_indexes():
+    registry = ProfileRegistry(profiles)
+    assert list(registry) == ['agor', 'fake']
+    assert registry['fake'] is profiles['fake']
+    assert registry.token_for_uri('http://fake.com') == 'fake'
+    assert registry.token_for_uri('http://nothing.com') is None
+    assert registry.uris == {'http://linked.data.gov.au/def/agor': 'agor', 'http://fake.com': 'fake'}
+    assert registry.mediatypes('fake') == frozenset(['text/xml'])
+
+
+def test_immutable():
+    registry = ProfileRegistry(profiles)
+    try:
+        registry.foo = 'bar'
+    except AttributeError:
+        pass
+    else:
+        assert False, 'ProfileRegistry accepted an attribute assignment'
+    assert not hasattr(registry, '__setitem__')
+
+
+def test_compile_reuses_registry():
+    a = ProfileRegistry.compile(profiles)
+    b = ProfileRegistry.compile(dict(profiles))
+    assert a is b
+    assert a == ProfileRegistry(profiles)
+    assert hash(a) == hash(ProfileRegistry(profiles))
+
+
+def test_renderer_accepts_registry():
+    registry = ProfileRegistry(profiles)
+    r = Renderer(
+        make_request(headers={'Accept-Profile': '<http://nothing.com>; q=0.9, <http://fake.com>; q=0.2'}),
+        'http://whocares.com',
+        registry,
+        'agor'
+    )
+    assert r.profile == 'fake'
+    assert list(r.profiles) == ['agor', 'fake', 'alt']
+    assert 'alt' not in registry
+
+
+def test_profile_uri_in_qsa():
+    r = Renderer(
+        make_request(query_string=b'_profile=<http://fake.com>'),
+        'http://whocares.com',
+        ProfileRegistry(profiles),
+        'agor'
+    )
+    assert r.profile == 'fake'
+
+
+def test_profile_value_type():
+    a = Profile('http://fake.com', 'Fake Profile', 'A fake Profile for testing', ['text/xml', '_internal'], 'text/xml')
+    b = Profile('http://fake.com', 'Fake Profile', 'A fake Profile for testing', ('text/xml', '_internal'), 'text/xml')
+    assert a == b and hash(a) == hash(b)
+    assert a != profiles['fake']
+    assert a.mediatypes == ('text/xml', '_internal')
+    assert a.mediatype_set == frozenset(['text/xml', '_internal'])
+    assert a.public_mediatypes == ('text/xml',)
+    assert a.languages == ('en',)
+    assert not hasattr(a, '__dict__')
+    try:
+        a.label = 'Changed'
+    except AttributeError:
+        pass
+    else:
+        assert False, 'Profile accepted an attribute assignment'
+
+
+def test_profiles_not_mutated():
+    given = dict(profiles)
+    r = Renderer(make_request(), 'http://whocares.com', given, 'agor')
+    assert given == profiles
+    assert 'alt' in r.profiles
+    r2 = Renderer(make_request(), 'http://whocares.com', dict(profiles), 'agor')
+    assert r2.profiles is r.profiles
+    assert r.profiles['alt'] is r2.profiles['alt']
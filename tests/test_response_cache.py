@@ -0,0 +1,111 @@
+import gzip
+import time
+
+from fastapi import Response
+
+from pyldapi import Renderer, ContainerRenderer, Profile, ResponseCache
+from pyldapi.accept import select_encoding
+from pyldapi.data import RDF_MEDIATYPES
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'sdo': Profile(
+        'https://schema.org',
+        'schema.org',
+        'Schema.org is a collaborative, community activity',
+        RDF_MEDIATYPES,
+        'text/turtle'
+    )
+}
+
+
+class CountingRenderer(Renderer):
+    response_cache = ResponseCache()
+    renders = 0
+
+    def __init__(self, request, instance_uri='http://example.com/thing'):
+        super().__init__(request, instance_uri, profiles, 'sdo')
+
+    def _get_fingerprint(self):
+        return 1
+
+    def render(self):
+        CountingRenderer.renders += 1
+        response = super().render()
+        if response is None:
+            response = Response(('<{}> a <http://example.com/Thing> .\n'.format(self.instance_uri) * 100).encode(),
+                                media_type=self.mediatype, headers=self.headers)
+        return response
+
+
+def test_select_encoding():
+    assert select_encoding('gzip, deflate, br', ('br', 'gzip')) == 'br'
+    assert select_encoding('gzip;q=1.0, br;q=0.5', ('br', 'gzip')) == 'gzip'
+    assert select_encoding('*', ('br', 'gzip')) == 'br'
+    assert select_encoding('br;q=0, *;q=0.1', ('br', 'gzip')) == 'gzip'
+    assert select_encoding('identity', ('br', 'gzip')) is None
+
+
+def test_render_cached():
+    CountingRenderer.response_cache.clear()
+    CountingRenderer.renders = 0
+
+    plain = CountingRenderer(make_request()).render_cached()
+    assert CountingRenderer.renders == 1
+    assert 'content-encoding' not in plain.headers
+
+    zipped = CountingRenderer(make_request(headers={'Accept-Encoding': 'gzip, deflate'})).render_cached()
+    assert CountingRenderer.renders == 1, 'A cached response was rendered again'
+    assert zipped.headers['content-encoding'] == 'gzip'
+    assert zipped.headers['vary'] == 'Accept-Encoding'
+    assert gzip.decompress(zipped.body) == plain.body
+    assert zipped.headers['content-length'] == str(len(zipped.body))
+    # the compressed variant's bytes differ, so its strong ETag does too
+    assert zipped.headers['etag'] == plain.headers['etag'][:-1] + '-gzip"'
+
+    not_modified = CountingRenderer(make_request(headers={'If-None-Match': plain.headers['etag']})).render_cached()
+    assert not_modified.status_code == 304 and CountingRenderer.renders == 1
+    not_modified = CountingRenderer(make_request(headers={
+        'If-None-Match': zipped.headers['etag'], 'Accept-Encoding': 'gzip'
+    })).render_cached()
+    assert not_modified.status_code == 304 and not_modified.headers['etag'] == zipped.headers['etag']
+    # a client with the gzip variant asking for the body as it is doesn't have it
+    modified = CountingRenderer(make_request(headers={'If-None-Match': zipped.headers['etag']})).render_cached()
+    assert modified.status_code == 200 and modified.body == plain.body
+
+    # another representation is rendered & cached separately
+    CountingRenderer(make_request(headers={'Accept': 'application/n-triples'})).render_cached()
+    assert CountingRenderer.renders == 2
+
+    assert CountingRenderer.response_cache.invalidate('http://example.com/thing') == 2
+    CountingRenderer(make_request()).render_cached()
+    assert CountingRenderer.renders == 3
+
+
+def test_eviction_and_ttl():
+    cache = ResponseCache(max_bytes=2500, ttl=60, min_compress_size=10 ** 6)
+    for i in range(3):
+        cache.put(('http://example.com/{}'.format(i),), Response(b'x' * 1000))
+    assert ('http://example.com/0',) not in cache
+    assert cache.info()['currbytes'] == 2000
+    assert cache.put(('http://example.com/big',), Response(b'x' * 3000)) is None
+
+    cache.put(('http://example.com/short',), Response(b'x'), ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get(('http://example.com/short',)) is None
+
+
+def test_container_pages_cached_apart():
+    class CachedContainerRenderer(ContainerRenderer):
+        response_cache = ResponseCache()
+
+    members = ['http://example.com/{}'.format(i) for i in range(10)]
+    pages = []
+    for qs in (b'_profile=mem&_mediatype=application/rdf+xml&per_page=5',
+               b'_profile=mem&_mediatype=application/rdf+xml&per_page=5&page=2'):
+        r = CachedContainerRenderer(make_request(qs), 'http://example.com/c', 'C', 'A C', None, None, members, 10)
+        pages.append(r.render_cached().body)
+    assert pages[0] != pages[1]
+    assert len(CachedContainerRenderer.response_cache) == 2
@@ -0,0 +1,83 @@
+import asyncio
+
+from rdflib import Graph, Literal, URIRef, RDFS
+from rdflib.compare import isomorphic
+
+from pyldapi import Renderer, Profile, ResponseCache
+from pyldapi.responses import BytesResponse
+from pyldapi.serializers import serialize_ntriples
+from pyldapi.streaming import STREAM_CHUNK_LINES
+
+from tests.conftest import make_request
+
+
+async def send(response):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def record(message):
+        messages.append(message)
+
+    await response({'type': 'http'}, receive, record)
+    return messages
+
+
+def test_bytes_response():
+    body = 'Ünïcödé'.encode('utf-8')
+    response = BytesResponse(
+        body,
+        media_type='text/turtle',
+        headers={'Link': '<http://example.com/thing>; rel="self"'},
+        raw_headers=[(b'access-control-allow-origin', b'*')]
+    )
+    assert response.body is body, 'The body was copied'
+    assert response.raw_headers == [
+        (b'access-control-allow-origin', b'*'),
+        (b'link', b'<http://example.com/thing>; rel="self"'),
+        (b'content-length', str(len(body)).encode()),
+        (b'content-type', b'text/turtle; charset=utf-8'),
+    ]
+
+    start, sent = asyncio.run(send(response))
+    assert start['headers'] == response.raw_headers
+    assert sent['body'] is body
+
+    # a given Content-Type is kept as it is, and a 304 has no Content-Length
+    response = BytesResponse(status_code=304, headers={'Content-Type': 'text/html', 'ETag': '"x"'})
+    assert response.raw_headers == [(b'content-type', b'text/html'), (b'etag', b'"x"')]
+
+
+def test_ntriples_chunks():
+    g = Graph()
+    for i in range(STREAM_CHUNK_LINES * 2 + 1):
+        g.add((URIRef('http://example.com/{}'.format(i)), RDFS.label, Literal('Item {}'.format(i))))
+    assert isomorphic(Graph().parse(data=serialize_ntriples(g), format='nt'), g)
+
+
+def test_cached_response_headers():
+    profiles = {
+        'p': Profile('http://example.com/profile', 'P', 'A profile', ['text/turtle'], 'text/turtle'),
+    }
+
+    class CachedRenderer(Renderer):
+        response_cache = ResponseCache(min_compress_size=0)
+
+        def _get_fingerprint(self):
+            return 1
+
+        def render(self):
+            response = super().render()
+            if response is not None:
+                return response
+            g = Graph()
+            g.add((URIRef(self.instance_uri), RDFS.label, Literal('A thing')))
+            return self._make_rdf_response(g)
+
+    headers = {'Accept-Encoding': 'gzip'}
+    rendered = CachedRenderer(make_request(headers=headers), 'http://example.com/thing', profiles, 'p').render_cached()
+    cached = CachedRenderer(make_request(headers=headers), 'http://example.com/thing', profiles, 'p').render_cached()
+    assert cached.raw_headers == rendered.raw_headers
+    assert dict(cached.raw_headers)[b'content-encoding'] == b'gzip'
+    assert dict(cached.raw_headers)[b'content-length'] == str(len(cached.body)).encode()
@@ -0,0 +1,108 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from rdflib import Graph, BNode, Literal, URIRef, XSD
+from rdflib.compare import isomorphic
+
+from pyldapi import ContainerRenderer
+from pyldapi.data import RDF_MEDIATYPES
+from pyldapi.serializers import SERIALIZERS, aserialize, serialize_ntriples
+
+from tests.conftest import make_request
+
+RDFLIB_FORMATS = {
+    'text/turtle': 'turtle',
+    'application/rdf+xml': 'xml',
+    'application/ld+json': 'json-ld',
+    'application/n-triples': 'nt',
+}
+
+
+def test_ntriples():
+    g = Graph()
+    s = URIRef('http://example.com/s')
+    b = BNode()
+    g.add((s, URIRef('http://example.com/p'), Literal('plain "quoted"\nwith a \\ backslash')))
+    g.add((s, URIRef('http://example.com/p'), Literal('Ünïcödé', lang='de')))
+    g.add((s, URIRef('http://example.com/p'), Literal(3.5)))
+    g.add((s, URIRef('http://example.com/p'), Literal('x', datatype=XSD.string)))
+    g.add((s, URIRef('http://example.com/b'), b))
+    g.add((b, URIRef('http://example.com/p'), URIRef('http://example.com/o')))
+
+    written = serialize_ntriples(g)
+    assert isinstance(written, bytes)
+    assert isomorphic(Graph().parse(data=written, format='nt'), g), 'The N-Triples written differ from the graph'
+
+
+class XMLRenderer(ContainerRenderer):
+    # members served as RDF/XML & JSON-LD go through _make_rdf_response()
+    serializers = dict(SERIALIZERS, **{'application/n-triples': lambda graph: b'# custom\n'})
+
+
+def test_rdf_response_mediatype():
+    for mediatype in RDF_MEDIATYPES:
+        r = ContainerRenderer(
+            make_request(b'_profile=mem', {'Accept': mediatype}),
+            'http://example.com/container', 'A Container', 'A test Container', None, None,
+            [('http://example.com/a', 'A')], 1,
+        )
+        expected = r._generate_mem_profile_rdf()
+        response = r._make_rdf_response(r._generate_mem_profile_rdf())
+        assert response.media_type == mediatype
+        assert response.headers['content-length'] == str(len(response.body))
+        parsed = Graph().parse(data=response.body, format=RDFLIB_FORMATS[mediatype])
+        assert isomorphic(parsed, expected), 'The {} response is not the graph in that format'.format(mediatype)
+
+
+def test_serializer_override():
+    r = XMLRenderer(
+        make_request(b'_profile=mem', {'Accept': 'application/n-triples'}),
+        'http://example.com/container', 'A Container', 'A test Container', None, None, [], 0,
+    )
+    assert r._make_rdf_response(Graph()).body == b'# custom\n'
+    assert SERIALIZERS['application/n-triples'] is serialize_ntriples
+
+
+def test_unregistered_serializer():
+    class NoXMLRenderer(ContainerRenderer):
+        serializers = {k: v for k, v in SERIALIZERS.items() if k != 'application/rdf+xml'}
+
+    r = NoXMLRenderer(
+        make_request(b'_profile=mem', {'Accept': 'application/rdf+xml'}),
+        'http://example.com/container', 'A Container', 'A test Container', None, None,
+        [('http://example.com/a', 'A')], 1,
+    )
+    assert r.mediatype == 'application/rdf+xml'
+    response = r._make_rdf_response(r._generate_mem_profile_rdf())
+    # Turtle is written, so is named as the Content-Type, rather than the Media Type negotiated
+    assert response.headers['content-type'] == 'text/turtle'
+    assert len(Graph().parse(data=response.body, format='turtle')) > 0
+    assert r.headers['Content-Type'] == 'application/rdf+xml'
+
+
+def test_offloaded_serialization():
+    g = Graph()
+    for i in range(20):
+        g.add((URIRef('http://example.com/s'), URIRef('http://example.com/p'), Literal(i)))
+
+    # each executor is shut down, with its workers, once used
+    for executor_class in (ThreadPoolExecutor, ProcessPoolExecutor):
+        with executor_class(1) as executor:
+            for mediatype in RDF_MEDIATYPES:
+                written = asyncio.run(aserialize(g, mediatype, executor=executor, threshold=10))
+                parsed = Graph().parse(data=written, format=RDFLIB_FORMATS[mediatype])
+                assert isomorphic(parsed, g), '{} serialized in {} differs'.format(mediatype, executor)
+
+    with ThreadPoolExecutor(1) as executor:
+        class OffloadingRenderer(ContainerRenderer):
+            serialization_executor = executor
+            serialization_offload_threshold = 1
+
+        r = OffloadingRenderer(
+            make_request(b'_profile=mem', {'Accept': 'application/ld+json'}),
+            'http://example.com/container', 'A Container', 'A test Container', None, None,
+            [('http://example.com/a', 'A')], 1,
+        )
+        response = asyncio.run(r._amake_rdf_response(r._generate_mem_profile_rdf()))
+    assert response.media_type == 'application/ld+json'
+    assert isomorphic(Graph().parse(data=response.body, format='json-ld'), r._generate_mem_profile_rdf())
@@ -0,0 +1,59 @@
+from fastapi.responses import StreamingResponse
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from pyldapi import ContainerRenderer
+from pyldapi.streaming import iter_chunks, nt_iri, nt_literal
+
+from tests.conftest import make_request
+
+
+members = [
+    'http://example.com/plain',
+    ('http://example.com/tuple', 'A "quoted" label\nover two lines \\ with a backslash'),
+    {'uri': 'http://example.com/dict', 'title': 'Ünïcödé'},
+    ('http://example.com/number', 42),
+]
+
+
+def test_terms():
+    assert nt_iri('http://example.com/a b') == '<http://example.com/a\\u0020b>'
+    assert nt_literal('say "hi"\n') == '"say \\"hi\\"\\n"'
+    assert nt_literal('hi', lang='en') == '"hi"@en'
+    assert nt_literal(42) == '"42"^^<http://www.w3.org/2001/XMLSchema#integer>'
+
+
+class StreamingContainerRenderer(ContainerRenderer):
+    mem_rdf_streaming_threshold = 3
+
+
+def test_streamed_mem_profile_matches_graph():
+    for mediatype, rdf_format in (('text/turtle', 'turtle'), ('application/n-triples', 'nt')):
+        r = StreamingContainerRenderer(
+            make_request(b'_profile=mem&page=2&per_page=5&x=1', {'Accept': mediatype}),
+            'http://example.com/container',
+            'A Container',
+            'A "test" Container',
+            'http://example.com/parent',
+            'The Parent',
+            members,
+            20,
+        )
+        response = r.render()
+        assert isinstance(response, StreamingResponse), 'The {} response was not streamed'.format(mediatype)
+        assert response.media_type == mediatype
+
+        streamed = Graph().parse(data=b''.join(iter_chunks(r._iter_mem_profile_triples(), 3)), format=rdf_format)
+        expected = r._generate_mem_profile_rdf()
+        assert len(streamed) == len(expected)
+        assert isomorphic(streamed, expected), 'The streamed {} differs from the graph'.format(mediatype)
+
+
+def test_small_mem_profile_not_streamed():
+    for mediatype, rdf_format in (('text/turtle', 'turtle'), ('application/n-triples', 'nt')):
+        r = ContainerRenderer(make_request(b'_profile=mem', {'Accept': mediatype}), 'http://example.com/container',
+                              'A Container', 'A "test" Container', None, None, members, len(members))
+        response = r.render()
+        assert not isinstance(response, StreamingResponse), 'The small {} response was streamed'.format(mediatype)
+        assert response.headers['content-length'] == str(len(response.body))
+        assert isomorphic(Graph().parse(data=response.body, format=rdf_format), r._generate_mem_profile_rdf())
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timezone
+
+
+from pyldapi import Renderer, ContainerRenderer, Profile
+from pyldapi.data import RDF_MEDIATYPES
+from pyldapi.validators import is_not_modified, format_http_date
+
+from tests.conftest import make_request
+
+
+profiles = {
+    'sdo': Profile(
+        'https://schema.org',
+        'schema.org',
+        'Schema.org is a collaborative, community activity',
+        RDF_MEDIATYPES,
+        'text/turtle'
+    )
+}
+MODIFIED = datetime(2024, 5, 1, 12, 30, 15, 500, tzinfo=timezone.utc)
+
+
+class VersionedRenderer(Renderer):
+    version = 1
+
+    def __init__(self, request):
+        self.rendered = False
+        super().__init__(request, 'http://example.com/thing', profiles, 'sdo')
+
+    def _get_fingerprint(self):
+        return self.version
+
+    def _get_last_modified(self):
+        return MODIFIED
+
+    def render(self):
+        response = super().render()
+        if response is None:
+            self.rendered = True
+            response = self._make_rdf_response(self._generate_alt_profiles_rdf())
+        return response
+
+
+class VersionedContainerRenderer(ContainerRenderer):
+    def __init__(self, request):
+        super().__init__(request, 'http://example.com/items', 'Items', 'Some items', None, None,
+                         ['http://example.com/a', 'http://example.com/b'], 2)
+
+    def _get_members_fingerprint(self):
+        return 'v7'
+
+
+def test_is_not_modified():
+    assert is_not_modified({'If-None-Match': '"a", W/"b"'}, '"b"')
+    assert is_not_modified({'If-None-Match': '*'}, '"b"')
+    assert not is_not_modified({'If-None-Match': '"a"'}, '"b"')
+    # If-Modified-Since is ignored when If-None-Match is given
+    assert not is_not_modified({'If-None-Match': '"a"', 'If-Modified-Since': format_http_date(MODIFIED)}, '"b"',
+                               MODIFIED)
+    assert is_not_modified({'If-Modified-Since': format_http_date(MODIFIED)}, None, MODIFIED)
+    assert not is_not_modified({'If-Modified-Since': 'Wed, 01 May 2024 12:30:14 GMT'}, None, MODIFIED)
+    assert not is_not_modified({'If-Modified-Since': 'not a date'}, None, MODIFIED)
+
+
+def test_etag_and_304():
+    r = VersionedRenderer(make_request())
+    response = r.render()
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and r.rendered
+    assert response.headers['Last-Modified'] == 'Wed, 01 May 2024 12:30:15 GMT'
+
+    r = VersionedRenderer(make_request(headers={'If-None-Match': etag}))
+    response = r.render()
+    assert response.status_code == 304 and not r.rendered, 'A current ETag did not short-circuit rendering'
+    assert response.headers['ETag'] == etag
+    assert response.body == b''
+
+    # the ETag varies with the representation and the data
+    r = VersionedRenderer(make_request(headers={'If-None-Match': etag, 'Accept': 'application/rdf+xml'}))
+    assert r.render().status_code == 200
+    VersionedRenderer.version = 2
+    try:
+        r = VersionedRenderer(make_request(headers={'If-None-Match': etag}))
+        assert r.render().status_code == 200
+    finally:
+        VersionedRenderer.version = 1
+
+    r = VersionedRenderer(make_request(headers={'If-Modified-Since': 'Wed, 01 May 2024 13:00:00 GMT'}))
+    assert r.render().status_code == 304
+
+
+def test_container_etag():
+    r = VersionedContainerRenderer(make_request(b'_profile=mem&_mediatype=text/turtle'))
+    etag = r.render().headers['ETag']
+
+    r = VersionedContainerRenderer(make_request(b'_profile=mem&_mediatype=text/turtle', {'If-None-Match': etag}))
+    assert r.render().status_code == 304
+    r = VersionedContainerRenderer(make_request(b'_profile=mem&_mediatype=text/turtle', {'If-None-Match': etag}))
+    assert asyncio.run(r.arender()).status_code == 304
+
+    r = VersionedContainerRenderer(
+        make_request(b'_profile=mem&_mediatype=text/turtle&per_page=1', {'If-None-Match': etag})
+    )
+    assert r.render().status_code == 200, 'Another page had the same ETag'